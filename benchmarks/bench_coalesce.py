@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Throughput of concurrent create_todo/update_todo calls with and without write coalescing.
+
+Runs against the mongomock stand-in, which simulates a network round trip
+per operation (``BENCH_RTT_MS``, default 2 ms) on a bounded pool of
+connections. Without coalescing every call is its own ``insert_one`` or
+``find_one_and_update``; with it, calls arriving within the window share one
+``insert_many`` or ``bulk_write`` (plus one read of the post-images for
+updates).
+
+Usage:
+    python benchmarks/bench_coalesce.py [--ops 2000] [--window-ms 2] [--max-batch 100] [--pool 16]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from todo_mcp_server.database import TodoDatabase  # noqa: E402
+from todo_mcp_server.models import TodoCreate, TodoUpdate  # noqa: E402
+
+from standin import attach_standin  # noqa: E402
+
+CONCURRENCY_LEVELS = (1, 8, 32, 128)
+
+
+async def run_phase(concurrency: int, calls) -> float:
+    """Await ``calls`` (coroutine factories) with ``concurrency`` workers, return ops/sec."""
+    remaining = iter(calls)
+
+    async def worker():
+        for call in remaining:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(calls) / (time.perf_counter() - start)
+
+
+async def bench(window_ms: float, max_batch: int, pool: int, ops: int, concurrency: int):
+    os.environ["WRITE_COALESCE_WINDOW_MS"] = str(window_ms)
+    os.environ["WRITE_COALESCE_MAX_BATCH"] = str(max_batch)
+    db = TodoDatabase()
+    attach_standin(db, max_workers=pool)
+
+    ids = []
+
+    async def create(i):
+        ids.append(str((await db.create_todo(TodoCreate(title=f"bench {i}"))).id))
+
+    insert_rate = await run_phase(concurrency, [lambda i=i: create(i) for i in range(ops)])
+    update_rate = await run_phase(
+        concurrency,
+        [lambda todo_id=todo_id: db.update_todo(todo_id, TodoUpdate(priority="high")) for todo_id in ids]
+    )
+    # Every write must have landed exactly once
+    assert await db.collection.count_documents({"priority": "high"}) == ops
+    return insert_rate, update_rate, db.coalesce_stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000, help="creates (and as many updates) per run")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="coalescing window")
+    parser.add_argument("--max-batch", type=int, default=100, help="largest coalesced batch")
+    parser.add_argument("--pool", type=int, default=16, help="concurrent round trips to the stand-in")
+    args = parser.parse_args()
+
+    print(f"{'':<11} {'':<15} {'add_todo':>14} {'update_todo':>14}   mean batch (insert/update)")
+    for concurrency in CONCURRENCY_LEVELS:
+        for label, window in (("off", 0), (f"{args.window_ms:g} ms", args.window_ms)):
+            insert_rate, update_rate, stats = await bench(window, args.max_batch, args.pool, args.ops, concurrency)
+            batches = f"{stats['inserts']['mean_batch']}/{stats['updates']['mean_batch']}" if stats else "-"
+            print(f"coalesce={label:<6} concurrency={concurrency:<3} "
+                  f"{insert_rate:10.1f} ops/s {update_rate:10.1f} ops/s   {batches}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Throughput of TodoDatabase operations as client concurrency rises.
+
+By default this runs against a mongomock stand-in that simulates a network
+round trip per operation (``BENCH_RTT_MS``, default 2 ms), comparing:
+
+* ``blocking`` - synchronous PyMongo calls made directly on the event loop
+  (how the server behaved before the async driver)
+* ``threaded`` - the thread-pool fallback from ``todo_mcp_server.mongo``
+
+Set ``MONGODB_URI`` to also benchmark a real ``mongod`` with the native
+async driver and the threaded fallback.
+
+Usage:
+    python benchmarks/bench_concurrency.py [--ops 400]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from todo_mcp_server.database import TodoDatabase  # noqa: E402
+from todo_mcp_server.models import TodoCreate  # noqa: E402
+
+from standin import attach_standin  # noqa: E402
+
+CONCURRENCY_LEVELS = (1, 2, 4, 8, 16, 32, 64)
+
+
+async def run_workload(db: TodoDatabase, ops: int, concurrency: int) -> float:
+    """Run ``ops`` create+get pairs with ``concurrency`` workers, return ops/sec."""
+    remaining = iter(range(ops))
+
+    async def worker():
+        for i in remaining:
+            todo = await db.create_todo(TodoCreate(title=f"bench {i}"))
+            await db.get_todo_by_id(str(todo.id))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return (ops * 2) / elapsed
+
+
+async def bench_standin(mode: str, ops: int) -> None:
+    for concurrency in CONCURRENCY_LEVELS:
+        db = TodoDatabase()
+        attach_standin(db, mode=mode)
+        rate = await run_workload(db, ops, concurrency)
+        print(f"{'standin-' + mode:<18} concurrency={concurrency:<3} {rate:10.1f} ops/s")
+
+
+async def bench_mongo(driver: str, ops: int) -> None:
+    for concurrency in CONCURRENCY_LEVELS:
+        os.environ["MONGODB_DRIVER"] = driver
+        db = TodoDatabase()
+        db.database_name = "todo_bench"
+        await db.connect()
+        if db.use_memory:
+            print("MongoDB unreachable, skipping real-server benchmark")
+            return
+        await db.collection.delete_many({})
+        rate = await run_workload(db, ops, concurrency)
+        await db.collection.drop()
+        await db.disconnect()
+        print(f"{'mongo-' + driver:<18} concurrency={concurrency:<3} {rate:10.1f} ops/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=400, help="create+get pairs per run")
+    args = parser.parse_args()
+
+    for mode in ("blocking", "threaded"):
+        await bench_standin(mode, args.ops)
+
+    if os.getenv("MONGODB_URI"):
+        for driver in ("async", "threaded"):
+            await bench_mongo(driver, args.ops)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""End-to-end latency and throughput of the MCP tools.
+
+Drives ``call_tool`` for ``add_todo``, ``get_all_todos``, ``update_todo``,
+``toggle_todo_status`` and ``delete_todo`` over two transports:
+
+* ``inprocess`` - the server's registered CallToolRequest handler, called
+  directly (input validation and result formatting included, no I/O)
+* ``stdio`` - a real server subprocess driven through ``mcp.client.stdio``
+
+against each storage backend (``memory``, ``sqlite`` and the mongomock
+``standin`` from ``standin.py``), pre-seeded with each collection size.
+Reports ops/sec and p50/p95/p99 latency per tool and writes the results as
+JSON. Pass ``--baseline`` with an earlier results file to print the change.
+
+Usage:
+    python benchmarks/bench_e2e.py [--sizes 100 10000 1000000] [--ops 200]
+    python benchmarks/bench_e2e.py --output new.json --baseline old.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from bson import ObjectId  # noqa: E402
+
+TRANSPORTS = ("inprocess", "stdio")
+BACKENDS = ("memory", "sqlite", "standin")
+TOOLS = ("add_todo", "get_all_todos", "update_todo", "toggle_todo_status", "delete_todo")
+# get_all_todos cycles through these argument sets
+LIST_QUERIES = (
+    {},
+    {"completed": False, "sort_by": "due_date"},
+    {"priority": "high", "sort_order": "desc"},
+)
+
+CallTool = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+
+def seed_id(i: int) -> ObjectId:
+    """Deterministic id of the i-th seeded todo, so clients can address it."""
+    return ObjectId(i.to_bytes(12, "big"))
+
+
+def make_docs(count: int):
+    now = datetime.utcnow()
+    priorities = ("low", "medium", "high")
+    for i in range(count):
+        yield {
+            "_id": seed_id(i),
+            "title": f"Todo {i}",
+            "description": None,
+            "completed": i % 4 == 0,
+            "created_at": now + timedelta(microseconds=i),
+            "updated_at": now,
+            "due_date": now + timedelta(hours=i % 1000) if i % 2 else None,
+            "priority": priorities[i % 3],
+        }
+
+
+async def open_backend(backend: str, size: int, workdir: str, rtt_ms: float):
+    """Create a connected database handler for ``backend`` holding ``size`` todos."""
+    from todo_mcp_server.database import TodoDatabase
+
+    if backend == "memory":
+        db = TodoDatabase()
+        db.use_memory = True
+        await db._ensure_connection()
+        db.memory_store.load(make_docs(size))
+    elif backend == "sqlite":
+        from todo_mcp_server.sqlite_database import INSERT_SQL, SQLiteTodoDatabase, doc_to_row
+
+        os.environ["SQLITE_DB_PATH"] = os.path.join(workdir, f"bench-{size}.db")
+        db = SQLiteTodoDatabase()
+        await db._ensure_connection()
+
+        def seed():
+            with db.conn:
+                db.conn.execute("DELETE FROM todos")
+                db.conn.executemany(INSERT_SQL, (doc_to_row(doc) for doc in make_docs(size)))
+
+        await db._run(seed)
+    elif backend == "standin":
+        from standin import attach_standin
+
+        db = TodoDatabase()
+        attach_standin(db, rtt_ms=rtt_ms)
+        docs = list(make_docs(size))
+        if docs:
+            db.collection.sync_collection.insert_many(docs)
+    else:
+        raise ValueError(f"Unknown backend '{backend}'")
+    return db
+
+
+def percentile(latencies: List[float], pct: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[pct - 1]
+
+
+def tool_arguments(tool: str, size: int, ops: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Arguments for each timed call of ``tool``."""
+    if tool == "add_todo":
+        return [{"title": f"Bench todo {i}", "priority": "high"} for i in range(ops)]
+    if tool == "get_all_todos":
+        return [LIST_QUERIES[i % len(LIST_QUERIES)] for i in range(ops)]
+    if tool == "update_todo":
+        return [{"todo_id": str(seed_id(rng.randrange(size))), "title": f"Updated {i}"} for i in range(ops)]
+    if tool == "toggle_todo_status":
+        return [{"todo_id": str(seed_id(rng.randrange(size)))} for _ in range(ops)]
+    if tool == "delete_todo":
+        # Every call deletes a distinct seeded todo
+        return [{"todo_id": str(seed_id(size - 1 - i))} for i in range(min(ops, size))]
+    raise ValueError(f"Unknown tool '{tool}'")
+
+
+async def run_tools(call: CallTool, size: int, ops: int, warmup: int) -> List[Dict[str, Any]]:
+    """Time every tool through ``call`` and return one result row per tool."""
+    for _ in range(warmup):
+        await call("get_all_todos", {})
+
+    rng = random.Random(size)
+    rows = []
+    for tool in TOOLS:
+        latencies = []
+        errors = 0
+        start = time.perf_counter()
+        for arguments in tool_arguments(tool, size, ops, rng):
+            t0 = time.perf_counter()
+            ok = await call(tool, arguments)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            errors += not ok
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "tool": tool,
+            "ops": len(latencies),
+            "errors": errors,
+            "ops_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        })
+    return rows
+
+
+async def bench_inprocess(backend: str, size: int, args) -> List[Dict[str, Any]]:
+    from mcp.types import CallToolRequest, CallToolRequestParams
+
+    from todo_mcp_server import server
+
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as workdir:
+        db = await open_backend(backend, size, workdir, args.rtt_ms)
+        server.db = db
+        handler = server.server.request_handlers[CallToolRequest]
+
+        async def call(name: str, arguments: Dict[str, Any]) -> bool:
+            request = CallToolRequest(method="tools/call", params=CallToolRequestParams(name=name, arguments=arguments))
+            result = await handler(request)
+            return not result.root.isError
+
+        try:
+            return await run_tools(call, size, args.ops, args.warmup)
+        finally:
+            await db.disconnect()
+
+
+async def bench_stdio(backend: str, size: int, args) -> List[Dict[str, Any]]:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[os.path.abspath(__file__), "serve", "--backend", backend, "--size", str(size),
+              "--rtt-ms", str(args.rtt_ms)],
+        env={**os.environ, "PYTHONPATH": SRC},
+    )
+    errlog = sys.stderr if args.verbose else open(os.devnull, "w")
+    try:
+        async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+
+                async def call(name: str, arguments: Dict[str, Any]) -> bool:
+                    result = await session.call_tool(name, arguments)
+                    return not result.isError
+
+                return await run_tools(call, size, args.ops, args.warmup)
+    finally:
+        if errlog is not sys.stderr:
+            errlog.close()
+
+
+async def serve(args):
+    """Run a stdio server over a pre-seeded backend (used by the stdio transport)."""
+    from todo_mcp_server import server
+
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as workdir:
+        server.db = await open_backend(args.backend, args.size, workdir, args.rtt_ms)
+        await server.main()
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def result_key(row: Dict[str, Any]) -> tuple:
+    return (row["transport"], row["backend"], row["size"], row["tool"])
+
+
+def print_comparison(results: List[Dict[str, Any]], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = {result_key(row): row for row in json.load(f)["results"]}
+    print(f"\nChange vs {baseline_path} (ops/sec, p95):")
+    for row in results:
+        old = baseline.get(result_key(row))
+        if old is None or not old["ops_per_sec"] or not old["p95_ms"]:
+            continue
+        throughput = (row["ops_per_sec"] / old["ops_per_sec"] - 1) * 100
+        p95 = (row["p95_ms"] / old["p95_ms"] - 1) * 100
+        print(f"{row['transport']:<10} {row['backend']:<8} size={row['size']:<8} {row['tool']:<19} "
+              f"{throughput:+7.1f}% ops/s  {p95:+7.1f}% p95")
+
+
+async def run(args):
+    results = []
+    for transport in args.transports:
+        for backend in args.backends:
+            for size in args.sizes:
+                if backend == "standin" and size > args.standin_max_size:
+                    print(f"skipping standin size={size} (above --standin-max-size)")
+                    continue
+                bench = bench_inprocess if transport == "inprocess" else bench_stdio
+                for row in await bench(backend, size, args):
+                    row = {"transport": transport, "backend": backend, "size": size, **row}
+                    results.append(row)
+                    print(f"{transport:<10} {backend:<8} size={size:<8} {row['tool']:<19} "
+                          f"{row['ops_per_sec']:9.1f} ops/s  p50={row['p50_ms']:8.3f} ms  "
+                          f"p95={row['p95_ms']:8.3f} ms  p99={row['p99_ms']:8.3f} ms"
+                          + (f"  errors={row['errors']}" if row["errors"] else ""))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ops": args.ops,
+            "rtt_ms": args.rtt_ms,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", nargs="?", choices=("run", "serve"), default="run")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200, help="timed calls per tool")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=float(os.getenv("BENCH_RTT_MS", "2")),
+                        help="simulated round trip of the MongoDB stand-in")
+    parser.add_argument("--standin-max-size", type=int, default=10_000,
+                        help="mongomock has no indexes, so larger stand-in sizes only measure its scans")
+    parser.add_argument("--output", default="bench_e2e.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show server output for stdio runs")
+    # Used by the stdio transport to start the server subprocess
+    parser.add_argument("--backend", choices=BACKENDS, default="memory", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
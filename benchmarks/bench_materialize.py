@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Cost of turning stored documents into ``TodoItem`` objects.
+
+Compares full pydantic validation (``TodoItem(**doc)``) with the
+``TodoRecord`` listings now build, first on materialization alone and then
+on an unpaginated ``list_todos`` against the in-memory backend, which is
+where the server pays for it.
+
+Usage:
+    python benchmarks/bench_materialize.py [--sizes 10000 100000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bson import ObjectId  # noqa: E402
+
+from todo_mcp_server import database  # noqa: E402
+from todo_mcp_server.models import TodoItem, TodoQuery, TodoRecord  # noqa: E402
+
+
+def make_docs(count: int):
+    now = datetime.utcnow()
+    priorities = ("low", "medium", "high")
+    for i in range(count):
+        yield {
+            "_id": ObjectId(),
+            "title": f"Todo {i}",
+            "description": None,
+            "completed": i % 4 == 0,
+            "created_at": now + timedelta(microseconds=i),
+            "updated_at": now,
+            "due_date": now + timedelta(hours=i % 1000) if i % 2 else None,
+            "priority": priorities[i % 3],
+        }
+
+
+def validated(doc):
+    return TodoItem(**doc)
+
+
+async def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def bench(size: int, repeat: int):
+    docs = list(make_docs(size))
+    db = database.TodoDatabase()
+    db.use_memory = True
+    await db._ensure_connection()
+    db.memory_store.load(docs)
+
+    def list_all():
+        # Bypass the read cache so every run materializes the whole listing
+        db._invalidate_cache()
+        return db.list_todos(TodoQuery())
+
+    results = {}
+    try:
+        for mode, materialize in (("validated", validated), ("record", TodoRecord)):
+            # list_todos looks TodoRecord up in its module on every call
+            database.TodoRecord = materialize
+            results[mode] = (
+                await median_ms(lambda: [materialize(doc) for doc in docs], repeat),
+                await median_ms(list_all, repeat),
+            )
+    finally:
+        database.TodoRecord = TodoRecord
+
+    for mode, (build_ms, list_ms) in results.items():
+        print(f"size={size:<8} {mode:<10} materialize={build_ms:9.1f} ms  list_todos={list_ms:9.1f} ms")
+    speedup = results["validated"][1] / results["record"][1]
+    print(f"size={size:<8} list_todos speedup: {speedup:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(bench(size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Restart time of the durable in-memory store (MEMORY_DB_PATH).
+
+For each collection size, writes a snapshot plus an operation log of
+``--log-ops`` updates, then measures how long ``DurableMemoryStore.open()``
+takes to load the snapshot, replay the log and rebuild every index.
+
+Usage:
+    python benchmarks/bench_memory_restart.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bson import ObjectId  # noqa: E402
+
+from todo_mcp_server.persistence import DurableMemoryStore  # noqa: E402
+
+
+def make_docs(count: int):
+    now = datetime.utcnow()
+    priorities = ("low", "medium", "high")
+    for i in range(count):
+        yield {
+            "_id": ObjectId(),
+            "title": f"Todo {i}",
+            "description": None,
+            "completed": i % 4 == 0,
+            "created_at": now + timedelta(microseconds=i),
+            "updated_at": now,
+            "due_date": now + timedelta(hours=i % 1000) if i % 2 else None,
+            "priority": priorities[i % 3],
+        }
+
+
+def bench(size: int, log_ops: int):
+    path = tempfile.mkdtemp(prefix="todo-bench-")
+    try:
+        store = DurableMemoryStore(path, compact_ops=log_ops + 1)
+        store.open()
+        store.load(make_docs(size))
+        store.compact(wait=True)
+        ids = [doc["_id"] for _, doc in zip(range(log_ops), store)]
+        for todo_id in ids:
+            store.update(todo_id, {"completed": True, "updated_at": datetime.utcnow()})
+        # Simulate a crash: leave the log un-compacted
+        store._log.close()
+        store._log = None
+        snapshot_mb = os.path.getsize(os.path.join(path, "snapshot.bson")) / 1e6
+
+        restarted = DurableMemoryStore(path, compact_ops=log_ops + 1)
+        start = time.perf_counter()
+        restarted.open()
+        elapsed = time.perf_counter() - start
+        assert len(restarted) == size
+        restarted.close()
+        print(f"size={size:<9} snapshot={snapshot_mb:7.1f} MB  log_ops={log_ops:<7} "
+              f"restart={elapsed * 1000:9.1f} ms")
+    finally:
+        shutil.rmtree(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--log-ops", type=int, default=10_000)
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.log_ops)
+
+
+if __name__ == "__main__":
+    main()
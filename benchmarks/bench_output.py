@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Cost of rendering tool results: formatted text vs. structured JSON.
+
+For a page of todos, measures building the result text the way
+``get_all_todos`` does (full display and one-line summary) against JSON
+output encoded with ``orjson`` and with the standard library, and then the
+whole ``CallToolResult`` as it is serialized for the transport.
+
+Usage:
+    python benchmarks/bench_output.py [--sizes 50 500] [--repeat 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bson import ObjectId  # noqa: E402
+
+from todo_mcp_server import output  # noqa: E402
+from todo_mcp_server.models import TodoRecord  # noqa: E402
+from todo_mcp_server.server import SUMMARY_FIELDS, format_todo_list  # noqa: E402
+
+
+def make_records(count: int):
+    now = datetime.utcnow()
+    priorities = ("low", "medium", "high")
+    return [
+        TodoRecord({
+            "_id": ObjectId(),
+            "title": f"Todo {i}",
+            "description": "Follow up on the quarterly report and send the summary" if i % 2 else None,
+            "completed": i % 4 == 0,
+            "created_at": now + timedelta(microseconds=i),
+            "updated_at": now,
+            "due_date": now + timedelta(hours=i % 1000) if i % 2 else None,
+            "priority": priorities[i % 3],
+        })
+        for i in range(count)
+    ]
+
+
+def median_us(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def json_page(records):
+    return {"todos": [output.todo_to_json(todo) for todo in records], "next_after_id": None}
+
+
+def stdlib_dumps(data):
+    encoder, output.orjson = output.orjson, None
+    try:
+        return output.dumps(data)
+    finally:
+        output.orjson = encoder
+
+
+def wire(arguments, records) -> str:
+    result = output.respond(arguments, lambda: json_page(records), lambda: format_todo_list(records, None, None))
+    return result.model_dump_json(by_alias=True, exclude_none=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    if output.orjson is None:
+        print("orjson is not installed; the orjson rows use the standard library encoder")
+    for size in args.sizes:
+        records = make_records(size)
+        cases = {
+            "text (full)": lambda: format_todo_list(records, None, None),
+            "text (summary)": lambda: format_todo_list(records, SUMMARY_FIELDS, None),
+            "json (orjson)": lambda: output.dumps(json_page(records)),
+            "json (stdlib)": lambda: stdlib_dumps(json_page(records)),
+            "wire text": lambda: wire({"output": "text"}, records),
+            "wire json": lambda: wire({"output": "json"}, records),
+        }
+        for name, func in cases.items():
+            size_bytes = len(func().encode())
+            print(f"size={size:<6} {name:<15} {median_us(func, args.repeat) / 1000:8.3f} ms  {size_bytes:>9} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Server memory per concurrent MCP session: stdio vs. HTTP.
+
+``stdio`` starts one server process per session, which is what every MCP
+client does with the stdio transport. ``http`` starts a single server with
+``MCP_TRANSPORT=http`` and opens every session against it over streamable
+HTTP. Each session initializes and makes a few tool calls, then all sessions
+are held open while the server-side memory is measured.
+
+Memory is the proportional set size (PSS) of the server processes, so shared
+pages are not counted once per stdio process; RSS is used where PSS is not
+available. Linux only (reads ``/proc``).
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions 1 10 50] [--modes stdio http]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import AsyncExitStack
+from typing import List
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SERVER_ENV = {**os.environ, "PYTHONPATH": SRC, "USE_MEMORY_DB": "true"}
+
+
+def process_memory_kb(pid: int) -> int:
+    """PSS of a process in kB, falling back to RSS."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def child_pids() -> List[int]:
+    """PIDs of this process's direct children."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after it
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == os.getpid():
+            pids.append(int(entry))
+    return pids
+
+
+async def exercise(session: ClientSession, i: int):
+    await session.initialize()
+    await session.call_tool("add_todo", {"title": f"Session {i}"})
+    await session.call_tool("get_all_todos", {"limit": 10})
+
+
+async def bench_stdio(sessions: int) -> int:
+    """Open ``sessions`` stdio servers and return their total memory in kB."""
+    params = StdioServerParameters(command=sys.executable, args=["-m", "todo_mcp_server.server"], env=SERVER_ENV)
+    async with AsyncExitStack() as stack:
+        devnull = stack.enter_context(open(os.devnull, "w"))
+        clients = []
+        for i in range(sessions):
+            read_stream, write_stream = await stack.enter_async_context(stdio_client(params, errlog=devnull))
+            clients.append(await stack.enter_async_context(ClientSession(read_stream, write_stream)))
+        await asyncio.gather(*(exercise(client, i) for i, client in enumerate(clients)))
+        return sum(process_memory_kb(pid) for pid in child_pids())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_health(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def bench_http(sessions: int) -> int:
+    """Open ``sessions`` sessions on one HTTP server and return its memory in kB."""
+    port = free_port()
+    env = {**SERVER_ENV, "MCP_TRANSPORT": "http", "MCP_PORT": str(port)}
+    server = subprocess.Popen([sys.executable, "-m", "todo_mcp_server.server"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_health(f"http://127.0.0.1:{port}/health")
+        async with AsyncExitStack() as stack:
+            clients = []
+            for _ in range(sessions):
+                read_stream, write_stream, _ = await stack.enter_async_context(
+                    streamablehttp_client(f"http://127.0.0.1:{port}/mcp")
+                )
+                clients.append(await stack.enter_async_context(ClientSession(read_stream, write_stream)))
+            await asyncio.gather(*(exercise(client, i) for i, client in enumerate(clients)))
+            return process_memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--modes", nargs="+", choices=("stdio", "http"), default=["stdio", "http"])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        bench = bench_stdio if mode == "stdio" else bench_http
+        for sessions in args.sessions:
+            memory_mb = await bench(sessions) / 1024
+            print(f"{mode:<6} sessions={sessions:<5} server memory={memory_mb:8.1f} MB  "
+                  f"{memory_mb / sessions:7.2f} MB/session  {sessions / (memory_mb / 1024):8.1f} sessions/GB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
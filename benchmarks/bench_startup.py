@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Cold start of the stdio server: time from spawn to the first responses.
+
+Every MCP client using the stdio transport starts a fresh server process, so
+import time is paid on every session. This spawns the server ``--runs``
+times per backend and measures, from ``Popen`` to the reply, the
+``initialize`` response and the following ``tools/list`` response, speaking
+JSON-RPC on the pipes directly so no client library time is counted. One
+extra run under ``python -X importtime`` reports where import time goes, by
+top-level package.
+
+With ``--max-ms`` it exits non-zero when the median time to the
+``tools/list`` response exceeds the limit, or when a memory or SQLite server
+loads PyMongo, so it can guard startup in CI.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--backends memory sqlite] [--max-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from mcp.types import LATEST_PROTOCOL_VERSION
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+BACKENDS = ("memory", "sqlite")
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def server_env(backend: str, workdir: str) -> Dict[str, str]:
+    env = {**os.environ, "PYTHONPATH": SRC, "MCP_TRANSPORT": "stdio"}
+    if backend == "memory":
+        env["USE_MEMORY_DB"] = "true"
+    else:
+        env["USE_SQLITE_DB"] = "true"
+        env["SQLITE_DB_PATH"] = os.path.join(workdir, "startup.db")
+    return env
+
+
+def request(proc: subprocess.Popen, message: Dict) -> Optional[Dict]:
+    """Send one JSON-RPC message and, for requests, read lines until its reply."""
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+    if "id" not in message:
+        return None
+    for line in proc.stdout:
+        reply = json.loads(line)
+        if reply.get("id") == message["id"]:
+            return reply
+    raise RuntimeError(f"Server exited before answering {message['method']}")
+
+
+def spawn(env: Dict[str, str], python_args: Tuple[str, ...] = ()) -> Tuple[float, float, str]:
+    """Start a server, return (ms to initialize reply, ms to tools/list reply, stderr)."""
+    with tempfile.TemporaryFile("w+") as errlog:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, *python_args, "-m", "todo_mcp_server.server"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errlog, env=env, text=True
+        )
+        try:
+            request(proc, {
+                "jsonrpc": "2.0", "id": 1, "method": "initialize",
+                "params": {
+                    "protocolVersion": LATEST_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench_startup", "version": "0"},
+                },
+            })
+            initialized = time.perf_counter()
+            request(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+            reply = request(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            listed = time.perf_counter()
+            if "error" in reply:
+                raise RuntimeError(f"tools/list failed: {reply['error']}")
+        finally:
+            proc.stdin.close()
+            proc.wait(timeout=30)
+        errlog.seek(0)
+        return (initialized - start) * 1000, (listed - start) * 1000, errlog.read()
+
+
+def import_times(stderr: str) -> Dict[str, float]:
+    """Self import time in ms per top-level package from ``-X importtime`` output."""
+    totals: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            totals[match.group(4).split(".")[0]] += int(match.group(1)) / 1000
+    return totals
+
+
+def bench(backend: str, runs: int, top: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = server_env(backend, workdir)
+        # Warm the OS file cache and the bytecode cache before timing
+        spawn(env)
+        initialize, list_tools = [], []
+        for _ in range(runs):
+            first, second, _ = spawn(env)
+            initialize.append(first)
+            list_tools.append(second)
+        _, _, stderr = spawn(env, ("-X", "importtime"))
+
+    packages = import_times(stderr)
+    result = {
+        "initialize_ms": statistics.median(initialize),
+        "list_tools_ms": statistics.median(list_tools),
+        "import_ms": sum(packages.values()),
+        "pymongo_ms": packages.get("pymongo", 0.0),
+    }
+    print(f"{backend}: initialize {result['initialize_ms']:.0f} ms, tools/list {result['list_tools_ms']:.0f} ms "
+          f"(median of {runs}; min {min(list_tools):.0f}, max {max(list_tools):.0f}), "
+          f"imports {result['import_ms']:.0f} ms")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {name:<24} {ms:8.1f} ms")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="timed spawns per backend")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--top", type=int, default=12, help="packages listed in the import-time breakdown")
+    parser.add_argument("--max-ms", type=float,
+                        help="fail if the median time to the tools/list response exceeds this")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    for backend in args.backends:
+        result = bench(backend, args.runs, args.top)
+        if result["pymongo_ms"]:
+            failures.append(f"{backend}: PyMongo was imported ({result['pymongo_ms']:.0f} ms)")
+        if args.max_ms is not None and result["list_tools_ms"] > args.max_ms:
+            failures.append(f"{backend}: tools/list after {result['list_tools_ms']:.0f} ms "
+                            f"(limit {args.max_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures and args.max_ms is not None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
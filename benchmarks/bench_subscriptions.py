@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Delay from an update_todo call to the resource notification its subscriber receives.
+
+A client session (connected in-process) subscribes to ``todo://list`` and one
+``todo://{id}``, then updates that todo ``--writes`` times, waiting for each
+notification before the next write. Each storage path is measured:
+
+- ``memory``: the in-memory store's write listeners
+- ``mongo-stream``: a change stream on the replica-set stand-in
+- ``mongo-poll``: the standalone stand-in, which rejects change streams, so
+  changes are polled every ``SUBSCRIPTION_POLL_MS``
+- ``sqlite``: polling as well
+
+Usage:
+    python benchmarks/bench_subscriptions.py [--writes 50] [--poll-ms 200] [--rtt-ms 1]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+MODES = ("memory", "mongo-stream", "mongo-poll", "sqlite")
+
+
+async def bench(mode: str, writes: int, rtt_ms: float):
+    # The server module picks its backend from the environment on import
+    from mcp import types
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from pydantic import AnyUrl
+
+    from todo_mcp_server import server
+    from todo_mcp_server.database import db
+
+    from standin import attach_standin
+
+    if mode.startswith("mongo"):
+        attach_standin(db, rtt_ms=rtt_ms, replica_set=mode == "mongo-stream")
+
+    notified = asyncio.Queue()
+
+    async def on_message(message):
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ResourceUpdatedNotification):
+            notified.put_nowait((time.perf_counter(), str(message.root.params.uri)))
+
+    delays = []
+    async with create_connected_server_and_client_session(server.server, message_handler=on_message) as client:
+        created = await client.call_tool("add_todo", {"title": "watched", "output": "json"})
+        uri = f"todo://{created.structuredContent['todo']['id']}"
+        await client.subscribe_resource(AnyUrl("todo://list"))
+        await client.subscribe_resource(AnyUrl(uri))
+        # Let the watcher start (and drop anything from before it did)
+        await asyncio.sleep(1)
+        while not notified.empty():
+            notified.get_nowait()
+
+        for i in range(writes):
+            written = time.perf_counter()
+            await client.call_tool("update_todo", {"todo_id": uri[len("todo://"):], "title": f"watched {i}"})
+            while True:
+                received, notified_uri = await asyncio.wait_for(notified.get(), 30)
+                if notified_uri == uri:
+                    break
+            delays.append((received - written) * 1000)
+            while not notified.empty():
+                notified.get_nowait()
+
+    await server.subscriptions.close()
+    await db.disconnect()
+    return delays
+
+
+def run(mode: str, args) -> None:
+    """Benchmark one mode in a fresh interpreter state (the backend is chosen at import)."""
+    os.environ["SUBSCRIPTION_POLL_MS"] = str(args.poll_ms)
+    os.environ["CHANGES_SETTLE_MS"] = "0"
+    os.environ.pop("USE_MEMORY_DB", None)
+    os.environ.pop("USE_SQLITE_DB", None)
+    if mode == "memory":
+        os.environ["USE_MEMORY_DB"] = "true"
+    elif mode == "sqlite":
+        os.environ["USE_SQLITE_DB"] = "true"
+        os.environ["SQLITE_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "subscriptions.db")
+    delays = asyncio.run(bench(mode, args.writes, args.rtt_ms))
+    quantiles = statistics.quantiles(delays, n=20)
+    print(f"{mode:<13} p50 {statistics.median(delays):8.2f} ms   p95 {quantiles[18]:8.2f} ms   "
+          f"max {max(delays):8.2f} ms   ({len(delays)} writes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=50, help="updates per mode")
+    parser.add_argument("--poll-ms", type=float, default=200, help="SUBSCRIPTION_POLL_MS for the polling modes")
+    parser.add_argument("--rtt-ms", type=float, default=1, help="simulated round trip of the MongoDB stand-in")
+    parser.add_argument("--mode", choices=MODES, help="run one mode (the others run in subprocesses)")
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args)
+        return
+    for mode in MODES:
+        subprocess.run([sys.executable, __file__, "--mode", mode, "--writes", str(args.writes),
+                        "--poll-ms", str(args.poll_ms), "--rtt-ms", str(args.rtt_ms)],
+                       stderr=subprocess.DEVNULL, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Local MongoDB stand-in for the Todo MCP Server benchmarks.
+
+Wraps a ``mongomock`` collection so every operation pays a simulated network
+round trip. The sleep happens in ``time.sleep`` and releases the GIL the same
+way a blocking socket read does, so it behaves like PyMongo's synchronous
+client talking to a remote ``mongod``.
+
+Like a standalone ``mongod``, the stand-in rejects change streams. With
+``replica_set=True`` the ``todos`` collection records a change event for
+every write and ``watch()`` returns a change stream over them, as a
+replica set would.
+"""
+
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import mongomock
+from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from todo_mcp_server.mongo import ThreadedCollection, TimedCollection
+
+DEFAULT_RTT_MS = float(os.getenv("BENCH_RTT_MS", "2"))
+
+
+class LatencyCollection:
+    """Synchronous collection that sleeps for one round trip per operation."""
+
+    def __init__(self, collection, rtt_ms: float = DEFAULT_RTT_MS):
+        self._collection = collection
+        self.rtt = rtt_ms / 1000.0
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        """Apply a bulk write in one round trip.
+
+        mongomock's own ``bulk_write`` does not accept current PyMongo
+        operation objects, so the operations are applied one by one here.
+        """
+        time.sleep(self.rtt)
+        errors = []
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._collection.insert_one(request._doc)
+                elif isinstance(request, ReplaceOne):
+                    self._collection.replace_one(request._filter, request._doc, upsert=request._upsert)
+                elif isinstance(request, UpdateOne):
+                    self._collection.update_one(request._filter, request._doc, upsert=request._upsert)
+                elif isinstance(request, DeleteOne):
+                    self._collection.delete_one(request._filter)
+                else:
+                    raise TypeError(f"Unsupported bulk operation {request!r}")
+            except Exception as e:
+                errors.append({"index": index, "code": 0, "errmsg": str(e), "op": request})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": [], "nInserted": 0,
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0,
+                                  "upserted": []})
+
+    def watch(self, *args, **kwargs):
+        time.sleep(self.rtt)
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            time.sleep(self.rtt)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class ReplicaSetCollection(LatencyCollection):
+    """Stand-in collection that records a change event for every write.
+
+    The documents a write touches are read before and after it, and the
+    difference becomes ``insert``, ``update`` (with ``updatedFields`` and
+    ``removedFields``) or ``delete`` events, each with the post-image.
+    """
+
+    def __init__(self, collection, rtt_ms: float = DEFAULT_RTT_MS):
+        super().__init__(collection, rtt_ms)
+        self.events = []
+        self.changed = threading.Condition()
+
+    def _ids(self, filter):
+        if isinstance(filter.get("_id"), ObjectId):
+            return [filter["_id"]]
+        return [doc["_id"] for doc in self._collection.find(filter, {"_id": 1})]
+
+    def _snapshot(self, ids):
+        return {todo_id: self._collection.find_one({"_id": todo_id}) for todo_id in ids}
+
+    def _record(self, before, after):
+        with self.changed:
+            for todo_id, old in before.items():
+                new = after[todo_id]
+                if old == new:
+                    continue
+                event = {"_id": {"_data": len(self.events)}, "documentKey": {"_id": todo_id},
+                         "fullDocument": copy.deepcopy(new)}
+                if old is None:
+                    event["operationType"] = "insert"
+                elif new is None:
+                    event["operationType"] = "delete"
+                else:
+                    event["operationType"] = "update"
+                    event["updateDescription"] = {
+                        "updatedFields": {key: value for key, value in new.items() if old.get(key) != value},
+                        "removedFields": [key for key in old if key not in new],
+                    }
+                self.events.append(event)
+            self.changed.notify_all()
+
+    def _tracked(self, ids, write, *args, **kwargs):
+        before = self._snapshot(ids)
+        try:
+            return write(*args, **kwargs)
+        finally:
+            self._record(before, self._snapshot(ids))
+
+    def insert_one(self, doc, *args, **kwargs):
+        time.sleep(self.rtt)
+        doc.setdefault("_id", ObjectId())
+        return self._tracked([doc["_id"]], self._collection.insert_one, doc, *args, **kwargs)
+
+    def insert_many(self, docs, *args, **kwargs):
+        time.sleep(self.rtt)
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        return self._tracked([doc["_id"] for doc in docs], self._collection.insert_many, docs, *args, **kwargs)
+
+    def find_one_and_update(self, filter, *args, **kwargs):
+        time.sleep(self.rtt)
+        return self._tracked(self._ids(filter)[:1], self._collection.find_one_and_update, filter, *args, **kwargs)
+
+    def delete_one(self, filter, *args, **kwargs):
+        time.sleep(self.rtt)
+        return self._tracked(self._ids(filter)[:1], self._collection.delete_one, filter, *args, **kwargs)
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        requests = list(requests)
+        ids = []
+        for request in requests:
+            if isinstance(request, InsertOne):
+                request._doc.setdefault("_id", ObjectId())
+            ids += [request._doc["_id"]] if isinstance(request, InsertOne) else self._ids(request._filter)
+        return self._tracked(ids, super().bulk_write, requests, ordered=ordered, **kwargs)
+
+    def watch(self, full_document=None, resume_after=None, max_await_time_ms=1000, **kwargs):
+        time.sleep(self.rtt)
+        start = resume_after["_data"] + 1 if resume_after else len(self.events)
+        return StandinChangeStream(self, start, full_document == "updateLookup", max_await_time_ms)
+
+
+class StandinChangeStream:
+    """Synchronous change stream over a ``ReplicaSetCollection``'s events."""
+
+    def __init__(self, collection: ReplicaSetCollection, position: int, lookup: bool, max_await_time_ms: int):
+        self.collection = collection
+        self.position = position
+        self.lookup = lookup
+        self.max_await = max_await_time_ms / 1000.0
+        self.resume_token = None
+
+    def try_next(self):
+        """Return the next event, or None after waiting ``max_await_time_ms`` for one."""
+        with self.collection.changed:
+            self.collection.changed.wait_for(lambda: self.position < len(self.collection.events), self.max_await)
+            if self.position >= len(self.collection.events):
+                return None
+            event = dict(self.collection.events[self.position])
+        time.sleep(self.collection.rtt)
+        self.position += 1
+        self.resume_token = event["_id"]
+        if event["operationType"] != "insert" and not (event["operationType"] == "update" and self.lookup):
+            event.pop("fullDocument")
+        return event
+
+    def close(self):
+        pass
+
+
+class BlockingCollection:
+    """Awaitable wrapper that calls the sync collection on the event loop.
+
+    This reproduces how ``TodoDatabase`` behaved before the async driver: the
+    coroutine is ``async def`` but each call blocks the loop for a round trip.
+    """
+
+    def __init__(self, collection):
+        self.sync_collection = collection
+
+    def __getattr__(self, name):
+        attr = getattr(self.sync_collection, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def standin_collection(rtt_ms: float = DEFAULT_RTT_MS, name: str = "todos",
+                       replica_set: bool = False) -> LatencyCollection:
+    """Create an empty stand-in collection (``todos`` by default)."""
+    collection_class = ReplicaSetCollection if replica_set else LatencyCollection
+    return collection_class(mongomock.MongoClient()["todo_db"][name], rtt_ms)
+
+
+def attach(db, collection, tombstones=None) -> None:
+    """Point a ``TodoDatabase`` at already-connected ``todos`` and tombstone collections."""
+    db.use_memory = False
+    db.connected = True
+    db.collection = TimedCollection(collection, db._record_round_trip)
+    if tombstones is not None:
+        db.tombstones = TimedCollection(tombstones, db._record_round_trip)
+
+
+def attach_standin(db, mode: str = "threaded", rtt_ms: float = DEFAULT_RTT_MS,
+                   max_workers: int = 64, replica_set: bool = False) -> None:
+    """Attach a stand-in collection using the ``blocking`` or ``threaded`` path.
+
+    ``replica_set=True`` (threaded only) supports change streams on ``todos``.
+    """
+    collection = standin_collection(rtt_ms, replica_set=replica_set)
+    tombstones = standin_collection(rtt_ms, "todo_tombstones")
+    if mode == "blocking":
+        if replica_set:
+            raise ValueError("Change streams need the threaded stand-in")
+        attach(db, BlockingCollection(collection), BlockingCollection(tombstones))
+    elif mode == "threaded":
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bench-mongo")
+        attach(db, ThreadedCollection(collection, executor), ThreadedCollection(tombstones, executor))
+    else:
+        raise ValueError(f"Unknown stand-in mode '{mode}'")
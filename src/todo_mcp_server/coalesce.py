@@ -0,0 +1,96 @@
+"""Write coalescing for the Todo MCP Server."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class WriteCoalescer:
+    """Groups writes that arrive close together into one bulk call.
+
+    ``submit`` queues an item and waits. The queue is flushed ``window``
+    seconds after its first item arrived, or as soon as it holds
+    ``max_batch`` items, by a single ``flush(items)`` call that returns one
+    result per item; each caller gets its own result. If ``flush`` raises,
+    every caller in that batch gets the exception.
+
+    Items submitted with a ``key`` already queued (e.g. two updates of the
+    same todo) start a new batch, so they are never applied in one unordered
+    bulk write.
+    """
+
+    def __init__(self, flush: Callable[[List[Any]], Awaitable[List[Any]]], window: float, max_batch: int):
+        self.flush = flush
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._queue: List[Tuple[Any, asyncio.Future]] = []
+        self._keys: Set[Hashable] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_batch > 1
+
+    async def submit(self, item: Any, key: Optional[Hashable] = None) -> Any:
+        """Queue ``item`` for the next bulk call and return its result."""
+        loop = asyncio.get_running_loop()
+        if key is not None and key in self._keys:
+            self._flush_queue()
+        future = loop.create_future()
+        self._queue.append((item, future))
+        if key is not None:
+            self._keys.add(key)
+        if len(self._queue) >= self.max_batch:
+            self._flush_queue()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_queue)
+        return await future
+
+    def _flush_queue(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queue:
+            return
+        batch, self._queue = self._queue, []
+        self._keys = set()
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self.flush([item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self):
+        """Flush queued items now and wait for every bulk call in flight."""
+        self._flush_queue()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counters."""
+        return {
+            "window_ms": round(self.window * 1000, 3),
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
@@ -1,13 +1,89 @@
 """Database connection and operations for the Todo MCP Server."""
 
+import asyncio
+import functools
+import heapq
 import os
-from typing import List, Optional
-from datetime import datetime
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.database import Database
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
 from bson import ObjectId
-from .models import TodoItem, TodoCreate, TodoUpdate
+from .cache import TTLCache
+from .coalesce import WriteCoalescer
+from .indexes import index_models, plan_index_names, plan_stages, standard_queries, tombstone_indexes
+from .memory_store import SORT_FIELDS, MemoryStore, utc_key
+from .metrics import metrics
+from .models import (
+    TODO_FIELDS, BatchItemResult, ChangeCursor, TodoChanges, TodoItem, TodoCreate, TodoRecord, TodoUpdate, TodoQuery,
+)
+from .mongo import TimedCollection, create_client, timed
+from .persistence import DurableMemoryStore
+from .resilience import CircuitBreaker, TodoUnavailable, WriteBehindFull, WriteBehindQueue, connection_errors
+from .subscriptions import ChangeEvent, event_from_change, event_from_record
+from .text_search import tokenize
+
+# Buffered writes sent per bulk_write when replaying after an outage
+REPLAY_BATCH_SIZE = 1000
+
+# Lowest ObjectId: a cursor (t, CURSOR_FLOOR_ID) comes before every change at t
+CURSOR_FLOOR_ID = ObjectId(b"\x00" * 12)
+
+# Changes read per list_changes call when polling for resource subscriptions
+POLL_BATCH_SIZE = 500
+
+# Server error code for "$changeStream is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+
+def trips_breaker(method):
+    """Open the circuit breaker when a MongoDB call fails to reach the server.
+    
+    The failing call still raises (methods that map other errors to "not
+    found" re-raise ``ConnectionFailure``); later calls are served from memory.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        except connection_errors() as e:
+            if not self.use_memory:
+                await self._open_breaker(e)
+            raise
+    return wrapper
+
+
+def page_changes(changes: Iterable[Tuple[datetime, ObjectId, Optional[TodoRecord]]], limit: int,
+                 until: datetime) -> TodoChanges:
+    """Build a page from ``(changed_at, id, todo)`` entries in change order (todo None when deleted).
+    
+    A short page means everything before ``until`` was listed, so the next
+    page starts there.
+    """
+    page = [change for _, change in zip(range(limit + 1), changes)]
+    has_more = len(page) > limit
+    page = page[:limit]
+    cursor = page[-1][:2] if has_more else (until, CURSOR_FLOOR_ID)
+    return TodoChanges(
+        [todo for _, _, todo in page if todo is not None],
+        [todo_id for _, todo_id, todo in page if todo is None],
+        cursor,
+        has_more
+    )
+
+
+def mongo_client_options() -> Dict[str, Any]:
+    """PyMongo client options from the environment (pool size, compression, timeouts)."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "5000")),
+    }
+    compressors = os.getenv("MONGODB_COMPRESSORS")
+    if compressors:
+        options["compressors"] = compressors
+    return options
 
 
 class TodoDatabase:
@@ -18,71 +94,406 @@ class TodoDatabase:
         self.mongodb_uri = os.getenv("MONGODB_URI")
         self.database_name = os.getenv("MONGODB_DATABASE", "todo_db")
         self.use_memory = os.getenv("USE_MEMORY_DB", "false").lower() == "true"
-        self.client: Optional[MongoClient] = None
-        self.database: Optional[Database] = None
-        self.collection: Optional[Collection] = None
+        self.driver = os.getenv("MONGODB_DRIVER", "auto").lower()
+        self.client: Optional[Any] = None
+        self.database: Optional[Any] = None
+        self.collection: Optional[Any] = None
+        self.tombstones: Optional[Any] = None
         self.connected = False
-        self.memory_store = []  # In-memory fallback
+        # In-memory fallback, persisted to disk when MEMORY_DB_PATH is set
+        memory_path = os.getenv("MEMORY_DB_PATH")
+        if memory_path:
+            self.memory_store: MemoryStore = DurableMemoryStore(
+                memory_path,
+                fsync=os.getenv("MEMORY_DB_FSYNC", "false").lower() == "true",
+                compact_ops=int(os.getenv("MEMORY_DB_COMPACT_OPS", "100000"))
+            )
+        else:
+            self.memory_store = MemoryStore()
+        # get_changes_since: deletes are remembered this long, and MongoDB
+        # changes are only listed once they are older than the settle time, so
+        # writes still in flight are not skipped
+        self.tombstone_retention = timedelta(hours=float(os.getenv("TOMBSTONE_RETENTION_HOURS", "168")))
+        self.changes_settle = timedelta(milliseconds=float(os.getenv("CHANGES_SETTLE_MS", "1000")))
+        self.memory_store.tombstone_retention = self.tombstone_retention
+        # Change cursors before this need a full resync (storage switched during an outage)
+        self.changes_reset_at: Optional[datetime] = None
+        # Resource subscriptions poll list_changes this often where change streams are unavailable
+        self.subscription_poll = float(os.getenv("SUBSCRIPTION_POLL_MS", "1000")) / 1000
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self.auto_index = os.getenv("MONGODB_AUTO_INDEX", "true").lower() == "true"
+        self.index_status = "not started"
+        self._index_task: Optional[asyncio.Task] = None
+        # Connection tuning; EAGER_CONNECT opens the database at server start
+        self.client_options = mongo_client_options()
+        self.eager_connect = os.getenv("EAGER_CONNECT", "false").lower() == "true"
+        self.heartbeat_interval = float(os.getenv("MONGODB_HEARTBEAT_SECONDS", "30"))
+        self.health_status = "unknown"
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # During a MongoDB outage, serve from memory and buffer writes for replay
+        self.auto_recover = os.getenv("MONGODB_AUTO_RECOVER", "true").lower() == "true"
+        self.breaker = CircuitBreaker(
+            initial_delay=float(os.getenv("MONGODB_RECONNECT_INITIAL_SECONDS", "1")),
+            max_delay=float(os.getenv("MONGODB_RECONNECT_MAX_SECONDS", "60"))
+        )
+        self.write_behind = WriteBehindQueue(int(os.getenv("WRITE_BEHIND_MAX_OPS", "10000")))
+        self._recovery_task: Optional[asyncio.Task] = None
+        # Read-through caches for the MongoDB path (TODO_CACHE_SIZE=0 disables)
+        cache_size = int(os.getenv("TODO_CACHE_SIZE", "1024"))
+        cache_ttl = float(os.getenv("TODO_CACHE_TTL", "10"))
+        self.todo_cache = TTLCache(cache_size, cache_ttl)
+        self.list_cache = TTLCache(cache_size, cache_ttl)
+        # Concurrent create_todo/update_todo calls on MongoDB become one bulk write (window 0 disables)
+        coalesce_window = float(os.getenv("WRITE_COALESCE_WINDOW_MS", "0")) / 1000
+        coalesce_max_batch = int(os.getenv("WRITE_COALESCE_MAX_BATCH", "100"))
+        self.insert_coalescer = WriteCoalescer(self.create_todos, coalesce_window, coalesce_max_batch)
+        self.update_coalescer = WriteCoalescer(self.update_todos, coalesce_window, coalesce_max_batch)
         
-    def _ensure_connection(self):
+    async def _ensure_connection(self):
         """Ensure database connection is established (lazy connection)."""
         if self.connected:
             return
+        
+        # Concurrent first calls must share a single connection attempt
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connected:
+                return
             
-        if self.use_memory or not self.mongodb_uri:
-            print("🔄 Using in-memory storage (no MongoDB connection)")
-            self.connected = True
-            return
+            if self.use_memory or not self.mongodb_uri:
+                print("🔄 Using in-memory storage (no MongoDB connection)", file=sys.stderr)
+                await self._open_memory_store()
+                self.use_memory = True
+                self.connected = True
+                self.health_status = "ok"
+                return
             
-        self.connect()
+            await self.connect()
+    
+    async def _open_memory_store(self):
+        """Load the in-memory store, which reads its files when it is durable."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.memory_store.open)
         
-    def connect(self):
+    async def connect(self):
         """Connect to MongoDB."""
         if not self.mongodb_uri:
-            print("⚠️  No MONGODB_URI provided, falling back to in-memory storage")
+            print("⚠️  No MONGODB_URI provided, falling back to in-memory storage", file=sys.stderr)
+            await self._open_memory_store()
             self.use_memory = True
             self.connected = True
             return
             
         try:
-            print(f"Attempting to connect to MongoDB...")
-            print(f"URI: {self.mongodb_uri[:20]}...")  # Only show first 20 chars for security
-            print(f"Database: {self.database_name}")
+            print(f"Attempting to connect to MongoDB...", file=sys.stderr)
+            print(f"URI: {self.mongodb_uri[:20]}...", file=sys.stderr)  # Only show first 20 chars for security
+            print(f"Database: {self.database_name}", file=sys.stderr)
             
-            self.client = MongoClient(
-                self.mongodb_uri,
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                connectTimeoutMS=5000,
-                socketTimeoutMS=5000
-            )
-            self.database = self.client[self.database_name]
-            self.collection = self.database["todos"]
-            
-            # Test the connection
-            self.client.admin.command('ping')
-            print(f"✅ Successfully connected to MongoDB!")
-            print(f"Database: {self.database_name}")
-            print(f"Collection: todos")
+            driver = await self._open_client()
+            await self._replay_leftovers()
+            self.health_status = "ok"
+            print(f"✅ Successfully connected to MongoDB!", file=sys.stderr)
+            print(f"Driver: {driver}", file=sys.stderr)
+            print(f"Database: {self.database_name}", file=sys.stderr)
+            print(f"Collection: todos", file=sys.stderr)
             self.connected = True
+            self._start_background_tasks()
             
         except Exception as e:
-            print(f"⚠️  Failed to connect to MongoDB: {str(e)}")
-            print("🔄 Falling back to in-memory storage")
-            self.use_memory = True
+            print(f"⚠️  Failed to connect to MongoDB: {str(e)}", file=sys.stderr)
+            await self._close_client()
+            if self.auto_recover:
+                await self._open_breaker(e)
+            else:
+                print("🔄 Falling back to in-memory storage", file=sys.stderr)
+                await self._open_memory_store()
+                self.use_memory = True
+                self.health_status = "ok"
             self.connected = True
-            self.client = None
-            self.database = None
-            self.collection = None
     
-    def disconnect(self):
-        """Disconnect from MongoDB."""
+    async def _open_client(self) -> str:
+        """Create the MongoDB client and ping it; returns the driver name."""
+        self.client, driver = create_client(self.mongodb_uri, driver=self.driver, **self.client_options)
+        self.database = self.client[self.database_name]
+        self.collection = TimedCollection(self.database["todos"], self._record_round_trip)
+        self.tombstones = TimedCollection(self.database["todo_tombstones"], self._record_round_trip)
+        await timed(self._record_round_trip, "ping", self.client.admin.command('ping'))
+        return driver
+    
+    async def _close_client(self):
+        if self.client:
+            await self.client.close()
+        self.client = None
+        self.database = None
+        self.collection = None
+        self.tombstones = None
+    
+    def _start_background_tasks(self):
+        # Index creation is idempotent; run it without delaying the first call
+        if self.auto_index and self.index_status != "ready":
+            self._index_task = asyncio.create_task(self.ensure_indexes())
+        if self.heartbeat_interval > 0:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+    
+    async def _open_breaker(self, error: Exception):
+        """Switch to the in-memory store after a connection failure.
+        
+        Writes are buffered in ``write_behind`` while ``_recover`` reconnects
+        in the background.
+        """
+        if not self.auto_recover or self.breaker.state != CircuitBreaker.CLOSED:
+            return
+        self.breaker.trip(error)
+        self.health_status = f"unreachable: {error}"
+        print("🔄 Serving from in-memory storage until MongoDB is reachable; writes will be replayed",
+              file=sys.stderr)
+        if self._heartbeat_task and self._heartbeat_task is not asyncio.current_task():
+            self._heartbeat_task.cancel()
+        await self._open_memory_store()
+        self._queue_leftovers()
+        self.memory_store.listeners.append(self.write_behind.record)
+        self.use_memory = True
+        self.changes_reset_at = datetime.utcnow()
+        self._invalidate_cache()
+        self._recovery_task = asyncio.create_task(self._recover())
+    
+    async def _recover(self):
+        """Reconnect with backoff, replay buffered writes, then switch back to MongoDB."""
+        while True:
+            await asyncio.sleep(self.breaker.next_delay())
+            self.breaker.half_open()
+            try:
+                if self.client is None:
+                    await self._open_client()
+                else:
+                    await timed(self._record_round_trip, "ping", self.client.admin.command('ping'))
+                await self._replay_write_behind()
+            except Exception as e:
+                self.breaker.attempt_failed(e)
+                self.health_status = f"unreachable: {e}"
+                continue
+            self._close_breaker()
+            return
+    
+    async def _replay_write_behind(self):
+        """Apply buffered writes to MongoDB in order, in bulk."""
+        while len(self.write_behind):
+            ops = self.write_behind.peek(REPLAY_BATCH_SIZE)
+            await self.collection.bulk_write(ops, ordered=True)
+            self.write_behind.pop(len(ops))
+    
+    def _queue_leftovers(self) -> List[ObjectId]:
+        """Queue the todos the outage store holds from before this process for replay.
+        
+        The outage store is empty between outages unless it is durable and a
+        previous process stopped during one; its write-behind queue was lost
+        then, but every write it buffered concerned these todos, so
+        re-inserting them (as upserts) replays that outage.
+        """
+        if len(self.write_behind):
+            return []
+        leftovers = list(self.memory_store)
+        for todo_doc in leftovers:
+            self.write_behind.record({"op": "i", "doc": todo_doc})
+        return [todo_doc["_id"] for todo_doc in leftovers]
+    
+    async def _replay_leftovers(self):
+        """Replay todos a previous process wrote to durable memory during an outage."""
+        if not isinstance(self.memory_store, DurableMemoryStore):
+            return
+        await self._open_memory_store()
+        leftover_ids = self._queue_leftovers()
+        if not leftover_ids:
+            return
+        await self._replay_write_behind()
+        for todo_id in leftover_ids:
+            self.memory_store.evict(todo_id)
+        print(f"✅ Replayed {len(leftover_ids)} todos written during an earlier outage", file=sys.stderr)
+    
+    def _close_breaker(self):
+        """Switch back to MongoDB once every buffered write has been replayed.
+        
+        Runs without awaiting, so no write can land in memory after the final
+        replay batch and before the switch.
+        """
+        self.memory_store.listeners.remove(self.write_behind.record)
+        outage_ids = [doc["_id"] for doc in self.memory_store]
+        self.use_memory = False
+        # Deletes replayed from the outage left no tombstones on MongoDB
+        self.changes_reset_at = datetime.utcnow()
+        # MongoDB now holds these todos; drop them from memory (and its log)
+        # without reporting deletes to resource subscriptions
+        for todo_id in outage_ids:
+            self.memory_store.evict(todo_id)
+        self.breaker.close()
+        self.health_status = "ok"
+        self._invalidate_cache()
+        print(f"✅ Reconnected to MongoDB; {self.write_behind.replayed} buffered writes replayed so far",
+              file=sys.stderr)
+        self._start_background_tasks()
+    
+    def _check_write_behind(self):
+        """Reject writes during an outage once the write-behind queue is full."""
+        if self.breaker.state != CircuitBreaker.CLOSED and self.write_behind.full:
+            raise WriteBehindFull(
+                f"MongoDB is unreachable and {len(self.write_behind)} writes are waiting to be "
+                "replayed; try again later"
+            )
+    
+    @property
+    def in_outage(self) -> bool:
+        """Whether requests are being served from memory until MongoDB is back."""
+        return self.breaker.state != CircuitBreaker.CLOSED
+    
+    def _unavailable(self, object_id: ObjectId) -> str:
+        """Error for a todo missing from memory during an outage: it may exist in MongoDB."""
+        return (f"MongoDB is unreachable and todo {object_id} is not in the outage store; "
+                "it can be read and changed again once MongoDB is back")
+    
+    def _not_found(self, object_id: ObjectId) -> str:
+        """Batch item error for a todo that was not found."""
+        return self._unavailable(object_id) if self.use_memory and self.in_outage else "Todo item not found"
+    
+    def breaker_stats(self) -> Dict[str, Any]:
+        """Return circuit breaker and write-behind queue state."""
+        return {**self.breaker.stats(), **self.write_behind.stats()}
+    
+    def warm_up(self) -> asyncio.Task:
+        """Start connecting in the background so the first tool call does not wait."""
+        return asyncio.create_task(self._ensure_connection())
+    
+    async def _heartbeat(self):
+        """Ping MongoDB periodically to keep pooled connections warm and track health."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await timed(self._record_round_trip, "ping", self.client.admin.command('ping'))
+                self.health_status = "ok"
+            except connection_errors() as e:
+                print(f"⚠️  MongoDB heartbeat failed: {str(e)}", file=sys.stderr)
+                if self.auto_recover:
+                    await self._open_breaker(e)
+                    return
+                self.health_status = f"unreachable: {e}"
+            except Exception as e:
+                self.health_status = f"unreachable: {e}"
+    
+    def _record_round_trip(self, op: str, seconds: float, error: bool):
+        metrics.record_db("mongo", op, seconds, error)
+    
+    async def disconnect(self):
+        """Disconnect from MongoDB and close the in-memory store."""
+        await self.insert_coalescer.drain()
+        await self.update_coalescer.drain()
+        if self._index_task and not self._index_task.done():
+            self._index_task.cancel()
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+        if self._recovery_task and not self._recovery_task.done():
+            self._recovery_task.cancel()
+        if self.write_behind:
+            await self._final_replay()
+        # Also closes a durable outage store opened by an earlier outage
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.memory_store.close)
         if self.client:
-            self.client.close()
-            print("Disconnected from MongoDB")
+            await self._close_client()
+            print("Disconnected from MongoDB", file=sys.stderr)
+    
+    async def _final_replay(self):
+        """Try once more to replay buffered writes before shutting down."""
+        try:
+            if self.client is None:
+                await self._open_client()
+            await self._replay_write_behind()
+        except Exception as e:
+            if isinstance(self.memory_store, DurableMemoryStore):
+                kept = "they are kept in MEMORY_DB_PATH and replayed on the next start"
+            else:
+                kept = "they are lost (set MEMORY_DB_PATH to keep them across restarts)"
+            print(f"❌ MongoDB is unreachable ({str(e)}): {len(self.write_behind)} buffered writes "
+                  f"were not replayed; {kept}", file=sys.stderr)
+            return
+        self._close_breaker()
+        print("✅ Replayed the buffered writes before shutting down", file=sys.stderr)
+    
+    async def ensure_indexes(self) -> List[str]:
+        """Create the declared indexes on the todos collection (idempotent).
+        
+        Failures are recorded in ``index_status`` rather than raised, since
+        this normally runs as a background task.
+        """
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+        
+        self.index_status = "in progress"
+        try:
+            names = await self.collection.create_indexes(index_models())
+            if self.tombstones is not None:
+                names += await self.tombstones.create_indexes(
+                    index_models(tombstone_indexes(self.tombstone_retention))
+                )
+        except Exception as e:
+            self.index_status = f"failed: {e}"
+            print(f"⚠️  Failed to create indexes: {str(e)}", file=sys.stderr)
+            return []
+        self.index_status = "ready"
+        print(f"✅ Indexes ready: {', '.join(names)}", file=sys.stderr)
+        return names
+    
+    @trips_breaker
+    async def explain_queries(self) -> List[Dict[str, Any]]:
+        """Run ``explain()`` on the server's standard queries.
+        
+        Each report lists the winning plan's stages and indexes and whether
+        it fell back to a collection scan.
+        """
+        await self._ensure_connection()
+        
+        if self.use_memory:
+            raise RuntimeError("Query plans are only available with MongoDB storage")
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+        
+        reports = []
+        for name, query in standard_queries().items():
+            explain = await self._list_cursor(query, self._query_filter(query)).explain()
+            stages = plan_stages(explain)
+            reports.append({
+                "query": name,
+                "stages": stages,
+                "indexes": plan_index_names(explain),
+                "collection_scan": "COLLSCAN" in stages,
+                "in_memory_sort": "SORT" in stages,
+            })
+        return reports
     
+    def _invalidate_cache(self, *object_ids: ObjectId):
+        """Drop cached entries for the given todos and every cached listing."""
+        for object_id in object_ids:
+            self.todo_cache.invalidate(object_id)
+        self.list_cache.invalidate()
+    
+    @property
+    def storage_backend(self) -> str:
+        """Name of the storage in use."""
+        return "memory" if self.use_memory else "mongodb"
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return hit/miss counters for the read-through caches."""
+        return {"todos": self.todo_cache.stats(), "lists": self.list_cache.stats()}
+    
+    def coalesce_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return batch counters for write coalescing, or nothing when it is off."""
+        if not self.insert_coalescer.enabled:
+            return {}
+        return {"inserts": self.insert_coalescer.stats(), "updates": self.update_coalescer.stats()}
+    
+    @trips_breaker
     async def create_todo(self, todo_data: TodoCreate) -> TodoItem:
         """Create a new todo item."""
-        self._ensure_connection()
+        await self._ensure_connection()
         
         todo_dict = todo_data.dict()
         todo_dict["created_at"] = datetime.utcnow()
@@ -91,63 +502,414 @@ class TodoDatabase:
         
         if self.use_memory:
             # In-memory storage
-            from bson import ObjectId
+            self._check_write_behind()
             todo_dict["_id"] = ObjectId()
-            self.memory_store.append(todo_dict.copy())
+            self.memory_store.insert(todo_dict.copy())
         else:
             # MongoDB storage
-            if not self.collection:
+            if self.collection is None:
                 raise RuntimeError("Database not connected")
-            result = self.collection.insert_one(todo_dict)
+            if self.insert_coalescer.enabled:
+                result = await self.insert_coalescer.submit(todo_data)
+                if result.error:
+                    from pymongo.errors import WriteError
+                    raise WriteError(result.error)
+                return result.todo
+            result = await self.collection.insert_one(todo_dict)
             todo_dict["_id"] = result.inserted_id
+            self._invalidate_cache()
         
         return TodoItem(**todo_dict)
     
-    async def get_all_todos(self) -> List[TodoItem]:
+    async def get_all_todos(self) -> List[TodoRecord]:
         """Get all todo items."""
-        self._ensure_connection()
+        todos, _ = await self.list_todos(TodoQuery())
+        return todos
+    
+    @trips_breaker
+    async def list_todos(self, query: TodoQuery) -> Tuple[List[TodoRecord], Optional[str]]:
+        """Get one page of todo items matching a query.
+        
+        Returns the todos and the ``after_id`` cursor for the next page, or
+        None when this is the last page.
+        """
+        await self._ensure_connection()
+        
+        if query.sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{query.sort_by}', expected one of {SORT_FIELDS}")
+        if query.sort_order not in ("asc", "desc"):
+            raise ValueError("sort_order must be 'asc' or 'desc'")
+        unknown_fields = set(query.fields or ()) - set(TODO_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Unknown fields {sorted(unknown_fields)}, expected some of {TODO_FIELDS}")
+        descending = query.sort_order == "desc"
+        after_id = ObjectId(query.after_id) if query.after_id else None
+        cache_key = None
         
-        todos = []
         if self.use_memory:
             # In-memory storage
-            for todo_doc in self.memory_store:
-                todos.append(TodoItem(**todo_doc))
+            todo_docs, has_more = self.memory_store.query(
+                completed=query.completed,
+                priority=query.priority,
+                due_after=query.due_after,
+                due_before=query.due_before,
+                sort_by=query.sort_by,
+                descending=descending,
+                after_id=after_id,
+                limit=query.limit,
+                fields=query.fields,
+            )
         else:
             # MongoDB storage
-            if not self.collection:
+            if self.collection is None:
                 raise RuntimeError("Database not connected")
-            for todo_doc in self.collection.find():
-                todos.append(TodoItem(**todo_doc))
+            # Only bounded pages are cached
+            cache_key = tuple(sorted(query.dict().items())) if query.limit is not None else None
+            if cache_key is not None:
+                cached = self.list_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            generation = self.list_cache.generation
+            
+            mongo_filter = self._query_filter(query)
+            if after_id is not None:
+                anchor = await self.collection.find_one({"_id": after_id}, {query.sort_by: 1})
+                if anchor is None:
+                    raise ValueError(f"after_id {after_id} not found")
+                keyset = self._keyset_filter(query.sort_by, anchor.get(query.sort_by), after_id, descending)
+                mongo_filter = {"$and": [mongo_filter, keyset]} if mongo_filter else keyset
+            
+            todo_docs = await self._list_cursor(query, mongo_filter).to_list(None)
+            has_more = query.limit is not None and len(todo_docs) > query.limit
+            if has_more:
+                todo_docs = todo_docs[:query.limit]
         
-        return todos
+        todos = [TodoRecord(todo_doc) for todo_doc in todo_docs]
+        next_after_id = str(todos[-1].id) if has_more else None
+        if cache_key is not None:
+            self.list_cache.set(cache_key, (todos, next_after_id), generation)
+        return todos, next_after_id
+    
+    def _list_cursor(self, query: TodoQuery, mongo_filter: Dict[str, Any]):
+        """Build the sorted, limited MongoDB cursor for a listing query.
+        
+        One extra document is requested to detect whether another page exists.
+        """
+        direction = -1 if query.sort_order == "desc" else 1
+        projection = {"_id": 1, **dict.fromkeys(query.fields, 1)} if query.fields is not None else None
+        cursor = self.collection.find(mongo_filter, projection).sort([(query.sort_by, direction), ("_id", direction)])
+        if query.limit is not None:
+            cursor = cursor.limit(query.limit + 1)
+        return cursor
+    
+    @staticmethod
+    def _query_filter(query: TodoQuery) -> Dict[str, Any]:
+        """Build the MongoDB filter for a query's field filters."""
+        mongo_filter: Dict[str, Any] = {}
+        if query.completed is not None:
+            mongo_filter["completed"] = query.completed
+        if query.priority is not None:
+            mongo_filter["priority"] = query.priority
+        due_range = {}
+        if query.due_after is not None:
+            due_range["$gte"] = query.due_after
+        if query.due_before is not None:
+            due_range["$lt"] = query.due_before
+        if due_range:
+            mongo_filter["due_date"] = due_range
+        return mongo_filter
+    
+    @staticmethod
+    def _keyset_filter(field: str, value: Any, after_id: ObjectId, descending: bool) -> Dict[str, Any]:
+        """Build the MongoDB filter for documents after ``(value, after_id)`` in sort order.
+        
+        MongoDB sorts missing/null values first, and range operators never
+        match null, so null anchors and descending pages need their own terms.
+        """
+        op = "$lt" if descending else "$gt"
+        if value is None:
+            if descending:
+                return {field: None, "_id": {op: after_id}}
+            return {"$or": [{field: {"$ne": None}}, {field: None, "_id": {op: after_id}}]}
+        clauses = [{field: {op: value}}, {field: value, "_id": {op: after_id}}]
+        if descending:
+            clauses.append({field: None})
+        return {"$or": clauses}
+    
+    def changes_floor(self, now: datetime) -> datetime:
+        """Earliest change cursor that can still be served without a full resync."""
+        if self.use_memory:
+            floor = self.memory_store.changes_since
+        else:
+            # The TTL monitor removes tombstones some time after they expire, never before
+            floor = now - self.tombstone_retention
+        if self.changes_reset_at is not None:
+            floor = max(floor, self.changes_reset_at)
+        return floor
+    
+    @trips_breaker
+    async def list_changes(self, since: Optional[ChangeCursor], limit: int) -> TodoChanges:
+        """Todos created, updated or deleted after ``since`` (everything when None).
+        
+        Reads the ``updated_at`` index and the tombstones from ``since`` on, so
+        the cost grows with the number of changes rather than the collection.
+        """
+        await self._ensure_connection()
+        
+        now = datetime.utcnow()
+        if since is not None and utc_key(since[0]) < self.changes_floor(now):
+            return TodoChanges([], [], None, reset=True)
+        
+        if self.use_memory:
+            # In-memory storage
+            return page_changes(
+                ((changed_at, todo_id, TodoRecord(doc) if doc is not None else None)
+                 for changed_at, todo_id, doc in self.memory_store.changes(since, now)),
+                limit, now
+            )
+        
+        # MongoDB storage
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+        until = now - self.changes_settle
+        # MongoDB keeps milliseconds, so a later write must not be stored before the cursor
+        until -= timedelta(microseconds=until.microsecond % 1000)
+        
+        def changed(field: str) -> Dict[str, Any]:
+            window = {field: {"$lt": until}}
+            if since is None:
+                return window
+            return {"$and": [window, self._keyset_filter(field, since[0], since[1], False)]}
+        
+        todo_docs, tombstones = await asyncio.gather(
+            self.collection.find(changed("updated_at"))
+                .sort([("updated_at", 1), ("_id", 1)]).limit(limit + 1).to_list(None),
+            self.tombstones.find(changed("deleted_at"))
+                .sort([("deleted_at", 1), ("_id", 1)]).limit(limit + 1).to_list(None)
+        )
+        return page_changes(
+            heapq.merge(
+                ((todo_doc["updated_at"], todo_doc["_id"], TodoRecord(todo_doc)) for todo_doc in todo_docs),
+                ((tombstone["deleted_at"], tombstone["_id"], None) for tombstone in tombstones),
+                key=lambda change: change[:2]
+            ),
+            limit, until
+        )
+    
+    async def watch_changes(self, publish: Callable[[ChangeEvent], None]):
+        """Call ``publish`` with every write to the todos until cancelled.
+        
+        In-memory writes, including those made during a MongoDB outage, come
+        from the memory store's listeners. MongoDB writes come from a change
+        stream, which needs a replica set; on a standalone server the changes
+        are polled from ``list_changes`` instead.
+        """
+        await self._ensure_connection()
+        
+        def listener(record: Dict[str, Any]):
+            publish(event_from_record(record, self.memory_store.get))
+        
+        self.memory_store.listeners.append(listener)
+        try:
+            if self.use_memory and self.breaker.state == CircuitBreaker.CLOSED:
+                # In-memory storage for good: the listener sees every write
+                await asyncio.Event().wait()
+            streams_supported = True
+            while True:
+                if self.use_memory:
+                    # MongoDB outage: wait for the breaker to close
+                    await asyncio.sleep(self.subscription_poll)
+                elif streams_supported:
+                    streams_supported = await self._watch_change_stream(publish)
+                else:
+                    await self._poll_changes(publish)
+        finally:
+            self.memory_store.listeners.remove(listener)
+    
+    async def _watch_change_stream(self, publish: Callable[[ChangeEvent], None]) -> bool:
+        """Publish MongoDB change stream events until an outage starts.
+        
+        Returns False when the server does not support change streams.
+        """
+        from pymongo.errors import OperationFailure
+        
+        resume_after = None
+        while not self.use_memory:
+            try:
+                stream = await self.collection.watch(
+                    full_document="updateLookup",
+                    resume_after=resume_after,
+                    max_await_time_ms=int(self.subscription_poll * 1000)
+                )
+            except (OperationFailure, NotImplementedError) as e:
+                if getattr(e, "code", CHANGE_STREAMS_UNSUPPORTED) != CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                print(f"⚠️  MongoDB change streams unavailable ({str(e)}); polling for changes every "
+                      f"{self.subscription_poll:g} s", file=sys.stderr)
+                return False
+            except connection_errors():
+                await asyncio.sleep(self.subscription_poll)
+                continue
+            try:
+                while not self.use_memory:
+                    change = await stream.try_next()
+                    if change is None:
+                        continue
+                    resume_after = change["_id"]
+                    event = event_from_change(change)
+                    if event is not None:
+                        # The write may come from another process; cached reads are stale
+                        self._invalidate_cache(event.todo_id)
+                        publish(event)
+            except OperationFailure as e:
+                # e.g. the resume token fell off the oplog; start from now
+                print(f"⚠️  MongoDB change stream restarted: {str(e)}", file=sys.stderr)
+                resume_after = None
+            except connection_errors():
+                await asyncio.sleep(self.subscription_poll)
+            finally:
+                await stream.close()
+        return True
+    
+    async def _poll_changes(self, publish: Callable[[ChangeEvent], None]):
+        """Publish the changes ``list_changes`` reports, every ``subscription_poll`` seconds.
+        
+        Updates are reported without the fields they changed, so every
+        listing subscription is notified of them.
+        """
+        since: ChangeCursor = (datetime.utcnow(), CURSOR_FLOOR_ID)
+        while not self.use_memory:
+            try:
+                changes = await self.list_changes(since, POLL_BATCH_SIZE)
+            except connection_errors():
+                await asyncio.sleep(self.subscription_poll)
+                continue
+            if changes.reset:
+                since = (datetime.utcnow(), CURSOR_FLOOR_ID)
+                continue
+            if changes.todos or changes.deleted_ids:
+                self._invalidate_cache(*(todo.id for todo in changes.todos), *changes.deleted_ids)
+            for todo in changes.todos:
+                publish(ChangeEvent(
+                    "update", todo.id, {"_id" if name == "id" else name: getattr(todo, name) for name in todo.__slots__}
+                ))
+            for todo_id in changes.deleted_ids:
+                publish(ChangeEvent("delete", todo_id))
+            since = changes.cursor
+            if not changes.has_more:
+                await asyncio.sleep(self.subscription_poll)
+    
+    @trips_breaker
+    async def search_todos(self, text: str, limit: int,
+                           completed: Optional[bool] = None) -> List[Tuple[TodoRecord, float]]:
+        """Full-text search over titles and descriptions.
+        
+        Returns up to ``limit`` todos containing any word of ``text``, best
+        match first, each with its relevance score.
+        """
+        await self._ensure_connection()
+        
+        if not tokenize(text):
+            return []
+        
+        if self.use_memory:
+            # In-memory storage
+            matches = self.memory_store.search(text, limit, completed)
+            return [(TodoRecord(todo_doc), score) for todo_doc, score in matches]
+        else:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            mongo_filter: Dict[str, Any] = {"$text": {"$search": text}}
+            if completed is not None:
+                mongo_filter["completed"] = completed
+            score = {"score": {"$meta": "textScore"}}
+            cursor = self.collection.find(mongo_filter, score).sort([("score", score["score"])]).limit(limit)
+            return [(TodoRecord(todo_doc), todo_doc["score"]) for todo_doc in await cursor.to_list(None)]
+    
+    @trips_breaker
+    async def todo_stats(self) -> Dict[str, Any]:
+        """Count todos by status and priority, and pending todos past their due date.
+        
+        Counts come from maintained counters in memory and from a single
+        aggregation pass on MongoDB; no todo documents are transferred.
+        """
+        await self._ensure_connection()
+        now = datetime.utcnow()
+        
+        if self.use_memory:
+            # In-memory storage
+            groups = [(*key, count) for key, count in self.memory_store.counts().items()]
+            overdue = self.memory_store.count_due_before(now, completed=False)
+        else:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            # One pass over the collection computes both facets on the server
+            status_priority = {"completed": "$completed", "priority": "$priority"}
+            pipeline = [{"$facet": {
+                "groups": [{"$group": {"_id": status_priority, "count": {"$sum": 1}}}],
+                "overdue": [{"$match": {"completed": False, "due_date": {"$lt": now}}}, {"$count": "count"}],
+            }}]
+            cursor = await self.collection.aggregate(pipeline)
+            facets = (await cursor.to_list(None))[0]
+            groups = [(group["_id"].get("completed"), group["_id"].get("priority"), group["count"])
+                      for group in facets["groups"]]
+            overdue = facets["overdue"][0]["count"] if facets["overdue"] else 0
+        
+        return self._stats_from_counts(groups, overdue)
+    
+    @staticmethod
+    def _stats_from_counts(groups: List[Tuple[Any, Any, int]], overdue: int) -> Dict[str, Any]:
+        """Build the stats result from ``(completed, priority, count)`` groups."""
+        stats: Dict[str, Any] = {"total": 0, "completed": 0, "pending": 0, "overdue": overdue, "by_priority": {}}
+        for completed, priority, count in groups:
+            status = "completed" if completed else "pending"
+            by_priority = stats["by_priority"].setdefault(priority, {"total": 0, "completed": 0, "pending": 0})
+            for counts in (stats, by_priority):
+                counts["total"] += count
+                counts[status] += count
+        return stats
     
+    @trips_breaker
     async def get_todo_by_id(self, todo_id: str) -> Optional[TodoItem]:
         """Get a todo item by ID."""
-        self._ensure_connection()
+        await self._ensure_connection()
         
         try:
             object_id = ObjectId(todo_id)
             
             if self.use_memory:
                 # In-memory storage
-                for todo_doc in self.memory_store:
-                    if todo_doc["_id"] == object_id:
-                        return TodoItem(**todo_doc)
+                todo_doc = self.memory_store.get(object_id)
+                if todo_doc:
+                    return TodoItem(**todo_doc)
+                if self.in_outage:
+                    raise TodoUnavailable(self._unavailable(object_id))
                 return None
             else:
                 # MongoDB storage
-                if not self.collection:
+                if self.collection is None:
                     raise RuntimeError("Database not connected")
-                todo_doc = self.collection.find_one({"_id": object_id})
+                cached = self.todo_cache.get(object_id)
+                if cached is not None:
+                    return cached
+                generation = self.todo_cache.generation
+                todo_doc = await self.collection.find_one({"_id": object_id})
                 if todo_doc:
-                    return TodoItem(**todo_doc)
+                    todo = TodoItem(**todo_doc)
+                    self.todo_cache.set(object_id, todo, generation)
+                    return todo
                 return None
+        except connection_errors():
+            raise
         except Exception:
             return None
     
+    @trips_breaker
     async def update_todo(self, todo_id: str, todo_update: TodoUpdate) -> Optional[TodoItem]:
         """Update a todo item."""
-        self._ensure_connection()
+        await self._ensure_connection()
         
         try:
             object_id = ObjectId(todo_id)
@@ -160,58 +922,365 @@ class TodoDatabase:
             
             if self.use_memory:
                 # In-memory storage
-                for i, todo_doc in enumerate(self.memory_store):
-                    if todo_doc["_id"] == object_id:
-                        self.memory_store[i].update(update_data)
-                        return TodoItem(**self.memory_store[i])
+                self._check_write_behind()
+                todo_doc = self.memory_store.update(object_id, update_data)
+                if todo_doc:
+                    return TodoItem(**todo_doc)
+                if self.in_outage:
+                    raise TodoUnavailable(self._unavailable(object_id))
                 return None
             else:
                 # MongoDB storage
-                if not self.collection:
+                if self.collection is None:
                     raise RuntimeError("Database not connected")
-                result = self.collection.update_one(
+                if self.update_coalescer.enabled:
+                    result = await self.update_coalescer.submit((todo_id, todo_update), key=object_id)
+                    if result.todo is None and self.use_memory and self.in_outage:
+                        # Queued before an outage and applied to memory, which lacks the todo
+                        raise TodoUnavailable(result.error)
+                    return result.todo
+                from pymongo import ReturnDocument
+                
+                # Single round trip: update and read back the post-image atomically
+                todo_doc = await self.collection.find_one_and_update(
                     {"_id": object_id},
-                    {"$set": update_data}
+                    {"$set": update_data},
+                    return_document=ReturnDocument.AFTER
                 )
-                
-                if result.modified_count > 0:
-                    return await self.get_todo_by_id(todo_id)
+                self._invalidate_cache(object_id)
+                if todo_doc:
+                    return TodoItem(**todo_doc)
                 return None
+        except connection_errors():
+            raise
         except Exception:
             return None
     
+    @trips_breaker
     async def delete_todo(self, todo_id: str) -> bool:
         """Delete a todo item."""
-        self._ensure_connection()
+        await self._ensure_connection()
         
         try:
             object_id = ObjectId(todo_id)
             
             if self.use_memory:
                 # In-memory storage
-                for i, todo_doc in enumerate(self.memory_store):
-                    if todo_doc["_id"] == object_id:
-                        del self.memory_store[i]
-                        return True
+                self._check_write_behind()
+                if self.memory_store.delete(object_id):
+                    return True
+                if self.in_outage:
+                    raise TodoUnavailable(self._unavailable(object_id))
                 return False
             else:
                 # MongoDB storage
-                if not self.collection:
+                if self.collection is None:
                     raise RuntimeError("Database not connected")
-                result = self.collection.delete_one({"_id": object_id})
-                return result.deleted_count > 0
+                result = await self.collection.delete_one({"_id": object_id})
+                self._invalidate_cache(object_id)
+                if result.deleted_count == 0:
+                    return False
+                await self._record_tombstones([object_id])
+                return True
+        except connection_errors():
+            raise
         except Exception:
             return False
     
+    @trips_breaker
     async def toggle_todo_status(self, todo_id: str) -> Optional[TodoItem]:
         """Toggle the completion status of a todo item."""
-        todo = await self.get_todo_by_id(todo_id)
-        if not todo:
+        await self._ensure_connection()
+        
+        try:
+            object_id = ObjectId(todo_id)
+            now = datetime.utcnow()
+            
+            if self.use_memory:
+                # In-memory storage
+                self._check_write_behind()
+                todo_doc = self.memory_store.get(object_id)
+                if not todo_doc:
+                    if self.in_outage:
+                        raise TodoUnavailable(self._unavailable(object_id))
+                    return None
+                todo_doc = self.memory_store.update(
+                    object_id, {"completed": not todo_doc["completed"], "updated_at": now}
+                )
+                return TodoItem(**todo_doc)
+            else:
+                # MongoDB storage
+                if self.collection is None:
+                    raise RuntimeError("Database not connected")
+                from pymongo import ReturnDocument
+                
+                # The pipeline update flips the stored value server-side, so
+                # concurrent toggles cannot read the same state and race
+                todo_doc = await self.collection.find_one_and_update(
+                    {"_id": object_id},
+                    [{"$set": {"completed": {"$not": "$completed"}, "updated_at": now}}],
+                    return_document=ReturnDocument.AFTER
+                )
+                self._invalidate_cache(object_id)
+                if todo_doc:
+                    return TodoItem(**todo_doc)
+                return None
+        except connection_errors():
+            raise
+        except Exception:
             return None
+    
+    @trips_breaker
+    async def create_todos(self, todos: List[TodoCreate]) -> List[BatchItemResult]:
+        """Create several todo items in one round trip.
+        
+        The insert is unordered, so one failing item does not stop the rest.
+        """
+        await self._ensure_connection()
+        
+        now = datetime.utcnow()
+        todo_dicts = []
+        for todo_data in todos:
+            todo_dict = todo_data.dict()
+            todo_dict["_id"] = ObjectId()
+            todo_dict["created_at"] = now
+            todo_dict["updated_at"] = now
+            todo_dict["completed"] = False
+            todo_dicts.append(todo_dict)
         
-        update_data = TodoUpdate(completed=not todo.completed)
-        return await self.update_todo(todo_id, update_data)
+        errors: Dict[int, str] = {}
+        if self.use_memory:
+            # In-memory storage
+            self._check_write_behind()
+            stored = self.memory_store.insert_many([todo_dict.copy() for todo_dict in todo_dicts])
+            errors = {i: error for i, error in enumerate(stored) if error}
+        elif todo_dicts:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            from pymongo.errors import BulkWriteError
+            
+            try:
+                await self.collection.insert_many(todo_dicts, ordered=False)
+            except BulkWriteError as e:
+                errors = {error["index"]: error["errmsg"] for error in e.details["writeErrors"]}
+            finally:
+                self._invalidate_cache()
+        
+        results = []
+        for i, todo_dict in enumerate(todo_dicts):
+            if i in errors:
+                results.append(BatchItemResult(index=i, error=errors[i]))
+            else:
+                todo = TodoItem(**todo_dict)
+                results.append(BatchItemResult(index=i, todo_id=str(todo.id), todo=todo))
+        return results
+    
+    @trips_breaker
+    async def update_todos(self, updates: List[Tuple[str, TodoUpdate]]) -> List[BatchItemResult]:
+        """Update several todo items with one unordered bulk write.
+        
+        Post-images are read back with a single query, so the whole batch
+        costs two round trips on MongoDB regardless of its size.
+        """
+        await self._ensure_connection()
+        
+        now = datetime.utcnow()
+        results: Dict[int, BatchItemResult] = {}
+        pending: List[Tuple[int, ObjectId, Dict[str, Any]]] = []
+        for i, (todo_id, todo_update) in enumerate(updates):
+            if not ObjectId.is_valid(todo_id):
+                results[i] = BatchItemResult(index=i, todo_id=todo_id, error="Invalid todo ID")
+                continue
+            update_data = {k: v for k, v in todo_update.dict().items() if v is not None}
+            if not update_data:
+                results[i] = BatchItemResult(index=i, todo_id=todo_id, error="No changes provided")
+                continue
+            update_data["updated_at"] = now
+            pending.append((i, ObjectId(todo_id), update_data))
+        
+        todo_docs: Dict[int, Optional[Dict[str, Any]]] = {}
+        if self.use_memory:
+            # In-memory storage
+            self._check_write_behind()
+            stored = self.memory_store.update_many([(object_id, data) for _, object_id, data in pending])
+            todo_docs = {i: todo_doc for (i, _, _), todo_doc in zip(pending, stored)}
+        elif pending:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            from pymongo import UpdateOne
+            from pymongo.errors import BulkWriteError
+            
+            requests = [UpdateOne({"_id": object_id}, {"$set": data}) for _, object_id, data in pending]
+            object_ids = [object_id for _, object_id, _ in pending]
+            try:
+                await self.collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details["writeErrors"]:
+                    i, object_id, _ = pending[error["index"]]
+                    results[i] = BatchItemResult(index=i, todo_id=str(object_id), error=error["errmsg"])
+            finally:
+                self._invalidate_cache(*object_ids)
+            found = {
+                todo_doc["_id"]: todo_doc
+                for todo_doc in await self.collection.find({"_id": {"$in": object_ids}}).to_list(None)
+            }
+            todo_docs = {i: found.get(object_id) for i, object_id, _ in pending}
+        
+        for i, object_id, _ in pending:
+            if i in results:
+                continue
+            todo_doc = todo_docs.get(i)
+            if todo_doc:
+                todo = TodoItem(**todo_doc)
+                results[i] = BatchItemResult(index=i, todo_id=str(object_id), todo=todo)
+            else:
+                results[i] = BatchItemResult(index=i, todo_id=str(object_id), error=self._not_found(object_id))
+        return [results[i] for i in range(len(updates))]
+    
+    @trips_breaker
+    async def delete_todos(self, todo_ids: List[str]) -> List[BatchItemResult]:
+        """Delete several todo items in one bulk operation."""
+        await self._ensure_connection()
+        
+        results: Dict[int, BatchItemResult] = {}
+        pending: List[Tuple[int, ObjectId]] = []
+        for i, todo_id in enumerate(todo_ids):
+            if ObjectId.is_valid(todo_id):
+                pending.append((i, ObjectId(todo_id)))
+            else:
+                results[i] = BatchItemResult(index=i, todo_id=todo_id, error="Invalid todo ID")
+        
+        deleted: Dict[int, bool] = {}
+        if self.use_memory:
+            # In-memory storage
+            self._check_write_behind()
+            stored = self.memory_store.delete_many([object_id for _, object_id in pending])
+            deleted = {i: ok for (i, _), ok in zip(pending, stored)}
+        elif pending:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            from pymongo import DeleteOne
+            from pymongo.errors import BulkWriteError
+            
+            object_ids = [object_id for _, object_id in pending]
+            existing = {
+                todo_doc["_id"]
+                for todo_doc in await self.collection.find({"_id": {"$in": object_ids}}, {"_id": 1}).to_list(None)
+            }
+            targets = [object_id for object_id in object_ids if object_id in existing]
+            if targets:
+                try:
+                    await self.collection.bulk_write(
+                        [DeleteOne({"_id": object_id}) for object_id in targets],
+                        ordered=False
+                    )
+                except BulkWriteError as e:
+                    for error in e.details["writeErrors"]:
+                        existing.discard(targets[error["index"]])
+                finally:
+                    self._invalidate_cache(*targets)
+                await self._record_tombstones([object_id for object_id in targets if object_id in existing])
+            # Repeated ids only count as deleted once, as in the memory store
+            for i, object_id in pending:
+                deleted[i] = object_id in existing
+                existing.discard(object_id)
+        
+        for i, object_id in pending:
+            if deleted.get(i):
+                results[i] = BatchItemResult(index=i, todo_id=str(object_id))
+            else:
+                results[i] = BatchItemResult(index=i, todo_id=str(object_id), error=self._not_found(object_id))
+        return [results[i] for i in range(len(todo_ids))]
+    
+    async def _record_tombstones(self, object_ids: List[ObjectId]):
+        """Remember deleted todos on MongoDB for get_changes_since."""
+        if self.tombstones is None or not object_ids:
+            return
+        from pymongo import UpdateOne
+        
+        now = datetime.utcnow()
+        await self.tombstones.bulk_write(
+            [UpdateOne({"_id": object_id}, {"$set": {"deleted_at": now}}, upsert=True) for object_id in object_ids],
+            ordered=False
+        )
+    
+    async def export_todos(self, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield every stored todo document, ``batch_size`` at a time.
+        
+        MongoDB streams one cursor in ``_id`` order, fetching a batch per
+        round trip; memory walks the ``created_at`` index. Only the current
+        batch is held, however large the collection.
+        """
+        await self._ensure_connection()
+        
+        if self.use_memory:
+            # In-memory storage
+            for batch in self.memory_store.batches(batch_size):
+                yield batch
+                # Let other tasks run between batches
+                await asyncio.sleep(0)
+        else:
+            # MongoDB storage
+            if self.collection is None:
+                raise RuntimeError("Database not connected")
+            batch = []
+            try:
+                async for todo_doc in self.collection.find({}).sort("_id", 1).batch_size(batch_size):
+                    batch.append(todo_doc)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+            except connection_errors() as e:
+                await self._open_breaker(e)
+                raise
+            if batch:
+                yield batch
+    
+    @trips_breaker
+    async def import_todos(self, todo_docs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert exported todo documents, keeping their IDs and creation times.
+        
+        ``updated_at`` becomes the import time, so clients syncing with
+        ``list_changes`` see the imported todos. Returns an error message (or
+        None) per document; documents whose ID already exists are skipped.
+        """
+        await self._ensure_connection()
+        
+        now = datetime.utcnow()
+        todo_docs = [{**todo_doc, "updated_at": now} for todo_doc in todo_docs]
+        if self.use_memory:
+            # In-memory storage
+            self._check_write_behind()
+            return self.memory_store.insert_many(todo_docs)
+        
+        # MongoDB storage
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+        errors: List[Optional[str]] = [None] * len(todo_docs)
+        if not todo_docs:
+            return errors
+        from pymongo.errors import BulkWriteError
+        
+        try:
+            await self.collection.insert_many(todo_docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                errors[error["index"]] = error["errmsg"]
+        finally:
+            self._invalidate_cache()
+        return errors
+
+
+def create_database() -> TodoDatabase:
+    """Create the database handler selected by the environment."""
+    if os.getenv("USE_SQLITE_DB", "false").lower() == "true":
+        from .sqlite_database import SQLiteTodoDatabase
+        return SQLiteTodoDatabase()
+    return TodoDatabase()
 
 
 # Global database instance
-db = TodoDatabase()
\ No newline at end of file
+db = create_database()
@@ -0,0 +1,76 @@
+"""HTTP transports for the Todo MCP Server.
+
+One process serves every client: each MCP session shares the same
+``TodoDatabase`` and therefore the same MongoDB connection pool. Two
+transports are mounted:
+
+* ``/mcp`` - streamable HTTP (the current MCP HTTP transport)
+* ``/sse`` with ``/messages/`` - the older HTTP+SSE transport
+
+``/metrics`` serves the Prometheus text from ``metrics`` and ``/health``
+reports whether the database is connected.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from mcp.server import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+from .metrics import metrics
+
+
+class StreamableHTTPEndpoint:
+    """ASGI endpoint handing requests to the streamable HTTP session manager."""
+
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+class SSEEndpoint:
+    """ASGI endpoint running one MCP session per SSE connection."""
+
+    def __init__(self, mcp_server: Server, transport: SseServerTransport):
+        self.mcp_server = mcp_server
+        self.transport = transport
+
+    async def __call__(self, scope, receive, send):
+        async with self.transport.connect_sse(scope, receive, send) as (read_stream, write_stream):
+            await self.mcp_server.run(read_stream, write_stream, self.mcp_server.create_initialization_options())
+
+
+def create_app(mcp_server: Server, database) -> FastAPI:
+    """Create the ASGI app serving ``mcp_server`` over HTTP."""
+    session_manager = StreamableHTTPSessionManager(app=mcp_server)
+    sse = SseServerTransport("/messages/")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with session_manager.run():
+            yield
+
+    app = FastAPI(title="Todo MCP Server", lifespan=lifespan)
+    app.add_route("/mcp", StreamableHTTPEndpoint(session_manager), methods=["GET", "POST", "DELETE"])
+    app.add_route("/sse", SSEEndpoint(mcp_server, sse), methods=["GET"])
+    app.mount("/messages/", app=sse.handle_post_message)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def prometheus_metrics() -> str:
+        return metrics.render_prometheus()
+
+    @app.get("/health")
+    async def health() -> JSONResponse:
+        return JSONResponse({
+            "status": "ok",
+            "connected": database.connected,
+            "storage": database.storage_backend if database.connected else None,
+            "health": database.health_status,
+            "breaker": database.breaker_stats(),
+        })
+
+    return app
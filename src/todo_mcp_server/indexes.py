@@ -0,0 +1,81 @@
+"""MongoDB index declarations and query-plan checks for the Todo MCP Server."""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from .models import TodoQuery
+from .text_search import TEXT_WEIGHTS
+
+
+# (keys, options) for each index; built into IndexModels only when connecting,
+# so importing this module does not load PyMongo.
+# Every index ends with _id so keyset pagination (sort field, _id) is covered
+TODO_INDEXES = [
+    ([("created_at", 1), ("_id", 1)], {"name": "created_at_id"}),
+    ([("updated_at", 1), ("_id", 1)], {"name": "updated_at_id"}),
+    ([("due_date", 1), ("_id", 1)], {"name": "due_date_id"}),
+    ([("completed", 1), ("due_date", 1), ("_id", 1)], {"name": "completed_due_date_id"}),
+    ([("priority", 1), ("created_at", 1), ("_id", 1)], {"name": "priority_created_at_id"}),
+    # Used by search_todos ($text)
+    ([(field, "text") for field in TEXT_WEIGHTS], {"weights": TEXT_WEIGHTS, "name": "title_description_text"}),
+]
+
+
+def tombstone_indexes(retention: timedelta) -> List[Tuple[list, Dict[str, Any]]]:
+    """Indexes of the tombstone collection: change order, and expiry after ``retention``.
+
+    TTL indexes must have a single field, hence the separate ``deleted_at`` index.
+    """
+    return [
+        ([("deleted_at", 1), ("_id", 1)], {"name": "deleted_at_id"}),
+        ([("deleted_at", 1)], {"name": "deleted_at_ttl", "expireAfterSeconds": int(retention.total_seconds())}),
+    ]
+
+
+def index_models(indexes: List[Tuple[list, Dict[str, Any]]] = TODO_INDEXES) -> List[Any]:
+    """Index declarations as PyMongo ``IndexModel`` objects for ``create_indexes``."""
+    from pymongo import IndexModel
+
+    return [IndexModel(keys, **options) for keys, options in indexes]
+
+
+def standard_queries() -> Dict[str, TodoQuery]:
+    """The listing queries the server issues, keyed by a descriptive name."""
+    now = datetime.utcnow()
+    return {
+        "list_default": TodoQuery(limit=50),
+        "list_newest_first": TodoQuery(sort_order="desc", limit=50),
+        "list_recently_updated": TodoQuery(sort_by="updated_at", sort_order="desc", limit=50),
+        "list_by_due_date": TodoQuery(sort_by="due_date", limit=50),
+        "list_pending_by_due_date": TodoQuery(completed=False, sort_by="due_date", limit=50),
+        "list_pending_due_this_week": TodoQuery(
+            completed=False, due_after=now, due_before=now + timedelta(days=7),
+            sort_by="due_date", limit=50
+        ),
+        "list_overdue": TodoQuery(completed=False, due_before=now, sort_by="due_date", limit=50),
+        "list_by_priority": TodoQuery(priority="high", limit=50),
+    }
+
+
+def _collect(node: Any, key: str, found: List[str]) -> List[str]:
+    """Collect string values of ``key`` from a nested explain document."""
+    if isinstance(node, dict):
+        if isinstance(node.get(key), str):
+            found.append(node[key])
+        for value in node.values():
+            _collect(value, key, found)
+    elif isinstance(node, list):
+        for value in node:
+            _collect(value, key, found)
+    return found
+
+
+def plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """Return all stage names in the winning plan of an ``explain()`` result."""
+    return _collect(explain.get("queryPlanner", {}).get("winningPlan", {}), "stage", [])
+
+
+def plan_index_names(explain: Dict[str, Any]) -> List[str]:
+    """Return the names of the indexes used by the winning plan."""
+    names = _collect(explain.get("queryPlanner", {}).get("winningPlan", {}), "indexName", [])
+    return list(dict.fromkeys(names))
@@ -0,0 +1,461 @@
+"""Indexed in-memory storage for the Todo MCP Server."""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+from .text_search import TEXT_WEIGHTS, tokenize
+
+
+SORT_FIELDS = ("created_at", "updated_at", "due_date")
+
+
+def utc_key(value: datetime) -> datetime:
+    """Normalize a datetime so naive and aware values sort together (as UTC)."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class MemoryStore:
+    """Todo documents keyed by ObjectId, with maintained secondary indexes.
+
+    Id lookups, updates and deletes are O(1). ``completed`` and ``priority``
+    have hash indexes, and ``due_date``, ``created_at`` and ``updated_at``
+    are kept in sorted lists, so filters only touch matching documents and
+    listings sorted by any of them page in O(log n + limit). ``title`` and
+    ``description`` have an inverted index (word -> ids) for text search.
+    Counts per ``(completed, priority)`` are kept up to date on every write.
+
+    Deletes leave a tombstone, kept for ``tombstone_retention`` (forever when
+    None), so ``changes`` can list everything that happened after a point in
+    time. ``changes_since`` is the earliest time from which that list is
+    complete.
+    """
+
+    HASH_INDEXES = ("completed", "priority")
+
+    def __init__(self):
+        self._docs: Dict[ObjectId, Dict[str, Any]] = {}
+        self._hash: Dict[str, Dict[Any, Set[ObjectId]]] = {
+            field: defaultdict(set) for field in self.HASH_INDEXES
+        }
+        self._due: List[Tuple[datetime, ObjectId]] = []
+        # Ids of todos without a due date, which sort before every due date
+        self._undated: List[ObjectId] = []
+        self._created: List[Tuple[datetime, ObjectId]] = []
+        self._updated: List[Tuple[datetime, ObjectId]] = []
+        # (deleted_at, id) of deleted todos
+        self._tombstones: List[Tuple[datetime, ObjectId]] = []
+        self.tombstone_retention: Optional[timedelta] = None
+        self.changes_since = datetime.utcnow()
+        # field -> word -> {id: occurrences}
+        self._text: Dict[str, Dict[str, Dict[ObjectId, int]]] = {field: {} for field in TEXT_WEIGHTS}
+        # (completed, priority) -> number of todos
+        self._counts: Counter = Counter()
+        # Called with an oplog-style record ("i"/"u"/"d") after every write
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._docs.values())
+
+    def __contains__(self, todo_id: ObjectId) -> bool:
+        return todo_id in self._docs
+
+    def open(self):
+        """Prepare the store for use. Plain memory stores have nothing to load."""
+
+    def close(self):
+        """Release resources held by the store."""
+
+    def load(self, docs: Iterable[Dict[str, Any]]):
+        """Replace the contents with ``docs``, building each index in one pass."""
+        self.clear()
+        for doc in docs:
+            self._docs[doc["_id"]] = doc
+        for todo_id, doc in self._docs.items():
+            for field in self.HASH_INDEXES:
+                self._hash[field][doc.get(field)].add(todo_id)
+        self._counts.update(self._count_key(doc) for doc in self._docs.values())
+        self._due = sorted(
+            (utc_key(doc["due_date"]), todo_id)
+            for todo_id, doc in self._docs.items() if doc.get("due_date") is not None
+        )
+        self._undated = sorted(todo_id for todo_id, doc in self._docs.items() if doc.get("due_date") is None)
+        self._created = sorted((utc_key(doc["created_at"]), todo_id) for todo_id, doc in self._docs.items())
+        self._updated = sorted((utc_key(doc["updated_at"]), todo_id) for todo_id, doc in self._docs.items())
+        for field, postings in self._text.items():
+            for todo_id, doc in self._docs.items():
+                for word in tokenize(doc.get(field)):
+                    ids = postings.get(word)
+                    if ids is None:
+                        postings[word] = {todo_id: 1}
+                    else:
+                        ids[todo_id] = ids.get(todo_id, 0) + 1
+
+    def clear(self):
+        """Remove all documents, index entries and tombstones."""
+        self._docs.clear()
+        for index in self._hash.values():
+            index.clear()
+        self._due.clear()
+        self._undated.clear()
+        self._created.clear()
+        self._updated.clear()
+        self._tombstones.clear()
+        self.changes_since = datetime.utcnow()
+        for index in self._text.values():
+            index.clear()
+        self._counts.clear()
+
+    INDEXED_FIELDS = HASH_INDEXES + ("due_date", "created_at", "updated_at") + tuple(TEXT_WEIGHTS)
+
+    def _index(self, doc: Dict[str, Any], fields: Iterable[str] = INDEXED_FIELDS):
+        todo_id = doc["_id"]
+        for field in fields:
+            if field in self._hash:
+                self._hash[field][doc.get(field)].add(todo_id)
+            elif field == "due_date":
+                if doc.get("due_date") is not None:
+                    insort(self._due, (utc_key(doc["due_date"]), todo_id))
+                else:
+                    insort(self._undated, todo_id)
+            elif field == "created_at":
+                insort(self._created, (utc_key(doc["created_at"]), todo_id))
+            elif field == "updated_at":
+                insort(self._updated, (utc_key(doc["updated_at"]), todo_id))
+            elif field in self._text:
+                postings = self._text[field]
+                for word in tokenize(doc.get(field)):
+                    ids = postings.setdefault(word, {})
+                    ids[todo_id] = ids.get(todo_id, 0) + 1
+
+    def _unindex(self, doc: Dict[str, Any], fields: Iterable[str] = INDEXED_FIELDS):
+        todo_id = doc["_id"]
+        for field in fields:
+            if field in self._hash:
+                bucket = self._hash[field].get(doc.get(field))
+                if bucket is not None:
+                    bucket.discard(todo_id)
+                    if not bucket:
+                        del self._hash[field][doc.get(field)]
+            elif field == "due_date":
+                if doc.get("due_date") is not None:
+                    self._remove_sorted(self._due, (utc_key(doc["due_date"]), todo_id))
+                else:
+                    self._remove_sorted(self._undated, todo_id)
+            elif field == "created_at":
+                self._remove_sorted(self._created, (utc_key(doc["created_at"]), todo_id))
+            elif field == "updated_at":
+                self._remove_sorted(self._updated, (utc_key(doc["updated_at"]), todo_id))
+            elif field in self._text:
+                postings = self._text[field]
+                for word in set(tokenize(doc.get(field))):
+                    ids = postings.get(word)
+                    if ids is not None:
+                        ids.pop(todo_id, None)
+                        if not ids:
+                            del postings[word]
+
+    @staticmethod
+    def _count_key(doc: Dict[str, Any]) -> Tuple[Any, Any]:
+        return doc.get("completed"), doc.get("priority")
+
+    def _recount(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]):
+        """Move a document between ``(completed, priority)`` counters."""
+        if old is not None:
+            key = self._count_key(old)
+            self._counts[key] -= 1
+            if not self._counts[key]:
+                del self._counts[key]
+        if new is not None:
+            self._counts[self._count_key(new)] += 1
+
+    @staticmethod
+    def _remove_sorted(entries: List[Any], entry: Any):
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def _notify(self, record: Dict[str, Any]):
+        for listener in self.listeners:
+            listener(record)
+
+    def insert(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a document, which must already carry an ``_id``."""
+        if doc["_id"] in self._docs:
+            raise KeyError(f"Duplicate todo id {doc['_id']}")
+        self._docs[doc["_id"]] = doc
+        self._index(doc)
+        self._recount(None, doc)
+        self._notify({"op": "i", "doc": doc})
+        return doc
+
+    def insert_many(self, docs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert documents independently, returning an error (or None) per document."""
+        errors: List[Optional[str]] = []
+        for doc in docs:
+            try:
+                self.insert(doc)
+                errors.append(None)
+            except KeyError as e:
+                errors.append(str(e.args[0]))
+        return errors
+
+    def get(self, todo_id: ObjectId) -> Optional[Dict[str, Any]]:
+        """Get a document by id."""
+        return self._docs.get(todo_id)
+
+    def update(self, todo_id: ObjectId, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply ``fields`` to a document, keeping the indexes in sync.
+
+        The stored dict is replaced rather than mutated, so a document handed
+        out earlier (e.g. to a snapshot writer) never changes underneath it.
+        """
+        doc = self._docs.get(todo_id)
+        if doc is None:
+            return None
+        # Only indexes whose field actually changes need maintenance
+        changed = [field for field in self.INDEXED_FIELDS if field in fields and fields[field] != doc.get(field)]
+        self._unindex(doc, changed)
+        old, doc = doc, {**doc, **fields}
+        self._docs[todo_id] = doc
+        self._index(doc, changed)
+        if "completed" in changed or "priority" in changed:
+            self._recount(old, doc)
+        self._notify({"op": "u", "_id": todo_id, "set": fields})
+        return doc
+
+    def update_many(self, updates: List[Tuple[ObjectId, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Apply several updates, returning each post-image (None if not found)."""
+        return [self.update(todo_id, fields) for todo_id, fields in updates]
+
+    def delete(self, todo_id: ObjectId) -> bool:
+        """Delete a document by id, leaving a tombstone."""
+        if not self._drop(todo_id):
+            return False
+        self._bury(todo_id)
+        self._notify({"op": "d", "_id": todo_id})
+        return True
+
+    def evict(self, todo_id: ObjectId) -> bool:
+        """Remove a document that is now stored elsewhere.
+
+        Unlike ``delete`` this is not a write to the todo: no tombstone is
+        left and listeners are not called.
+        """
+        return self._drop(todo_id)
+
+    def _drop(self, todo_id: ObjectId) -> bool:
+        doc = self._docs.pop(todo_id, None)
+        if doc is None:
+            return False
+        self._unindex(doc)
+        self._recount(doc, None)
+        return True
+
+    def _bury(self, todo_id: ObjectId):
+        """Record a tombstone and drop the ones past their retention."""
+        now = datetime.utcnow()
+        insort(self._tombstones, (now, todo_id))
+        if self.tombstone_retention is not None:
+            cutoff = now - self.tombstone_retention
+            expired = bisect_left(self._tombstones, (cutoff,))
+            if expired:
+                del self._tombstones[:expired]
+                self.changes_since = max(self.changes_since, cutoff)
+
+    def delete_many(self, todo_ids: List[ObjectId]) -> List[bool]:
+        """Delete documents by id, returning whether each one existed."""
+        return [self.delete(todo_id) for todo_id in todo_ids]
+
+    def batches(self, size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every document in ``created_at`` order, ``size`` at a time.
+
+        Each batch resumes after the last index entry of the previous one, so
+        writes between batches do not break the iteration.
+        """
+        last = None
+        while True:
+            start = 0 if last is None else bisect_right(self._created, last)
+            entries = self._created[start:start + size]
+            if not entries:
+                return
+            last = entries[-1]
+            yield [self._docs[todo_id] for _, todo_id in entries]
+
+    def changes(self, since: Optional[Tuple[datetime, ObjectId]],
+                until: datetime) -> Iterator[Tuple[datetime, ObjectId, Optional[Dict[str, Any]]]]:
+        """Todos changed or deleted after ``since`` and before ``until``, in change order.
+
+        Yields ``(changed_at, id, doc)``, with None as the document of deleted
+        todos. Entries are read lazily from the ``updated_at`` index and the
+        tombstones, so taking k of them costs O(log n + k). Consume the
+        iterator before the next write.
+        """
+        def window(entries: List[Tuple[datetime, ObjectId]]) -> Iterator[Tuple[datetime, ObjectId]]:
+            lo = 0 if since is None else bisect_right(entries, (utc_key(since[0]), since[1]))
+            hi = bisect_left(entries, (utc_key(until),))
+            return (entries[i] for i in range(lo, hi))
+
+        updated = ((changed_at, todo_id, True) for changed_at, todo_id in window(self._updated))
+        deleted = ((changed_at, todo_id, False) for changed_at, todo_id in window(self._tombstones))
+        return (
+            (changed_at, todo_id, self._docs[todo_id] if live else None)
+            for changed_at, todo_id, live in heapq.merge(updated, deleted)
+        )
+
+    def ids_due_between(self, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> List[ObjectId]:
+        """Ids with ``start <= due_date < end`` in due-date order (O(log n + k))."""
+        lo = 0 if start is None else bisect_left(self._due, (utc_key(start),))
+        hi = len(self._due) if end is None else bisect_left(self._due, (utc_key(end),))
+        return [todo_id for _, todo_id in self._due[lo:hi]]
+
+    def counts(self) -> Dict[Tuple[Any, Any], int]:
+        """Number of todos per ``(completed, priority)``, without touching any document."""
+        return dict(self._counts)
+
+    def count_due_before(self, end: datetime, completed: Optional[bool] = None) -> int:
+        """Number of todos due before ``end``, read from the due-date and completed indexes."""
+        ids = self.ids_due_between(None, end)
+        if completed is None:
+            return len(ids)
+        allowed = self._hash["completed"].get(completed, set())
+        return sum(1 for todo_id in ids if todo_id in allowed)
+
+    def _match(self, completed: Optional[bool], priority: Optional[str],
+               due_after: Optional[datetime], due_before: Optional[datetime]) -> Optional[Set[ObjectId]]:
+        """Ids matching all given filters, or None when no filter is set.
+
+        Each filter is resolved from its index and the sets are intersected
+        smallest first, so only matching documents are touched.
+        """
+        candidates: List[Set[ObjectId]] = []
+        if completed is not None:
+            candidates.append(self._hash["completed"].get(completed, set()))
+        if priority is not None:
+            candidates.append(self._hash["priority"].get(priority, set()))
+        if due_after is not None or due_before is not None:
+            candidates.append(set(self.ids_due_between(due_after, due_before)))
+
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def search(self, text: str, limit: int,
+               completed: Optional[bool] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Documents containing any word of ``text``, best first, with their scores.
+
+        Only the posting lists of the query's words are read, so the cost
+        grows with the number of matches rather than the size of the store.
+        """
+        scores: Dict[ObjectId, float] = defaultdict(float)
+        for word in set(tokenize(text)):
+            for field, weight in TEXT_WEIGHTS.items():
+                for todo_id, count in self._text[field].get(word, {}).items():
+                    scores[todo_id] += weight * count
+        if completed is not None:
+            allowed = self._hash["completed"].get(completed, set())
+            scores = {todo_id: score for todo_id, score in scores.items() if todo_id in allowed}
+        # Ties go to the newest todo
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(self._docs[todo_id], score) for todo_id, score in best]
+
+    @staticmethod
+    def sort_key(doc: Dict[str, Any], sort_by: str) -> tuple:
+        """Sort key matching MongoDB order: missing values first, ``_id`` breaks ties."""
+        value = doc.get(sort_by)
+        if value is None:
+            return (0, None, doc["_id"])
+        return (1, utc_key(value), doc["_id"])
+
+    def _walk(self, sort_by: str, anchor: Optional[tuple], descending: bool) -> Iterator[Dict[str, Any]]:
+        """Yield documents in ``sort_key`` order for ``sort_by``, strictly after ``anchor``.
+
+        Todos without a due date come first, in ``_id`` order, then the
+        sorted index of the field.
+        """
+        undated: List[Any] = self._undated if sort_by == "due_date" else []
+        dated = {"due_date": self._due, "created_at": self._created, "updated_at": self._updated}[sort_by]
+        # (rank, entries, position of the anchor within them, id of an entry)
+        segments = [
+            (0, undated, anchor and anchor[2], lambda entry: entry),
+            (1, dated, anchor and anchor[1:], lambda entry: entry[1]),
+        ]
+        if descending:
+            for rank, entries, position, entry_id in reversed(segments):
+                if anchor is not None and anchor[0] < rank:
+                    continue
+                hi = bisect_left(entries, position) if anchor is not None and anchor[0] == rank else len(entries)
+                for i in range(hi - 1, -1, -1):
+                    yield self._docs[entry_id(entries[i])]
+        else:
+            for rank, entries, position, entry_id in segments:
+                if anchor is not None and anchor[0] > rank:
+                    continue
+                lo = bisect_right(entries, position) if anchor is not None and anchor[0] == rank else 0
+                for i in range(lo, len(entries)):
+                    yield self._docs[entry_id(entries[i])]
+
+    def query(self, completed: Optional[bool] = None, priority: Optional[str] = None,
+              due_after: Optional[datetime] = None, due_before: Optional[datetime] = None,
+              sort_by: str = "created_at", descending: bool = False,
+              after_id: Optional[ObjectId] = None, limit: Optional[int] = None,
+              fields: Optional[Iterable[str]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return one page of matching documents and whether more follow.
+
+        ``after_id`` is a keyset cursor: the page starts right after that
+        document in the requested sort order. With ``fields`` the page holds
+        copies with only those fields and ``_id``.
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort_by}', expected one of {SORT_FIELDS}")
+
+        ids = self._match(completed, priority, due_after, due_before)
+        anchor = None
+        if after_id is not None:
+            anchor_doc = self._docs.get(after_id)
+            if anchor_doc is None:
+                raise ValueError(f"after_id {after_id} not found")
+            anchor = self.sort_key(anchor_doc, sort_by)
+
+        if ids is None or len(ids) * 8 > len(self._docs):
+            # Walk the sort index and stop as soon as the page is full
+            docs: Iterable[Dict[str, Any]] = self._walk(sort_by, anchor, descending)
+            if ids is not None:
+                docs = (doc for doc in docs if doc["_id"] in ids)
+            page = [doc for _, doc in zip(range(limit + 1), docs)] if limit is not None else list(docs)
+        else:
+            docs = self._docs.values() if ids is None else (self._docs[i] for i in ids)
+            if anchor is not None:
+                if descending:
+                    docs = (doc for doc in docs if self.sort_key(doc, sort_by) < anchor)
+                else:
+                    docs = (doc for doc in docs if self.sort_key(doc, sort_by) > anchor)
+
+            def key(doc):
+                return self.sort_key(doc, sort_by)
+
+            if limit is None:
+                page = sorted(docs, key=key, reverse=descending)
+            elif descending:
+                page = heapq.nlargest(limit + 1, docs, key=key)
+            else:
+                page = heapq.nsmallest(limit + 1, docs, key=key)
+
+        has_more = limit is not None and len(page) > limit
+        if has_more:
+            page = page[:limit]
+        if fields is not None:
+            keys = ("_id", *fields)
+            page = [{key: doc[key] for key in keys if key in doc} for doc in page]
+        return page, has_more
@@ -0,0 +1,232 @@
+"""Runtime metrics for the Todo MCP Server.
+
+``metrics`` records per-tool latency, errors and payload sizes, plus the
+duration of every database round trip. Snapshots feed the
+``get_server_stats`` tool and can be rendered in the Prometheus text format,
+optionally dumped to ``METRICS_FILE``.
+
+Tool calls can also be profiled: with ``PROFILE_SAMPLE_RATE`` above zero that
+fraction of calls runs under cProfile and the stats are written to
+``PROFILE_DIR``. Only one call is profiled at a time (a sampled call that
+starts while another is profiled is not), and the profile also covers other
+tasks that run while the call awaits. When ``opentelemetry`` is installed
+every call is wrapped in a span; sampling is then up to the configured
+OpenTelemetry SDK.
+"""
+
+import cProfile
+import os
+import random
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from opentelemetry import trace
+except ImportError:  # tracing is optional
+    trace = None
+
+
+# Upper bounds of the histogram buckets (the last bucket is +Inf)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        estimate = self.max
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                break
+            seen += count
+        # The observed extremes are exact, so never report beyond them
+        return min(max(estimate, self.min), self.max)
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """Yield ``(le, cumulative count)`` pairs, ending with ``+Inf``."""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield repr(bound), total
+        yield "+Inf", self.count
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.sum / self.count * scale, 3) if self.count else 0.0,
+            "p50": round(self.quantile(0.50) * scale, 3),
+            "p95": round(self.quantile(0.95) * scale, 3),
+            "p99": round(self.quantile(0.99) * scale, 3),
+        }
+
+
+class Metrics:
+    """Registry of server metrics, keyed by tool name or database operation."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.request_bytes: Dict[str, Histogram] = {}
+        self.response_bytes: Dict[str, Histogram] = {}
+        self.db_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_errors: Dict[Tuple[str, str], int] = {}
+        self.profile_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.profile_dir = os.getenv("PROFILE_DIR", "profiles")
+        self._profiling = False
+        self.metrics_file = os.getenv("METRICS_FILE")
+        self.dump_interval = float(os.getenv("METRICS_DUMP_INTERVAL", "15"))
+        self._last_dump = 0.0
+        self._tracer = trace.get_tracer("todo_mcp_server") if trace is not None else None
+
+    def record_tool(self, tool: str, seconds: float, error: bool,
+                    request_bytes: int, response_bytes: int):
+        """Record one tool call."""
+        if tool not in self.tool_latency:
+            self.tool_latency[tool] = Histogram(LATENCY_BUCKETS)
+            self.tool_errors[tool] = 0
+            self.request_bytes[tool] = Histogram(SIZE_BUCKETS)
+            self.response_bytes[tool] = Histogram(SIZE_BUCKETS)
+        self.tool_latency[tool].observe(seconds)
+        self.request_bytes[tool].observe(request_bytes)
+        self.response_bytes[tool].observe(response_bytes)
+        if error:
+            self.tool_errors[tool] += 1
+        self.maybe_dump()
+
+    def record_db(self, backend: str, op: str, seconds: float, error: bool = False):
+        """Record one database round trip."""
+        key = (backend, op)
+        if key not in self.db_latency:
+            self.db_latency[key] = Histogram(LATENCY_BUCKETS)
+            self.db_errors[key] = 0
+        self.db_latency[key].observe(seconds)
+        if error:
+            self.db_errors[key] += 1
+
+    @contextmanager
+    def trace(self, tool: str):
+        """Wrap a tool call in a tracing span and, when sampled, a profiler."""
+        span = self._tracer.start_as_current_span(f"tool {tool}") if self._tracer else nullcontext()
+        # cProfile hooks the whole interpreter, so concurrent calls cannot each have one
+        sampled = self.profile_rate > 0 and not self._profiling and random.random() < self.profile_rate
+        with span:
+            profiler = cProfile.Profile() if sampled else None
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:  # Another profiler (e.g. outside this server) is active
+                    profiler = None
+            if profiler is None:
+                yield
+                return
+            self._profiling = True
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._profiling = False
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{tool}-{os.getpid()}-{time.time_ns()}.prof"))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return latency summaries (in milliseconds) and counters."""
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tools": {
+                tool: {
+                    **histogram.summary(scale=1000),
+                    "errors": self.tool_errors[tool],
+                    "request_bytes_mean": round(self.request_bytes[tool].sum / histogram.count) if histogram.count else 0,
+                    "response_bytes_mean": round(self.response_bytes[tool].sum / histogram.count) if histogram.count else 0,
+                }
+                for tool, histogram in sorted(self.tool_latency.items())
+            },
+            "db": {
+                f"{backend}.{op}": {**histogram.summary(scale=1000), "errors": self.db_errors[(backend, op)]}
+                for (backend, op), histogram in sorted(self.db_latency.items())
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Dict[Any, Histogram], labels):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                label = labels(key)
+                for le, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {hist.sum}")
+                lines.append(f"{name}_count{{{label}}} {hist.count}")
+
+        def counter(name: str, help_text: str, series: Dict[Any, int], labels):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{{{labels(key)}}} {value}")
+
+        def tool_label(tool):
+            return f'tool="{tool}"'
+
+        def db_label(key):
+            return f'backend="{key[0]}",op="{key[1]}"'
+
+        histogram("todo_tool_duration_seconds", "Tool call latency.", self.tool_latency, tool_label)
+        counter("todo_tool_errors_total", "Tool calls that returned an error.", self.tool_errors, tool_label)
+        histogram("todo_tool_request_bytes", "Size of tool call arguments.", self.request_bytes, tool_label)
+        histogram("todo_tool_response_bytes", "Size of tool call results.", self.response_bytes, tool_label)
+        histogram("todo_db_operation_duration_seconds", "Database round trip latency.", self.db_latency, db_label)
+        counter("todo_db_operation_errors_total", "Database round trips that raised.", self.db_errors, db_label)
+        lines.append("# HELP todo_uptime_seconds Seconds since the server started.")
+        lines.append("# TYPE todo_uptime_seconds gauge")
+        lines.append(f"todo_uptime_seconds {time.time() - self.started_at:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def maybe_dump(self):
+        """Write ``METRICS_FILE`` if the dump interval has passed."""
+        if self.metrics_file and time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    def dump(self, path: Optional[str] = None):
+        """Atomically write the Prometheus text to ``path`` (default ``METRICS_FILE``)."""
+        path = path or self.metrics_file
+        if not path:
+            return
+        self._last_dump = time.monotonic()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+
+# Global metrics registry
+metrics = Metrics()
@@ -1,10 +1,13 @@
 """Data models for the Todo MCP Server."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from bson import ObjectId
 
+# Fields a listing can project to; the ID is always returned
+TODO_FIELDS = ("title", "description", "completed", "created_at", "updated_at", "due_date", "priority")
+
 
 class PyObjectId(ObjectId):
     """Custom ObjectId type for Pydantic v2."""
@@ -46,6 +49,59 @@ class TodoItem(BaseModel):
         json_encoders = {ObjectId: str}
 
 
+class TodoRecord:
+    """Lightweight read-only todo built from a stored document.
+
+    Listings return these instead of ``TodoItem``: the documents come from
+    our own store and were validated when written, so copying the fields
+    into slots skips pydantic entirely. It has the same attributes as
+    ``TodoItem``; ``to_item()`` converts when the full model is needed.
+    Fields left out by a projection are None (or their default).
+    """
+
+    __slots__ = ("id", "title", "description", "completed", "created_at", "updated_at", "due_date", "priority")
+
+    def __init__(self, doc: Dict[str, Any]):
+        self.id = doc["_id"]
+        self.title = doc.get("title")
+        self.description = doc.get("description")
+        self.completed = doc.get("completed", False)
+        self.created_at = doc.get("created_at")
+        self.updated_at = doc.get("updated_at")
+        self.due_date = doc.get("due_date")
+        self.priority = doc.get("priority", "medium")
+
+    def __repr__(self) -> str:
+        return f"TodoRecord(id={self.id!r}, title={self.title!r})"
+
+    def to_item(self) -> TodoItem:
+        return TodoItem(**{"_id" if name == "id" else name: getattr(self, name) for name in self.__slots__})
+
+
+# Position in the change history: (changed_at, todo id)
+ChangeCursor = Tuple[datetime, ObjectId]
+
+
+class TodoChanges:
+    """One page of changes after a ``ChangeCursor``, for incremental sync.
+
+    ``todos`` were created or updated and ``deleted_ids`` deleted, both in
+    change order. The next page starts at ``cursor``. ``reset`` means the
+    requested cursor is older than the retained history, so the client has to
+    sync again from the beginning.
+    """
+
+    __slots__ = ("todos", "deleted_ids", "cursor", "has_more", "reset")
+
+    def __init__(self, todos: List[TodoRecord], deleted_ids: List[ObjectId], cursor: Optional[ChangeCursor],
+                 has_more: bool = False, reset: bool = False):
+        self.todos = todos
+        self.deleted_ids = deleted_ids
+        self.cursor = cursor
+        self.has_more = has_more
+        self.reset = reset
+
+
 class TodoCreate(BaseModel):
     """Model for creating a new todo item."""
     
@@ -62,4 +118,27 @@ class TodoUpdate(BaseModel):
     description: Optional[str] = Field(None, description="Detailed description of the todo item")
     completed: Optional[bool] = Field(None, description="Whether the todo item is completed")
     due_date: Optional[datetime] = Field(None, description="Due date for the todo item")
-    priority: Optional[str] = Field(None, description="Priority level: low, medium, high")
\ No newline at end of file
+    priority: Optional[str] = Field(None, description="Priority level: low, medium, high")
+
+
+class TodoQuery(BaseModel):
+    """Model for filtering, sorting and paginating todo listings."""
+    
+    completed: Optional[bool] = Field(None, description="Only return todos with this completion status")
+    priority: Optional[str] = Field(None, description="Only return todos with this priority level")
+    due_after: Optional[datetime] = Field(None, description="Only return todos due at or after this time")
+    due_before: Optional[datetime] = Field(None, description="Only return todos due before this time")
+    sort_by: str = Field(default="created_at", description="Sort field: created_at, updated_at, due_date")
+    sort_order: str = Field(default="asc", description="Sort order: asc, desc")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of todos to return")
+    after_id: Optional[str] = Field(None, description="Return todos after this ID (keyset cursor)")
+    fields: Optional[Tuple[str, ...]] = Field(None, description="Only return these fields (plus the ID)")
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single item in a batch operation."""
+    
+    index: int = Field(..., description="Position of the item in the batch request")
+    todo_id: Optional[str] = Field(None, description="ID of the affected todo item")
+    todo: Optional[TodoItem] = Field(None, description="Resulting todo item for creates and updates")
+    error: Optional[str] = Field(None, description="Error message if this item failed")
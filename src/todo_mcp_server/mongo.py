@@ -0,0 +1,292 @@
+"""Async MongoDB client selection for the Todo MCP Server.
+
+PyMongo ships a native asyncio client (``AsyncMongoClient``) from 4.9 onwards.
+For older PyMongo releases, or when ``MONGODB_DRIVER=threaded`` is set, the
+synchronous client is wrapped so every blocking call runs on a thread pool.
+Both variants expose the same awaitable subset of the PyMongo async API, so
+``TodoDatabase`` never blocks the event loop on a network round trip.
+
+PyMongo itself is only imported when a client is created, so processes using
+memory or SQLite storage never pay for loading it.
+"""
+
+import asyncio
+import inspect
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional, Tuple
+
+
+DRIVERS = ("auto", "async", "threaded")
+
+# Documents fetched per thread hop when iterating a threaded cursor (PyMongo's first batch size)
+ITER_BATCH_SIZE = 101
+
+
+class ThreadedCursor:
+    """Awaitable cursor that runs a synchronous PyMongo cursor on a thread pool."""
+
+    def __init__(self, collection: "ThreadedCollection", args: tuple, kwargs: dict):
+        self._collection = collection
+        self._args = args
+        self._kwargs = kwargs
+        self._modifiers: List[Tuple[str, tuple, dict]] = []
+        self._cursor = None
+        self._buffer: deque = deque()
+        self._iter_batch_size = ITER_BATCH_SIZE
+
+    def _modify(self, name: str, *args, **kwargs) -> "ThreadedCursor":
+        self._modifiers.append((name, args, kwargs))
+        return self
+
+    def sort(self, *args, **kwargs) -> "ThreadedCursor":
+        return self._modify("sort", *args, **kwargs)
+
+    def limit(self, *args, **kwargs) -> "ThreadedCursor":
+        return self._modify("limit", *args, **kwargs)
+
+    def skip(self, *args, **kwargs) -> "ThreadedCursor":
+        return self._modify("skip", *args, **kwargs)
+
+    def batch_size(self, size: int) -> "ThreadedCursor":
+        self._iter_batch_size = size or ITER_BATCH_SIZE
+        return self._modify("batch_size", size)
+
+    def _build(self):
+        cursor = self._collection.sync_collection.find(*self._args, **self._kwargs)
+        for name, args, kwargs in self._modifiers:
+            cursor = getattr(cursor, name)(*args, **kwargs)
+        return cursor
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        def fetch():
+            cursor = self._build()
+            if length is None:
+                return list(cursor)
+            return [doc for _, doc in zip(range(length), cursor)]
+
+        return await self._collection.run(fetch)
+
+    async def explain(self) -> dict:
+        return await self._collection.run(lambda: self._build().explain())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        # Documents are fetched a batch per thread hop rather than one at a time
+        if not self._buffer:
+            if self._cursor is None:
+                self._cursor = await self._collection.run(self._build)
+            self._buffer.extend(
+                await self._collection.run(lambda: list(itertools.islice(self._cursor, self._iter_batch_size)))
+            )
+            if not self._buffer:
+                raise StopAsyncIteration
+        return self._buffer.popleft()
+
+    async def close(self) -> None:
+        if self._cursor is not None:
+            await self._collection.run(self._cursor.close)
+
+
+class ThreadedCommandCursor:
+    """Awaitable wrapper over a synchronous PyMongo command cursor, as returned by ``aggregate``."""
+
+    def __init__(self, collection: "ThreadedCollection", cursor):
+        self._collection = collection
+        self._cursor = cursor
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        def fetch():
+            if length is None:
+                return list(self._cursor)
+            return [doc for _, doc in zip(range(length), self._cursor)]
+
+        return await self._collection.run(fetch)
+
+
+class ThreadedChangeStream:
+    """Awaitable wrapper over a synchronous PyMongo change stream.
+
+    Each ``try_next`` holds a pool thread for up to the stream's
+    ``max_await_time_ms``.
+    """
+
+    def __init__(self, collection: "ThreadedCollection", stream):
+        self._collection = collection
+        self._stream = stream
+
+    @property
+    def resume_token(self) -> Optional[dict]:
+        return self._stream.resume_token
+
+    async def try_next(self) -> Optional[dict]:
+        return await self._collection.run(self._stream.try_next)
+
+    async def close(self) -> None:
+        await self._collection.run(self._stream.close)
+
+
+class ThreadedCollection:
+    """Awaitable facade over a synchronous PyMongo collection."""
+
+    def __init__(self, collection, executor: ThreadPoolExecutor):
+        self.sync_collection = collection
+        self.executor = executor
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def find(self, *args, **kwargs) -> ThreadedCursor:
+        return ThreadedCursor(self, args, kwargs)
+
+    async def aggregate(self, *args, **kwargs) -> ThreadedCommandCursor:
+        cursor = await self.run(self.sync_collection.aggregate, *args, **kwargs)
+        return ThreadedCommandCursor(self, cursor)
+
+    async def watch(self, *args, **kwargs) -> ThreadedChangeStream:
+        stream = await self.run(self.sync_collection.watch, *args, **kwargs)
+        return ThreadedChangeStream(self, stream)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync_collection, name)
+        if not callable(attr):
+            return attr
+        return partial(self.run, attr)
+
+
+class ThreadedDatabase:
+    """Awaitable facade over a synchronous PyMongo database."""
+
+    def __init__(self, database, executor: ThreadPoolExecutor):
+        self.sync_database = database
+        self.executor = executor
+
+    def __getitem__(self, name: str) -> ThreadedCollection:
+        return ThreadedCollection(self.sync_database[name], self.executor)
+
+    async def command(self, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(self.sync_database.command, *args, **kwargs)
+        )
+
+
+class ThreadedMongoClient:
+    """Synchronous ``MongoClient`` whose operations run on a thread pool."""
+
+    def __init__(self, uri: str, max_workers: Optional[int] = None, **options):
+        from pymongo import MongoClient
+
+        self.sync_client = MongoClient(uri, **options)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="todo-mongo"
+        )
+
+    def __getitem__(self, name: str) -> ThreadedDatabase:
+        return ThreadedDatabase(self.sync_client[name], self.executor)
+
+    @property
+    def admin(self) -> ThreadedDatabase:
+        return self["admin"]
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.sync_client.close)
+        self.executor.shutdown(wait=False)
+
+
+async def timed(record: Callable[[str, float, bool], None], op: str, awaitable):
+    """Await ``awaitable`` and report its duration as ``op``."""
+    start = time.perf_counter()
+    error = False
+    try:
+        return await awaitable
+    except Exception:
+        error = True
+        raise
+    finally:
+        record(op, time.perf_counter() - start, error)
+
+
+class TimedCursor:
+    """Cursor wrapper that reports how long each fetch takes."""
+
+    def __init__(self, cursor, record: Callable[[str, float, bool], None]):
+        self._cursor = cursor
+        self._record = record
+
+    async def to_list(self, *args, **kwargs) -> List[dict]:
+        return await timed(self._record, "find", self._cursor.to_list(*args, **kwargs))
+
+    async def explain(self) -> dict:
+        return await timed(self._record, "explain", self._cursor.explain())
+
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Keep chained modifiers (sort, limit, ...) on the wrapper
+            return self if result is self._cursor else result
+
+        return call
+
+
+class TimedCollection:
+    """Collection wrapper that reports the duration of every round trip.
+
+    ``record(op, seconds, error)`` is called once per awaited operation, and
+    once per cursor fetch for ``find``.
+    """
+
+    def __init__(self, collection, record: Callable[[str, float, bool], None]):
+        self.collection = collection
+        self._record = record
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return timed(self._record, name, result)
+            if hasattr(result, "to_list"):
+                return TimedCursor(result, self._record)
+            return result
+
+        return call
+
+
+def create_client(uri: str, driver: str = "auto", **options) -> Tuple[Any, str]:
+    """Create an async-capable Mongo client.
+
+    Returns the client and the name of the driver that was selected.
+    """
+    if driver not in DRIVERS:
+        raise ValueError(f"Unknown MongoDB driver '{driver}', expected one of {DRIVERS}")
+
+    try:
+        from pymongo import AsyncMongoClient
+    except ImportError:  # PyMongo < 4.9
+        AsyncMongoClient = None
+
+    if driver in ("auto", "async") and AsyncMongoClient is not None:
+        return AsyncMongoClient(uri, **options), "async"
+    if driver == "async":
+        raise RuntimeError("PyMongo's AsyncMongoClient requires pymongo>=4.9")
+
+    max_workers = options.get("maxPoolSize")
+    return ThreadedMongoClient(uri, max_workers=max_workers, **options), "threaded"
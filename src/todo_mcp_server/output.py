@@ -0,0 +1,245 @@
+"""Structured JSON tool results for the Todo MCP Server.
+
+Tools normally answer with formatted text. With ``OUTPUT_FORMAT=json``, or
+``"output": "json"`` on a single call, they return the result as
+``structuredContent`` along with the same JSON as text, encoded with
+``orjson`` when it is installed. In JSON mode ``list_tools`` also advertises
+each tool's output schema, and every successful result then carries
+structured content, including calls that ask for ``"output": "text"``.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from mcp.types import CallToolResult, TextContent
+
+from .memory_store import utc_key
+from .models import TODO_FIELDS
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library encoder
+    orjson = None
+
+
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "text").lower()
+
+# Tool argument selecting the result format for one call
+OUTPUT_PROPERTY = {
+    "type": "string",
+    "enum": ["text", "json"],
+    "description": "Formatted text, or structured JSON for programmatic use",
+}
+
+TODO_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "title": {"type": "string"},
+        "description": {"type": ["string", "null"]},
+        "completed": {"type": "boolean"},
+        "created_at": {"type": "string", "format": "date-time"},
+        "updated_at": {"type": "string", "format": "date-time"},
+        "due_date": {"type": ["string", "null"], "format": "date-time"},
+        "priority": {"type": "string"},
+    },
+    "required": ["id"],
+}
+
+TODO_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {"todo": TODO_JSON_SCHEMA},
+    "required": ["todo"],
+}
+
+TODO_LIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "todos": {"type": "array", "items": TODO_JSON_SCHEMA},
+        "next_after_id": {"type": ["string", "null"]},
+    },
+    "required": ["todos", "next_after_id"],
+}
+
+AGENDA_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "timezone": {"type": "string"},
+        "start": {"type": "string", "format": "date"},
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "date": {"type": "string", "format": "date"},
+                    "todos": {"type": "array", "items": TODO_JSON_SCHEMA},
+                },
+                "required": ["date", "todos"],
+            },
+        },
+        "next_after_id": {"type": ["string", "null"]},
+    },
+    "required": ["timezone", "start", "days", "next_after_id"],
+}
+
+CHANGES_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "todos": {"type": "array", "items": TODO_JSON_SCHEMA},
+        "deleted_ids": {"type": "array", "items": {"type": "string"}},
+        "next_token": {"type": ["string", "null"]},
+        "has_more": {"type": "boolean"},
+        "reset": {"type": "boolean"},
+    },
+    "required": ["todos", "deleted_ids", "next_token", "has_more", "reset"],
+}
+
+SEARCH_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string"},
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"todo": TODO_JSON_SCHEMA, "score": {"type": "number"}},
+                "required": ["todo", "score"],
+            },
+        },
+    },
+    "required": ["query", "results"],
+}
+
+DELETE_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {"todo_id": {"type": "string"}, "deleted": {"type": "boolean"}},
+    "required": ["todo_id", "deleted"],
+}
+
+BATCH_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "total": {"type": "integer"},
+        "succeeded": {"type": "integer"},
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "todo_id": {"type": ["string", "null"]},
+                    "todo": {"anyOf": [TODO_JSON_SCHEMA, {"type": "null"}]},
+                    "error": {"type": ["string", "null"]},
+                },
+                "required": ["index"],
+            },
+        },
+    },
+    "required": ["total", "succeeded", "results"],
+}
+
+EXPLAIN_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "index_status": {"type": "string"},
+        "queries": {"type": "array", "items": {"type": "object"}},
+    },
+    "required": ["index_status", "queries"],
+}
+
+EXPORT_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "count": {"type": "integer"},
+        "path": {"type": "string"},
+        "ndjson": {"type": "string"},
+    },
+    "required": ["count"],
+}
+
+IMPORT_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "imported": {"type": "integer"},
+        "failed": {"type": "integer"},
+        "errors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"line": {"type": "integer"}, "error": {"type": "string"}},
+                "required": ["line", "error"],
+            },
+        },
+    },
+    "required": ["imported", "failed", "errors"],
+}
+
+STATS_RESULT_SCHEMA = {"type": "object"}
+
+STATUS_COUNTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "total": {"type": "integer"},
+        "completed": {"type": "integer"},
+        "pending": {"type": "integer"},
+    },
+    "required": ["total", "completed", "pending"],
+}
+
+TODO_STATS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **STATUS_COUNTS_SCHEMA["properties"],
+        "overdue": {"type": "integer"},
+        "by_priority": {"type": "object", "additionalProperties": STATUS_COUNTS_SCHEMA},
+    },
+    "required": ["total", "completed", "pending", "overdue", "by_priority"],
+}
+
+
+def with_output_option(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the ``output`` argument to a tool input schema."""
+    return {**schema, "properties": {**schema["properties"], "output": OUTPUT_PROPERTY}}
+
+
+def output_schema(schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The output schema to advertise for a tool: only in JSON mode."""
+    return schema if OUTPUT_FORMAT == "json" else None
+
+
+def dumps(data: Any) -> str:
+    """Encode JSON-compatible data compactly."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+def todo_to_json(todo, fields: Iterable[str] = TODO_FIELDS) -> Dict[str, Any]:
+    """Convert a TodoItem or TodoRecord to JSON-compatible values (datetimes in UTC)."""
+    data = {"id": str(todo.id)}
+    for field in fields:
+        value = getattr(todo, field)
+        data[field] = utc_key(value).isoformat() + "Z" if isinstance(value, datetime) else value
+    return data
+
+
+def respond(arguments: Dict[str, Any], data: Callable[[], Dict[str, Any]], text: Callable[[], str],
+            is_error: bool = False) -> CallToolResult:
+    """Build a tool result in the format the call asked for.
+
+    ``data`` and ``text`` are only called when that form is returned.
+    """
+    if (arguments.get("output") or OUTPUT_FORMAT) == "json":
+        structured = data()
+        return CallToolResult(
+            content=[TextContent(type="text", text=dumps(structured))],
+            structuredContent=structured,
+            isError=is_error
+        )
+    return CallToolResult(
+        content=[TextContent(type="text", text=text())],
+        structuredContent=data() if OUTPUT_FORMAT == "json" else None,
+        isError=is_error
+    )
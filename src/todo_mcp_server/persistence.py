@@ -0,0 +1,205 @@
+"""Durable in-memory storage for the Todo MCP Server.
+
+``DurableMemoryStore`` keeps the whole collection in a ``MemoryStore`` and
+records every write in an append-only operation log. The log is periodically
+compacted into a snapshot. Both files are plain streams of BSON documents,
+which PyMongo's C extension encodes and decodes natively (ObjectId and
+datetime included).
+
+Files in the store directory:
+
+* ``snapshot.bson`` - every document as of the last compaction
+* ``oplog.bson`` - operations since the last compaction started
+* ``oplog.old.bson`` - operations being folded into a snapshot that is still
+  being written (only present during or after an interrupted compaction)
+
+Snapshots are written on a background thread from a list of document
+references taken when compaction starts. ``MemoryStore.update`` replaces
+documents instead of mutating them, and every logged operation is
+idempotent, so replaying ``oplog.old.bson`` and ``oplog.bson`` over whichever
+snapshot is on disk always reproduces the latest state.
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from bson.errors import InvalidBSON
+
+from .memory_store import MemoryStore
+
+SNAPSHOT_FILE = "snapshot.bson"
+OPLOG_FILE = "oplog.bson"
+OLD_OPLOG_FILE = "oplog.old.bson"
+
+
+def read_documents(path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Read the BSON documents in a file.
+
+    Returns the documents and the number of bytes they occupy. A crash
+    mid-append leaves a torn trailing record, which is excluded.
+    """
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return bson.decode_all(data), len(data)
+    except InvalidBSON:
+        pass
+    docs = []
+    offset = 0
+    while offset + 4 <= len(data):
+        size = int.from_bytes(data[offset:offset + 4], "little")
+        if size < 5 or offset + size > len(data):
+            break
+        try:
+            docs.append(bson.decode(data[offset:offset + size]))
+        except InvalidBSON:
+            break
+        offset += size
+    return docs, offset
+
+
+class DurableMemoryStore(MemoryStore):
+    """MemoryStore persisted with an append-only log and compacted snapshots."""
+
+    def __init__(self, path: str, fsync: bool = False, compact_ops: int = 100_000):
+        super().__init__()
+        self.path = path
+        self.fsync = fsync
+        self.compact_ops = compact_ops
+        self.log_ops = 0
+        self._log: Optional[BinaryIO] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._compaction: Optional[Future] = None
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def open(self):
+        """Load the snapshot, replay the logs and start appending."""
+        if self._log is not None:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="todo-snapshot")
+
+        docs, _ = read_documents(self._file(SNAPSHOT_FILE))
+        self.load(docs)
+        # Replayed operations are not new writes; listeners only see those
+        listeners, self.listeners = self.listeners, []
+        try:
+            for name in (OLD_OPLOG_FILE, OPLOG_FILE):
+                records, length = read_documents(self._file(name))
+                for record in records:
+                    self._replay(record)
+                self.log_ops += len(records)
+                # Drop a torn trailing record so new appends follow a valid one
+                if os.path.exists(self._file(name)) and os.path.getsize(self._file(name)) > length:
+                    os.truncate(self._file(name), length)
+        finally:
+            self.listeners = listeners
+
+        self._log = open(self._file(OPLOG_FILE), "ab")
+
+    def close(self):
+        """Fold the log into a snapshot and close the files."""
+        if self._log is None:
+            return
+        self.compact(wait=True)
+        self._log.close()
+        self._log = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def _replay(self, record: Dict[str, Any]):
+        op = record["op"]
+        if op == "i":
+            doc = record["doc"]
+            if doc["_id"] in self:
+                MemoryStore.delete(self, doc["_id"])
+            MemoryStore.insert(self, doc)
+        elif op == "u":
+            MemoryStore.update(self, record["_id"], record["set"])
+        elif op == "d":
+            MemoryStore.delete(self, record["_id"])
+        elif op == "x":
+            MemoryStore.evict(self, record["_id"])
+
+    def _append(self, record: Dict[str, Any]):
+        if self._log is None:
+            return
+        self._log.write(bson.encode(record))
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.log_ops += 1
+        if self.log_ops >= self.compact_ops:
+            self.compact()
+
+    def insert(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc = super().insert(doc)
+        self._append({"op": "i", "doc": doc})
+        return doc
+
+    def update(self, todo_id: ObjectId, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        doc = super().update(todo_id, fields)
+        if doc is not None:
+            self._append({"op": "u", "_id": todo_id, "set": fields})
+        return doc
+
+    def delete(self, todo_id: ObjectId) -> bool:
+        deleted = super().delete(todo_id)
+        if deleted:
+            self._append({"op": "d", "_id": todo_id})
+        return deleted
+
+    def evict(self, todo_id: ObjectId) -> bool:
+        evicted = super().evict(todo_id)
+        if evicted:
+            self._append({"op": "x", "_id": todo_id})
+        return evicted
+
+    def compact(self, wait: bool = False):
+        """Start writing a snapshot of the current state and rotate the log.
+
+        The snapshot is written on a background thread unless ``wait`` is set.
+        Does nothing if a previous compaction is still running.
+        """
+        if self._compaction is not None and not self._compaction.done():
+            if not wait:
+                return
+            self._compaction.result()
+
+        old_log = self._file(OLD_OPLOG_FILE)
+        if self._log is not None:
+            self._log.close()
+        if os.path.exists(self._file(OPLOG_FILE)):
+            if os.path.exists(old_log):
+                # A previous compaction never finished; keep its operations too
+                with open(old_log, "ab") as dst, open(self._file(OPLOG_FILE), "rb") as src:
+                    dst.write(src.read())
+                os.remove(self._file(OPLOG_FILE))
+            else:
+                os.replace(self._file(OPLOG_FILE), old_log)
+        self._log = open(self._file(OPLOG_FILE), "ab")
+        self.log_ops = 0
+
+        docs = list(self)
+        self._compaction = self._executor.submit(self._write_snapshot, docs)
+        if wait:
+            self._compaction.result()
+
+    def _write_snapshot(self, docs):
+        tmp = self._file(SNAPSHOT_FILE + ".tmp")
+        with open(tmp, "wb") as f:
+            for doc in docs:
+                f.write(bson.encode(doc))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file(SNAPSHOT_FILE))
+        old_log = self._file(OLD_OPLOG_FILE)
+        if os.path.exists(old_log):
+            os.remove(old_log)
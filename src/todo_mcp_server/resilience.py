@@ -0,0 +1,154 @@
+"""Outage handling for the Todo MCP Server's MongoDB backend.
+
+While MongoDB is unreachable the server serves from its in-memory store.
+``CircuitBreaker`` tracks the outage and paces reconnect attempts with
+exponential backoff, and ``WriteBehindQueue`` buffers every write made to the
+memory store so it can be replayed to MongoDB in bulk once it is back.
+"""
+
+import random
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple, Type, Union
+
+if TYPE_CHECKING:
+    from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+WriteOp = Union["ReplaceOne", "UpdateOne", "DeleteOne"]
+
+
+class WriteBehindFull(Exception):
+    """MongoDB is unreachable and the write-behind queue cannot take more writes."""
+
+
+class TodoUnavailable(Exception):
+    """MongoDB is unreachable and the todo is not in memory, so it may only exist in MongoDB."""
+
+
+def connection_errors() -> Tuple[Type[BaseException], ...]:
+    """Exception types meaning MongoDB could not be reached, for ``except`` clauses.
+
+    PyMongo is only loaded once a MongoDB client exists, and before that no
+    call can fail with its ``ConnectionFailure``, so it is not imported here.
+    """
+    errors = sys.modules.get("pymongo.errors")
+    if errors is None:
+        return (WriteBehindFull, TodoUnavailable)
+    return (WriteBehindFull, TodoUnavailable, errors.ConnectionFailure)
+
+
+class CircuitBreaker:
+    """Breaker state for the MongoDB connection.
+
+    ``closed`` means MongoDB is in use. ``open`` means requests are served from
+    memory while reconnects are attempted; an attempt in progress is
+    ``half_open``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, initial_delay: float = 1.0, max_delay: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.state = self.CLOSED
+        self.trips = 0
+        self.attempts = 0
+        self.opened_at: Optional[float] = None
+        self.next_attempt_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def trip(self, error: Exception):
+        """Open the breaker after a connection failure."""
+        self.state = self.OPEN
+        self.trips += 1
+        self.attempts = 0
+        self.opened_at = self.clock()
+        self.last_error = str(error)
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next reconnect attempt (exponential, jittered)."""
+        delay = min(self.max_delay, self.initial_delay * 2 ** self.attempts)
+        delay *= random.uniform(0.5, 1.0)
+        self.attempts += 1
+        self.next_attempt_at = self.clock() + delay
+        return delay
+
+    def half_open(self):
+        self.state = self.HALF_OPEN
+        self.next_attempt_at = None
+
+    def attempt_failed(self, error: Exception):
+        self.state = self.OPEN
+        self.last_error = str(error)
+
+    def close(self):
+        self.state = self.CLOSED
+        self.attempts = 0
+        self.opened_at = None
+        self.next_attempt_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "reconnect_attempts": self.attempts,
+            "open_for_seconds": round(now - self.opened_at, 1) if self.opened_at is not None else None,
+            "next_attempt_in_seconds": (
+                round(max(0.0, self.next_attempt_at - now), 1) if self.next_attempt_at is not None else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+class WriteBehindQueue:
+    """Bounded FIFO of memory-store writes awaiting replay to MongoDB.
+
+    ``record`` accepts the ``MemoryStore`` write records (``i``/``u``/``d``)
+    and stores them as idempotent bulk-write operations: inserts become
+    upserting replaces, so a replay interrupted part way can simply be
+    retried from the start of the batch.
+    """
+
+    def __init__(self, max_ops: int):
+        self.max_ops = max_ops
+        self.replayed = 0
+        self._ops: Deque[WriteOp] = deque()
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    @property
+    def full(self) -> bool:
+        return len(self._ops) >= self.max_ops
+
+    def record(self, record: Dict[str, Any]):
+        from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+        op = record["op"]
+        if op == "i":
+            doc = record["doc"]
+            self._ops.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+        elif op == "u":
+            self._ops.append(UpdateOne({"_id": record["_id"]}, {"$set": record["set"]}))
+        elif op == "d":
+            self._ops.append(DeleteOne({"_id": record["_id"]}))
+
+    def peek(self, count: int) -> List[WriteOp]:
+        """The oldest ``count`` operations, left in the queue."""
+        return [op for _, op in zip(range(count), self._ops)]
+
+    def pop(self, count: int):
+        """Drop the oldest ``count`` operations once they have been replayed."""
+        for _ in range(count):
+            self._ops.popleft()
+        self.replayed += count
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queued_writes": len(self._ops), "max_queued_writes": self.max_ops,
+                "replayed_writes": self.replayed}
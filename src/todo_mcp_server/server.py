@@ -2,158 +2,628 @@
 """Todo MCP Server - Main server implementation."""
 
 import asyncio
+import contextvars
+import io
 import json
+import os
 import sys
-from datetime import datetime
-from typing import Any, Dict, List
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from bson import ObjectId
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
+from mcp.shared.exceptions import McpError
 from mcp.types import (
-    CallToolRequest,
+    INVALID_PARAMS,
     CallToolResult,
-    ListToolsRequest,
+    ErrorData,
     ListToolsResult,
+    Resource,
+    ResourceTemplate,
+    SubscribeRequest,
     TextContent,
     Tool,
 )
+from pydantic import AnyUrl
 
 from .database import db
-from .models import TodoCreate, TodoUpdate
+from .memory_store import utc_key
+from .metrics import metrics
+from .models import TODO_FIELDS, ChangeCursor, TodoCreate, TodoQuery, TodoUpdate
+from .output import (
+    AGENDA_RESULT_SCHEMA, BATCH_RESULT_SCHEMA, CHANGES_RESULT_SCHEMA, DELETE_RESULT_SCHEMA, EXPLAIN_RESULT_SCHEMA, EXPORT_RESULT_SCHEMA,
+    IMPORT_RESULT_SCHEMA, OUTPUT_PROPERTY, SEARCH_RESULT_SCHEMA, STATS_RESULT_SCHEMA, TODO_LIST_SCHEMA,
+    TODO_RESULT_SCHEMA, TODO_STATS_SCHEMA, dumps, output_schema, respond, todo_to_json, with_output_option,
+)
+from .subscriptions import LIST_URI, ResourceURI, SubscriptionManager
+from .transfer import export_ndjson, format_import_result, import_ndjson, transfer_path
+
+# Sessions that subscribed to a resource during the current ``TodoServer.run``
+run_sessions: contextvars.ContextVar[Set[Any]] = contextvars.ContextVar("run_sessions")
+
+
+class TodoServer(Server):
+    """MCP server that advertises resource subscriptions when it handles them.
+    
+    The low-level ``Server`` always reports ``subscribe=False``. Each ``run``
+    serves one client session; its subscriptions are dropped when it ends.
+    """
+    
+    async def run(self, *args, **kwargs):
+        sessions: Set[Any] = set()
+        token = run_sessions.set(sessions)
+        try:
+            await super().run(*args, **kwargs)
+        finally:
+            run_sessions.reset(token)
+            for session in sessions:
+                subscriptions.drop_session(session)
+    
+    def get_capabilities(self, notification_options, experimental_capabilities):
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None and SubscribeRequest in self.request_handlers:
+            capabilities.resources.subscribe = True
+        return capabilities
 
 
 # Initialize the MCP server
-server = Server("todo-mcp-server")
+server = TodoServer("todo-mcp-server")
 
+# Resource subscriptions, fed by the database's change watcher while any exist
+subscriptions = SubscriptionManager(db.watch_changes)
 
-@server.list_tools()
-async def list_tools() -> ListToolsResult:
-    """List available tools."""
-    return ListToolsResult(
-        tools=[
-            Tool(
-                name="add_todo",
-                description="Add a new todo item",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "title": {
-                            "type": "string",
-                            "description": "Title of the todo item"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Detailed description of the todo item"
-                        },
-                        "due_date": {
-                            "type": "string",
-                            "format": "date-time",
-                            "description": "Due date for the todo item (ISO format)"
-                        },
-                        "priority": {
-                            "type": "string",
-                            "enum": ["low", "medium", "high"],
-                            "description": "Priority level",
-                            "default": "medium"
-                        }
+# JSON-RPC error code for an unknown resource (MCP specification)
+RESOURCE_NOT_FOUND = -32002
+
+# Page size limits for get_all_todos
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Default number of search_todos matches
+DEFAULT_SEARCH_LIMIT = 20
+
+# Fields shown by get_all_todos and search_todos in summary mode
+SUMMARY_FIELDS = ("completed", "title", "priority", "due_date")
+
+PRIORITY_EMOJI = {"low": "🟢", "medium": "🟡", "high": "🔴"}
+# Display order of priorities in todo_stats
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# Windows for get_todos_due_soon (hours) and get_agenda (days)
+DEFAULT_DUE_SOON_HOURS = 24
+DEFAULT_AGENDA_DAYS = 7
+MAX_AGENDA_DAYS = 366
+
+# Maximum number of items accepted by the batch tools
+MAX_BATCH_SIZE = 100
+
+# Tools served by call_tool (metrics for any other name are grouped as "unknown")
+TOOL_NAMES = (
+    "add_todo", "get_all_todos", "update_todo", "delete_todo", "toggle_todo_status",
+    "explain_queries", "add_todos", "update_todos", "delete_todos", "get_server_stats", "search_todos",
+    "get_overdue_todos", "get_todos_due_soon", "get_agenda", "todo_stats", "export_todos", "import_todos",
+    "get_changes_since",
+)
+
+# get_changes_since tokens are "<microseconds since the epoch>-<todo id>"
+EPOCH = datetime(1970, 1, 1)
+
+ADD_TODO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {
+            "type": "string",
+            "description": "Title of the todo item"
+        },
+        "description": {
+            "type": "string",
+            "description": "Detailed description of the todo item"
+        },
+        "due_date": {
+            "type": "string",
+            "format": "date-time",
+            "description": "Due date for the todo item (ISO format)"
+        },
+        "priority": {
+            "type": "string",
+            "enum": ["low", "medium", "high"],
+            "description": "Priority level",
+            "default": "medium"
+        }
+    },
+    "required": ["title"]
+}
+
+# Paging and display arguments of the due-date tools
+DUE_PAGE_PROPERTIES = {
+    "limit": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": MAX_PAGE_SIZE,
+        "description": "Maximum number of todos to return",
+        "default": DEFAULT_PAGE_SIZE
+    },
+    "after_id": {
+        "type": "string",
+        "description": "Return todos after this ID (from the previous page)"
+    },
+    "summary": {
+        "type": "boolean",
+        "description": "One line per todo with status, title, priority and due date",
+        "default": False
+    },
+    "output": OUTPUT_PROPERTY
+}
+
+UPDATE_TODO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "todo_id": {
+            "type": "string",
+            "description": "ID of the todo item to update"
+        },
+        "title": {
+            "type": "string",
+            "description": "New title of the todo item"
+        },
+        "description": {
+            "type": "string",
+            "description": "New description of the todo item"
+        },
+        "completed": {
+            "type": "boolean",
+            "description": "Whether the todo item is completed"
+        },
+        "due_date": {
+            "type": "string",
+            "format": "date-time",
+            "description": "New due date for the todo item (ISO format)"
+        },
+        "priority": {
+            "type": "string",
+            "enum": ["low", "medium", "high"],
+            "description": "New priority level"
+        }
+    },
+    "required": ["todo_id"]
+}
+
+
+def build_tools() -> List[Tool]:
+    """Build the tool definitions advertised by list_tools."""
+    return [
+        Tool(
+            name="add_todo",
+            description="Add a new todo item",
+            inputSchema=with_output_option(ADD_TODO_SCHEMA),
+            outputSchema=output_schema(TODO_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="get_all_todos",
+            description="Get todo items, with optional filters, sorting and pagination",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "completed": {
+                        "type": "boolean",
+                        "description": "Only return todos with this completion status"
+                    },
+                    "priority": {
+                        "type": "string",
+                        "enum": ["low", "medium", "high"],
+                        "description": "Only return todos with this priority level"
+                    },
+                    "due_after": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Only return todos due at or after this time (ISO format)"
+                    },
+                    "due_before": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Only return todos due before this time (ISO format)"
+                    },
+                    "sort_by": {
+                        "type": "string",
+                        "enum": ["created_at", "updated_at", "due_date"],
+                        "description": "Field to sort by",
+                        "default": "created_at"
+                    },
+                    "sort_order": {
+                        "type": "string",
+                        "enum": ["asc", "desc"],
+                        "description": "Sort order",
+                        "default": "asc"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                        "description": "Maximum number of todos to return",
+                        "default": DEFAULT_PAGE_SIZE
+                    },
+                    "after_id": {
+                        "type": "string",
+                        "description": "Return todos after this ID (from the previous page)"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": list(TODO_FIELDS)},
+                        "description": "Only return these fields, one line per todo (the ID is always included)"
                     },
-                    "required": ["title"]
+                    "summary": {
+                        "type": "boolean",
+                        "description": "One line per todo with status, title, priority and due date",
+                        "default": False
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(TODO_LIST_SCHEMA)
+        ),
+        Tool(
+            name="get_overdue_todos",
+            description="Get pending todo items whose due date has passed, most overdue first",
+            inputSchema={
+                "type": "object",
+                "properties": DUE_PAGE_PROPERTIES,
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(TODO_LIST_SCHEMA)
+        ),
+        Tool(
+            name="get_todos_due_soon",
+            description="Get pending todo items due within the next few hours, soonest first",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "hours": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_AGENDA_DAYS * 24,
+                        "description": "Size of the window starting now, in hours",
+                        "default": DEFAULT_DUE_SOON_HOURS
+                    },
+                    **DUE_PAGE_PROPERTIES
+                },
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(TODO_LIST_SCHEMA)
+        ),
+        Tool(
+            name="get_agenda",
+            description="Get pending todo items due from today on, grouped by day",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_AGENDA_DAYS,
+                        "description": "Number of days to cover, starting today",
+                        "default": DEFAULT_AGENDA_DAYS
+                    },
+                    "timezone": {
+                        "type": "string",
+                        "description": "IANA time zone that defines the days, e.g. Europe/Paris",
+                        "default": "UTC"
+                    },
+                    **{key: value for key, value in DUE_PAGE_PROPERTIES.items() if key != "summary"}
+                },
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(AGENDA_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="search_todos",
+            description="Find todo items whose title or description contains any of the given words, best matches first",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words to search for"
+                    },
+                    "completed": {
+                        "type": "boolean",
+                        "description": "Only return todos with this completion status"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                        "description": "Maximum number of matches to return",
+                        "default": DEFAULT_SEARCH_LIMIT
+                    },
+                    "summary": {
+                        "type": "boolean",
+                        "description": "One line per match with status, title, priority and due date",
+                        "default": False
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["query"],
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(SEARCH_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="todo_stats",
+            description="Count todo items by status and priority, and pending items that are overdue",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output": OUTPUT_PROPERTY
                 }
-            ),
-            Tool(
-                name="get_all_todos",
-                description="Get all todo items",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "additionalProperties": False
+            },
+            outputSchema=output_schema(TODO_STATS_SCHEMA)
+        ),
+        Tool(
+            name="get_changes_since",
+            description="Get the todo items created, updated or deleted since a change token, for "
+                        "incremental sync. Without a token every todo item is returned, with a first token.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "since": {
+                        "type": "string",
+                        "description": "next_token from the previous call; omit to start from the beginning"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                        "description": "Maximum number of changes to return",
+                        "default": DEFAULT_PAGE_SIZE
+                    },
+                    "summary": DUE_PAGE_PROPERTIES["summary"],
+                    "output": OUTPUT_PROPERTY
                 }
-            ),
-            Tool(
-                name="update_todo",
-                description="Update an existing todo item",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "todo_id": {
-                            "type": "string",
-                            "description": "ID of the todo item to update"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "New title of the todo item"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "New description of the todo item"
-                        },
-                        "completed": {
-                            "type": "boolean",
-                            "description": "Whether the todo item is completed"
-                        },
-                        "due_date": {
-                            "type": "string",
-                            "format": "date-time",
-                            "description": "New due date for the todo item (ISO format)"
-                        },
-                        "priority": {
-                            "type": "string",
-                            "enum": ["low", "medium", "high"],
-                            "description": "New priority level"
-                        }
+            },
+            outputSchema=output_schema(CHANGES_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="export_todos",
+            description="Export every todo item as NDJSON (one JSON object per line), for backups and migrations",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "File to write, relative to the server's transfer directory; "
+                                       "omit to return the NDJSON in the result"
                     },
-                    "required": ["todo_id"]
+                    "output": OUTPUT_PROPERTY
                 }
-            ),
-            Tool(
-                name="delete_todo",
-                description="Delete a todo item",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "todo_id": {
-                            "type": "string",
-                            "description": "ID of the todo item to delete"
-                        }
+            },
+            outputSchema=output_schema(EXPORT_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="import_todos",
+            description="Import todo items from NDJSON as written by export_todos, keeping their IDs",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "File to read, relative to the server's transfer directory"
                     },
-                    "required": ["todo_id"]
+                    "ndjson": {
+                        "type": "string",
+                        "description": "NDJSON to import, instead of a file"
+                    },
+                    "output": OUTPUT_PROPERTY
                 }
-            ),
-            Tool(
-                name="toggle_todo_status",
-                description="Toggle the completion status of a todo item",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "todo_id": {
-                            "type": "string",
-                            "description": "ID of the todo item to toggle"
-                        }
+            },
+            outputSchema=output_schema(IMPORT_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="update_todo",
+            description="Update an existing todo item",
+            inputSchema=with_output_option(UPDATE_TODO_SCHEMA),
+            outputSchema=output_schema(TODO_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="delete_todo",
+            description="Delete a todo item",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "todo_id": {
+                        "type": "string",
+                        "description": "ID of the todo item to delete"
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["todo_id"]
+            },
+            outputSchema=output_schema(DELETE_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="toggle_todo_status",
+            description="Toggle the completion status of a todo item",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "todo_id": {
+                        "type": "string",
+                        "description": "ID of the todo item to toggle"
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["todo_id"]
+            },
+            outputSchema=output_schema(TODO_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="explain_queries",
+            description="Diagnostics: explain the server's standard MongoDB queries and flag any that do not use an index",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "output": OUTPUT_PROPERTY
+                },
+                "additionalProperties": False
+            },
+            outputSchema=output_schema(EXPLAIN_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="add_todos",
+            description="Add several todo items in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "todos": {
+                        "type": "array",
+                        "items": ADD_TODO_SCHEMA,
+                        "minItems": 1,
+                        "maxItems": MAX_BATCH_SIZE,
+                        "description": "Todo items to add"
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["todos"]
+            },
+            outputSchema=output_schema(BATCH_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="update_todos",
+            description="Update several todo items in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "updates": {
+                        "type": "array",
+                        "items": UPDATE_TODO_SCHEMA,
+                        "minItems": 1,
+                        "maxItems": MAX_BATCH_SIZE,
+                        "description": "Updates to apply, each with the todo_id to update"
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["updates"]
+            },
+            outputSchema=output_schema(BATCH_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="delete_todos",
+            description="Delete several todo items in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "todo_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 1,
+                        "maxItems": MAX_BATCH_SIZE,
+                        "description": "IDs of the todo items to delete"
+                    },
+                    "output": OUTPUT_PROPERTY
+                },
+                "required": ["todo_ids"]
+            },
+            outputSchema=output_schema(BATCH_RESULT_SCHEMA)
+        ),
+        Tool(
+            name="get_server_stats",
+            description="Show per-tool latency, error counts, payload sizes and database round trips",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "prometheus"],
+                        "description": "Human-readable summary or Prometheus text format",
+                        "default": "text"
                     },
-                    "required": ["todo_id"]
+                    "output": OUTPUT_PROPERTY
                 }
-            )
-        ]
-    )
+            },
+            outputSchema=output_schema(STATS_RESULT_SCHEMA)
+        )
+    ]
+
+
+# Tool definitions only depend on the environment, so they are built on the
+# first list_tools request and shared by every later request and HTTP session
+_tools_result = None
+
+
+@server.list_tools()
+async def list_tools() -> ListToolsResult:
+    """List available tools."""
+    global _tools_result
+    if _tools_result is None:
+        _tools_result = ListToolsResult(tools=build_tools())
+    return _tools_result
 
 
 @server.call_tool()
-async def call_tool(request: CallToolRequest) -> CallToolResult:
-    """Handle tool calls."""
+async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle tool calls, recording latency, errors and payload sizes."""
+    arguments = arguments or {}
+    start = time.perf_counter()
+    with metrics.trace(name):
+        result = await dispatch_tool(name, arguments)
+    elapsed = time.perf_counter() - start
+    
+    metrics.record_tool(
+        name if name in TOOL_NAMES else "unknown",
+        elapsed,
+        bool(result.isError),
+        len(json.dumps(arguments, default=str)),
+        sum(len(item.text.encode()) for item in result.content if isinstance(item, TextContent))
+    )
+    return result
+
+
+async def dispatch_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
+    """Route a tool call to its handler."""
     try:
-        if request.name == "add_todo":
-            return await handle_add_todo(request.arguments)
-        elif request.name == "get_all_todos":
-            return await handle_get_all_todos()
-        elif request.name == "update_todo":
-            return await handle_update_todo(request.arguments)
-        elif request.name == "delete_todo":
-            return await handle_delete_todo(request.arguments)
-        elif request.name == "toggle_todo_status":
-            return await handle_toggle_todo_status(request.arguments)
+        if name == "add_todo":
+            return await handle_add_todo(arguments)
+        elif name == "get_all_todos":
+            return await handle_get_all_todos(arguments)
+        elif name == "update_todo":
+            return await handle_update_todo(arguments)
+        elif name == "delete_todo":
+            return await handle_delete_todo(arguments)
+        elif name == "toggle_todo_status":
+            return await handle_toggle_todo_status(arguments)
+        elif name == "explain_queries":
+            return await handle_explain_queries(arguments)
+        elif name == "add_todos":
+            return await handle_add_todos(arguments)
+        elif name == "update_todos":
+            return await handle_update_todos(arguments)
+        elif name == "delete_todos":
+            return await handle_delete_todos(arguments)
+        elif name == "get_server_stats":
+            return await handle_get_server_stats(arguments)
+        elif name == "search_todos":
+            return await handle_search_todos(arguments)
+        elif name == "get_overdue_todos":
+            return await handle_get_overdue_todos(arguments)
+        elif name == "get_todos_due_soon":
+            return await handle_get_todos_due_soon(arguments)
+        elif name == "get_agenda":
+            return await handle_get_agenda(arguments)
+        elif name == "todo_stats":
+            return await handle_todo_stats(arguments)
+        elif name == "export_todos":
+            return await handle_export_todos(arguments)
+        elif name == "import_todos":
+            return await handle_import_todos(arguments)
+        elif name == "get_changes_since":
+            return await handle_get_changes_since(arguments)
         else:
             return CallToolResult(
-                content=[TextContent(type="text", text=f"Unknown tool: {request.name}")],
+                content=[TextContent(type="text", text=f"Unknown tool: {name}")],
                 isError=True
             )
     except Exception as e:
@@ -163,61 +633,394 @@ async def call_tool(request: CallToolRequest) -> CallToolResult:
         )
 
 
+@server.list_resources()
+async def list_resources() -> List[Resource]:
+    """List the fixed resources; single todos and filtered listings are templates."""
+    return [
+        Resource(
+            uri=LIST_URI,
+            name="todos",
+            description=f"The first {DEFAULT_PAGE_SIZE} todo items, oldest first",
+            mimeType="application/json"
+        )
+    ]
+
+
+@server.list_resource_templates()
+async def list_resource_templates() -> List[ResourceTemplate]:
+    """List the resource URI templates."""
+    return [
+        ResourceTemplate(
+            uriTemplate="todo://{todo_id}",
+            name="todo",
+            description="A single todo item",
+            mimeType="application/json"
+        ),
+        ResourceTemplate(
+            uriTemplate=LIST_URI + "{?completed,priority,sort_by,sort_order,limit}",
+            name="todo_list",
+            description=f"A filtered, sorted page of todo items (limit up to {MAX_PAGE_SIZE})",
+            mimeType="application/json"
+        ),
+    ]
+
+
+def parse_resource(uri: AnyUrl) -> ResourceURI:
+    """Parse a ``todo://`` resource URI, raising an invalid-params error if it is not one."""
+    try:
+        return ResourceURI(str(uri))
+    except ValueError as e:
+        raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
+
+
+@server.read_resource()
+async def read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+    """Read a todo or a listing, as the same JSON the tools return with ``output: json``."""
+    resource = parse_resource(uri)
+    if resource.todo_id is not None:
+        todo = await db.get_todo_by_id(str(resource.todo_id))
+        if not todo:
+            raise McpError(ErrorData(code=RESOURCE_NOT_FOUND, message=f"Todo item {resource.todo_id} not found"))
+        data: Dict[str, Any] = {"todo": todo_to_json(todo)}
+    else:
+        try:
+            todos, next_after_id = await db.list_todos(resource.query(DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        except ValueError as e:
+            raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
+        data = {"todos": [todo_to_json(todo) for todo in todos], "next_after_id": next_after_id}
+    return [ReadResourceContents(content=dumps(data), mime_type="application/json")]
+
+
+@server.subscribe_resource()
+async def subscribe_resource(uri: AnyUrl):
+    """Send ``notifications/resources/updated`` to this session when the resource may have changed."""
+    session = server.request_context.session
+    subscriptions.subscribe(session, parse_resource(uri))
+    run_sessions.get(set()).add(session)
+
+
+@server.unsubscribe_resource()
+async def unsubscribe_resource(uri: AnyUrl):
+    """Stop notifications for a resource."""
+    subscriptions.unsubscribe(server.request_context.session, str(uri))
+
+
 async def handle_add_todo(arguments: Dict[str, Any]) -> CallToolResult:
     """Handle adding a new todo item."""
-    title = arguments.get("title")
-    description = arguments.get("description")
-    due_date_str = arguments.get("due_date")
-    priority = arguments.get("priority", "medium")
+    try:
+        todo_data = todo_create_from_arguments(arguments)
+    except ValueError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=str(e))],
+            isError=True
+        )
     
-    if not title:
+    todo = await db.create_todo(todo_data)
+    
+    return respond(
+        arguments,
+        lambda: {"todo": todo_to_json(todo)},
+        lambda: f"Todo item created successfully:\n{format_todo(todo)}"
+    )
+
+
+async def handle_get_all_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle getting a page of todo items."""
+    arguments = arguments or {}
+    
+    try:
+        due_after = parse_datetime(arguments.get("due_after"))
+        due_before = parse_datetime(arguments.get("due_before"))
+    except ValueError:
         return CallToolResult(
-            content=[TextContent(type="text", text="Title is required")],
+            content=[TextContent(type="text", text="Invalid due date format. Use ISO format.")],
             isError=True
         )
     
-    due_date = None
-    if due_date_str:
-        try:
-            due_date = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-        except ValueError:
-            return CallToolResult(
-                content=[TextContent(type="text", text="Invalid due_date format. Use ISO format.")],
-                isError=True
+    limit = min(arguments.get("limit") or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    fields = arguments.get("fields")
+    if fields is None and arguments.get("summary"):
+        fields = SUMMARY_FIELDS
+    query = TodoQuery(
+        completed=arguments.get("completed"),
+        priority=arguments.get("priority"),
+        due_after=due_after,
+        due_before=due_before,
+        sort_by=arguments.get("sort_by", "created_at"),
+        sort_order=arguments.get("sort_order", "asc"),
+        limit=limit,
+        after_id=arguments.get("after_id"),
+        fields=tuple(fields) if fields is not None else None
+    )
+    todos, next_after_id = await db.list_todos(query)
+    json_fields = TODO_FIELDS if query.fields is None else query.fields
+    
+    return respond(
+        arguments,
+        lambda: {"todos": [todo_to_json(todo, json_fields) for todo in todos], "next_after_id": next_after_id},
+        lambda: format_todo_list(todos, query.fields, next_after_id)
+    )
+
+
+def due_query(arguments: Dict[str, Any], due_after, due_before) -> TodoQuery:
+    """Pending todos due in ``[due_after, due_before)``, soonest first (the completed/due_date index)."""
+    return TodoQuery(
+        completed=False,
+        due_after=due_after,
+        due_before=due_before,
+        sort_by="due_date",
+        limit=min(arguments.get("limit") or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE),
+        after_id=arguments.get("after_id")
+    )
+
+
+async def list_due_todos(arguments: Dict[str, Any], query: TodoQuery, heading: str, empty: str) -> CallToolResult:
+    """Run a due-date query and format the page like get_all_todos."""
+    todos, next_after_id = await db.list_todos(query)
+    fields = SUMMARY_FIELDS if arguments.get("summary") else None
+    
+    return respond(
+        arguments,
+        lambda: {"todos": [todo_to_json(todo) for todo in todos], "next_after_id": next_after_id},
+        lambda: format_todo_list(todos, fields, next_after_id, heading, empty)
+    )
+
+
+async def handle_get_overdue_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle listing pending todo items that are past their due date."""
+    query = due_query(arguments, None, datetime.utcnow())
+    return await list_due_todos(arguments, query, "Overdue todo items", "No overdue todo items.")
+
+
+async def handle_get_todos_due_soon(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle listing pending todo items due within the next few hours."""
+    hours = arguments.get("hours") or DEFAULT_DUE_SOON_HOURS
+    now = datetime.utcnow()
+    query = due_query(arguments, now, now + timedelta(hours=hours))
+    return await list_due_todos(
+        arguments, query, f"Todo items due in the next {hours} hours", f"Nothing due in the next {hours} hours."
+    )
+
+
+async def handle_get_agenda(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle listing pending todo items due from today on, grouped by day."""
+    days = min(arguments.get("days") or DEFAULT_AGENDA_DAYS, MAX_AGENDA_DAYS)
+    zone_name = arguments.get("timezone") or "UTC"
+    try:
+        zone = ZoneInfo(zone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Unknown time zone: {zone_name}")],
+            isError=True
+        )
+    
+    today = datetime.now(zone).date()
+    start = datetime(today.year, today.month, today.day, tzinfo=zone)
+    end = start + timedelta(days=days)
+    query = due_query(
+        arguments,
+        start.astimezone(timezone.utc).replace(tzinfo=None),
+        end.astimezone(timezone.utc).replace(tzinfo=None)
+    )
+    todos, next_after_id = await db.list_todos(query)
+    
+    # Stored due dates are UTC; naive ones are UTC by convention
+    by_day: Dict[Any, List[Tuple[datetime, Any]]] = {}
+    for todo in todos:
+        due = todo.due_date if todo.due_date.tzinfo else todo.due_date.replace(tzinfo=timezone.utc)
+        local = due.astimezone(zone)
+        by_day.setdefault(local.date(), []).append((local, todo))
+    
+    def data() -> Dict[str, Any]:
+        return {
+            "timezone": zone_name,
+            "start": today.isoformat(),
+            "days": [
+                {"date": day.isoformat(), "todos": [todo_to_json(todo) for _, todo in entries]}
+                for day, entries in by_day.items()
+            ],
+            "next_after_id": next_after_id,
+        }
+    
+    def text() -> str:
+        last = today + timedelta(days=days - 1)
+        lines = [f"Agenda {today.isoformat()} to {last.isoformat()} ({zone_name}):"]
+        for day, entries in by_day.items():
+            lines.append("")
+            lines.append(day.strftime("%a %Y-%m-%d"))
+            lines.extend(
+                f"  {local.strftime('%H:%M')} {format_todo_line(todo, ('completed', 'title', 'priority'))}"
+                for local, todo in entries
             )
+        if not by_day:
+            lines.append("")
+            lines.append("Nothing due.")
+        if next_after_id:
+            lines.append("")
+            lines.append(f"More todo items available. Use after_id={next_after_id} to get the next page.")
+        return "\n".join(lines)
     
-    todo_data = TodoCreate(
-        title=title,
-        description=description,
-        due_date=due_date,
-        priority=priority
+    return respond(arguments, data, text)
+
+
+async def handle_search_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle full-text search over todo items."""
+    text = (arguments.get("query") or "").strip()
+    
+    if not text:
+        return CallToolResult(
+            content=[TextContent(type="text", text="query is required")],
+            isError=True
+        )
+    
+    limit = min(arguments.get("limit") or DEFAULT_SEARCH_LIMIT, MAX_PAGE_SIZE)
+    matches = await db.search_todos(text, limit, arguments.get("completed"))
+    
+    return respond(
+        arguments,
+        lambda: {"query": text, "results": [{"todo": todo_to_json(todo), "score": score} for todo, score in matches]},
+        lambda: format_search_results(text, matches, arguments.get("summary", False))
     )
+
+
+async def handle_todo_stats(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle counting todo items by status and priority."""
+    stats = await db.todo_stats()
     
-    todo = await db.create_todo(todo_data)
+    def text() -> str:
+        lines = [
+            "Todo Statistics:",
+            "",
+            f"Total: {stats['total']} (⏳ {stats['pending']} pending, ✅ {stats['completed']} completed)",
+            f"Overdue: {stats['overdue']}",
+        ]
+        if stats["by_priority"]:
+            lines.append("")
+            lines.append("By priority:")
+            by_priority = sorted(stats["by_priority"].items(), key=lambda item: PRIORITY_ORDER.get(item[0], 3))
+            for priority, counts in by_priority:
+                emoji = PRIORITY_EMOJI.get(priority, "🟡")
+                lines.append(
+                    f"  {emoji} {str(priority).title()}: {counts['total']} "
+                    f"({counts['pending']} pending, {counts['completed']} completed)"
+                )
+        return "\n".join(lines)
     
-    return CallToolResult(
-        content=[TextContent(
-            type="text",
-            text=f"Todo item created successfully:\n{format_todo(todo)}"
-        )]
+    return respond(arguments, lambda: stats, text)
+
+
+def encode_change_token(cursor: ChangeCursor) -> str:
+    changed_at, todo_id = cursor
+    return f"{(utc_key(changed_at) - EPOCH) // timedelta(microseconds=1)}-{todo_id}"
+
+
+def decode_change_token(token: str) -> ChangeCursor:
+    try:
+        micros, todo_id = token.split("-")
+        return EPOCH + timedelta(microseconds=int(micros)), ObjectId(todo_id)
+    except Exception:
+        raise ValueError(f"Invalid change token '{token}'")
+
+
+async def handle_get_changes_since(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle listing the todo items changed since a change token."""
+    token = arguments.get("since")
+    try:
+        since = decode_change_token(token) if token else None
+    except ValueError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=str(e))],
+            isError=True
+        )
+    
+    limit = min(arguments.get("limit") or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    changes = await db.list_changes(since, limit)
+    next_token = encode_change_token(changes.cursor) if changes.cursor else None
+    
+    def data() -> Dict[str, Any]:
+        return {
+            "todos": [todo_to_json(todo) for todo in changes.todos],
+            "deleted_ids": [str(todo_id) for todo_id in changes.deleted_ids],
+            "next_token": next_token,
+            "has_more": changes.has_more,
+            "reset": changes.reset,
+        }
+    
+    def text() -> str:
+        if changes.reset:
+            return ("The change token is older than the retained change history. "
+                    "Call get_changes_since without since to sync again from the beginning.")
+        fields = SUMMARY_FIELDS if arguments.get("summary") else None
+        lines = [f"{len(changes.todos)} todo items created or updated, {len(changes.deleted_ids)} deleted"]
+        if changes.todos:
+            lines.append("")
+            lines.append(format_todo_list(changes.todos, fields, None, "Created or updated"))
+        if changes.deleted_ids:
+            lines.append("")
+            lines.append("Deleted: " + ", ".join(str(todo_id) for todo_id in changes.deleted_ids))
+        lines.append("")
+        if changes.has_more:
+            lines.append(f"More changes available. Use since={next_token} to get the next page.")
+        else:
+            lines.append(f"Up to date. Use since={next_token} to get later changes.")
+        return "\n".join(lines)
+    
+    return respond(arguments, data, text)
+
+
+async def handle_export_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle exporting todo items as NDJSON, streamed to a file or returned inline."""
+    path = arguments.get("path")
+    
+    if path:
+        full_path = transfer_path(path)
+        # File I/O runs on worker threads, off the event loop
+        await asyncio.to_thread(os.makedirs, os.path.dirname(full_path), exist_ok=True)
+        out = await asyncio.to_thread(open, full_path + ".tmp", "w", encoding="utf-8")
+        try:
+            count = await export_ndjson(db, out, threaded=True)
+        finally:
+            await asyncio.to_thread(out.close)
+        # A failed export never leaves a truncated file behind
+        await asyncio.to_thread(os.replace, full_path + ".tmp", full_path)
+        return respond(
+            arguments,
+            lambda: {"count": count, "path": path},
+            lambda: f"Exported {count} todo items to {path}"
+        )
+    
+    buffer = io.StringIO()
+    count = await export_ndjson(db, buffer)
+    ndjson = buffer.getvalue()
+    return respond(
+        arguments,
+        lambda: {"count": count, "ndjson": ndjson},
+        lambda: ndjson or "No todo items to export."
     )
 
 
-async def handle_get_all_todos() -> CallToolResult:
-    """Handle getting all todo items."""
-    todos = await db.get_all_todos()
+async def handle_import_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle importing todo items from an NDJSON file or string."""
+    path = arguments.get("path")
+    ndjson = arguments.get("ndjson")
     
-    if not todos:
+    if bool(path) == (ndjson is not None):
         return CallToolResult(
-            content=[TextContent(type="text", text="No todo items found.")]
+            content=[TextContent(type="text", text="Exactly one of path or ndjson is required")],
+            isError=True
         )
     
-    todos_text = "All Todo Items:\n\n"
-    for i, todo in enumerate(todos, 1):
-        todos_text += f"{i}. {format_todo(todo)}\n\n"
+    if path:
+        with open(transfer_path(path), encoding="utf-8") as lines:
+            result = await import_ndjson(db, lines)
+    else:
+        result = await import_ndjson(db, ndjson.splitlines())
     
-    return CallToolResult(
-        content=[TextContent(type="text", text=todos_text.strip())]
+    return respond(
+        arguments,
+        lambda: result,
+        lambda: format_import_result(result),
+        is_error=result["imported"] == 0 and result["failed"] > 0
     )
 
 
@@ -231,25 +1034,13 @@ async def handle_update_todo(arguments: Dict[str, Any]) -> CallToolResult:
             isError=True
         )
     
-    # Parse due_date if provided
-    due_date = None
-    due_date_str = arguments.get("due_date")
-    if due_date_str:
-        try:
-            due_date = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-        except ValueError:
-            return CallToolResult(
-                content=[TextContent(type="text", text="Invalid due_date format. Use ISO format.")],
-                isError=True
-            )
-    
-    update_data = TodoUpdate(
-        title=arguments.get("title"),
-        description=arguments.get("description"),
-        completed=arguments.get("completed"),
-        due_date=due_date,
-        priority=arguments.get("priority")
-    )
+    try:
+        update_data = todo_update_from_arguments(arguments)
+    except ValueError as e:
+        return CallToolResult(
+            content=[TextContent(type="text", text=str(e))],
+            isError=True
+        )
     
     updated_todo = await db.update_todo(todo_id, update_data)
     
@@ -259,11 +1050,10 @@ async def handle_update_todo(arguments: Dict[str, Any]) -> CallToolResult:
             isError=True
         )
     
-    return CallToolResult(
-        content=[TextContent(
-            type="text",
-            text=f"Todo item updated successfully:\n{format_todo(updated_todo)}"
-        )]
+    return respond(
+        arguments,
+        lambda: {"todo": todo_to_json(updated_todo)},
+        lambda: f"Todo item updated successfully:\n{format_todo(updated_todo)}"
     )
 
 
@@ -285,8 +1075,10 @@ async def handle_delete_todo(arguments: Dict[str, Any]) -> CallToolResult:
             isError=True
         )
     
-    return CallToolResult(
-        content=[TextContent(type="text", text="Todo item deleted successfully")]
+    return respond(
+        arguments,
+        lambda: {"todo_id": todo_id, "deleted": True},
+        lambda: "Todo item deleted successfully"
     )
 
 
@@ -309,47 +1101,387 @@ async def handle_toggle_todo_status(arguments: Dict[str, Any]) -> CallToolResult
         )
     
     status = "completed" if updated_todo.completed else "pending"
-    return CallToolResult(
-        content=[TextContent(
-            type="text",
-            text=f"Todo item status toggled to {status}:\n{format_todo(updated_todo)}"
-        )]
+    return respond(
+        arguments,
+        lambda: {"todo": todo_to_json(updated_todo)},
+        lambda: f"Todo item status toggled to {status}:\n{format_todo(updated_todo)}"
+    )
+
+
+async def handle_add_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle adding several todo items with one bulk insert."""
+    items = arguments.get("todos") or []
+    
+    if not items:
+        return CallToolResult(
+            content=[TextContent(type="text", text="todos is required")],
+            isError=True
+        )
+    
+    valid: List[int] = []
+    todos: List[TodoCreate] = []
+    errors: Dict[int, str] = {}
+    for i, item in enumerate(items):
+        try:
+            todos.append(todo_create_from_arguments(item))
+            valid.append(i)
+        except ValueError as e:
+            errors[i] = str(e)
+    
+    results = {valid[r.index]: r for r in await db.create_todos(todos)} if todos else {}
+    return format_batch_result(arguments, "created", len(items), results, errors)
+
+
+async def handle_update_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle updating several todo items with one bulk write."""
+    items = arguments.get("updates") or []
+    
+    if not items:
+        return CallToolResult(
+            content=[TextContent(type="text", text="updates is required")],
+            isError=True
+        )
+    
+    valid: List[int] = []
+    updates: List[Tuple[str, TodoUpdate]] = []
+    errors: Dict[int, str] = {}
+    for i, item in enumerate(items):
+        if not item.get("todo_id"):
+            errors[i] = "todo_id is required"
+            continue
+        try:
+            updates.append((item["todo_id"], todo_update_from_arguments(item)))
+            valid.append(i)
+        except ValueError as e:
+            errors[i] = str(e)
+    
+    results = {valid[r.index]: r for r in await db.update_todos(updates)} if updates else {}
+    return format_batch_result(arguments, "updated", len(items), results, errors)
+
+
+async def handle_delete_todos(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle deleting several todo items with one bulk delete."""
+    todo_ids = arguments.get("todo_ids") or []
+    
+    if not todo_ids:
+        return CallToolResult(
+            content=[TextContent(type="text", text="todo_ids is required")],
+            isError=True
+        )
+    
+    results = {r.index: r for r in await db.delete_todos(todo_ids)}
+    return format_batch_result(arguments, "deleted", len(todo_ids), results, {})
+
+
+async def handle_explain_queries(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle explaining the standard queries."""
+    reports = await db.explain_queries()
+    unindexed = sum(1 for report in reports if report["collection_scan"])
+    
+    def text() -> str:
+        lines = [f"Index status: {db.index_status}", ""]
+        for report in reports:
+            if report["collection_scan"]:
+                flag = "⚠️  COLLSCAN"
+            elif report["in_memory_sort"]:
+                flag = "⚠️  in-memory SORT"
+            else:
+                flag = "✅"
+            indexes = ", ".join(report["indexes"]) or "none"
+            lines.append(f"{flag} {report['query']}: {' > '.join(report['stages'])} (indexes: {indexes})")
+        
+        lines.append("")
+        lines.append(f"{unindexed} of {len(reports)} queries do not use an index")
+        return "\n".join(lines)
+    
+    return respond(
+        arguments,
+        lambda: {"index_status": db.index_status, "queries": reports},
+        text,
+        is_error=unindexed > 0
     )
 
 
+async def handle_get_server_stats(arguments: Dict[str, Any]) -> CallToolResult:
+    """Handle reporting server metrics."""
+    if arguments.get("format") == "prometheus":
+        exposition = metrics.render_prometheus()
+        return respond(arguments, lambda: {"prometheus": exposition}, lambda: exposition)
+    
+    stats = metrics.snapshot()
+    breaker = db.breaker_stats()
+    cache = db.cache_stats()
+    coalescing = db.coalesce_stats()
+    subscribed = subscriptions.stats()
+    
+    def data() -> Dict[str, Any]:
+        return {
+            **stats,
+            "storage": db.storage_backend if db.connected else None,
+            "index_status": db.index_status,
+            "health": db.health_status,
+            "breaker": breaker,
+            "cache": cache,
+            "coalescing": coalescing,
+            "subscriptions": subscribed,
+        }
+    
+    def text() -> str:
+        lines = [
+            f"Uptime: {stats['uptime_seconds']}s",
+            f"Storage: {db.storage_backend if db.connected else 'not connected'} (indexes: {db.index_status})",
+            f"Health: {db.health_status}",
+            "",
+            "Tool calls (latency in ms):"
+        ]
+        for tool, entry in stats["tools"].items():
+            lines.append(
+                f"  {tool}: {entry['count']} calls, {entry['errors']} errors, "
+                f"p50 {entry['p50']}, p95 {entry['p95']}, p99 {entry['p99']}, mean {entry['mean']}, "
+                f"request {entry['request_bytes_mean']} B, response {entry['response_bytes_mean']} B"
+            )
+        if not stats["tools"]:
+            lines.append("  none yet")
+        
+        lines.append("")
+        lines.append("Database round trips (latency in ms):")
+        for op, entry in stats["db"].items():
+            lines.append(
+                f"  {op}: {entry['count']} calls, {entry['errors']} errors, "
+                f"p50 {entry['p50']}, p95 {entry['p95']}, p99 {entry['p99']}, mean {entry['mean']}"
+            )
+        if not stats["db"]:
+            lines.append("  none yet")
+        
+        if breaker["state"] != "closed" or breaker["trips"]:
+            lines.append("")
+            lines.append(
+                f"Circuit breaker: {breaker['state']}, {breaker['trips']} outages, "
+                f"{breaker['queued_writes']}/{breaker['max_queued_writes']} writes queued, "
+                f"{breaker['replayed_writes']} replayed"
+            )
+            if breaker["state"] != "closed":
+                retry = breaker["next_attempt_in_seconds"]
+                lines.append(
+                    f"  open for {breaker['open_for_seconds']}s, {breaker['reconnect_attempts']} reconnect attempts, "
+                    f"{'next in ' + str(retry) + 's' if retry is not None else 'reconnecting'}, "
+                    f"last error: {breaker['last_error']}"
+                )
+        
+        lines.append("")
+        lines.append("Read-through cache:")
+        for name, entry in cache.items():
+            lines.append(f"  {name}: {entry['hits']} hits, {entry['misses']} misses, size {entry['size']}/{entry['max_size']}")
+        
+        if coalescing:
+            lines.append("")
+            lines.append("Write coalescing:")
+            for name, entry in coalescing.items():
+                lines.append(
+                    f"  {name}: {entry['items']} writes in {entry['batches']} bulk calls "
+                    f"(mean {entry['mean_batch']}, largest {entry['largest_batch']}, "
+                    f"window {entry['window_ms']} ms, max {entry['max_batch']})"
+                )
+        
+        if subscribed["subscriptions"]:
+            lines.append("")
+            lines.append(
+                f"Resource subscriptions: {subscribed['subscriptions']} in {subscribed['sessions']} sessions, "
+                f"{subscribed['notifications_sent']} notifications sent"
+                f"{'' if subscribed['watching'] else ' (not watching for changes)'}"
+            )
+        return "\n".join(lines)
+    
+    return respond(arguments, data, text)
+
+
+def format_batch_result(arguments: Dict[str, Any], action: str, total: int, results: Dict[int, Any],
+                        errors: Dict[int, str]) -> CallToolResult:
+    """Format per-item batch results; the call is an error only if every item failed."""
+    outcomes = []
+    for i in range(total):
+        result = results.get(i)
+        error = errors.get(i) or (result.error if result else "Not processed")
+        outcomes.append((i, result, error))
+    succeeded = sum(1 for _, _, error in outcomes if not error)
+    
+    def data() -> Dict[str, Any]:
+        items = []
+        for i, result, error in outcomes:
+            item: Dict[str, Any] = {"index": i, "todo_id": result.todo_id if result else None}
+            if error:
+                item["error"] = error
+            elif result.todo:
+                item["todo"] = todo_to_json(result.todo)
+            items.append(item)
+        return {"total": total, "succeeded": succeeded, "results": items}
+    
+    def text() -> str:
+        lines = []
+        for i, result, error in outcomes:
+            if error:
+                lines.append(f"{i + 1}. Error: {error}")
+            elif result.todo:
+                lines.append(f"{i + 1}. {format_todo(result.todo)}")
+            else:
+                lines.append(f"{i + 1}. ID: {result.todo_id}")
+        return f"{succeeded} of {total} todo items {action}:\n\n" + "\n\n".join(lines)
+    
+    return respond(arguments, data, text, is_error=succeeded == 0)
+
+
+def todo_create_from_arguments(arguments: Dict[str, Any]) -> TodoCreate:
+    """Build a TodoCreate from tool arguments, raising ValueError if invalid."""
+    title = arguments.get("title")
+    if not title:
+        raise ValueError("Title is required")
+    
+    try:
+        due_date = parse_datetime(arguments.get("due_date"))
+    except ValueError:
+        raise ValueError("Invalid due_date format. Use ISO format.")
+    
+    return TodoCreate(
+        title=title,
+        description=arguments.get("description"),
+        due_date=due_date,
+        priority=arguments.get("priority", "medium")
+    )
+
+
+def todo_update_from_arguments(arguments: Dict[str, Any]) -> TodoUpdate:
+    """Build a TodoUpdate from tool arguments, raising ValueError if invalid."""
+    try:
+        due_date = parse_datetime(arguments.get("due_date"))
+    except ValueError:
+        raise ValueError("Invalid due_date format. Use ISO format.")
+    
+    return TodoUpdate(
+        title=arguments.get("title"),
+        description=arguments.get("description"),
+        completed=arguments.get("completed"),
+        due_date=due_date,
+        priority=arguments.get("priority")
+    )
+
+
+def parse_datetime(value):
+    """Parse an optional ISO date-time string, accepting a trailing 'Z'."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
 def format_todo(todo) -> str:
     """Format a todo item for display."""
     status = "✅ Completed" if todo.completed else "⏳ Pending"
     due_date_str = f" (Due: {todo.due_date.strftime('%Y-%m-%d %H:%M')})" if todo.due_date else ""
-    priority_emoji = {"low": "🟢", "medium": "🟡", "high": "🔴"}.get(todo.priority, "🟡")
+    priority_emoji = PRIORITY_EMOJI.get(todo.priority, "🟡")
     
-    result = f"ID: {str(todo.id)}\n"
-    result += f"Title: {todo.title}\n"
-    result += f"Status: {status}\n"
-    result += f"Priority: {priority_emoji} {todo.priority.title()}\n"
+    lines = [
+        f"ID: {str(todo.id)}",
+        f"Title: {todo.title}",
+        f"Status: {status}",
+        f"Priority: {priority_emoji} {todo.priority.title()}",
+    ]
     
     if todo.description:
-        result += f"Description: {todo.description}\n"
+        lines.append(f"Description: {todo.description}")
     
-    result += f"Created: {todo.created_at.strftime('%Y-%m-%d %H:%M')}\n"
-    result += f"Updated: {todo.updated_at.strftime('%Y-%m-%d %H:%M')}{due_date_str}"
+    lines.append(f"Created: {todo.created_at.strftime('%Y-%m-%d %H:%M')}")
+    lines.append(f"Updated: {todo.updated_at.strftime('%Y-%m-%d %H:%M')}{due_date_str}")
     
-    return result
+    return "\n".join(lines)
+
+
+def format_todo_list(todos, fields, next_after_id, heading: str = "Todo Items",
+                     empty: str = "No todo items found.") -> str:
+    """Format a page of todo items: full blocks, or one line each when ``fields`` is set."""
+    if not todos:
+        return empty
+    
+    if fields is None:
+        items = [f"{i}. {format_todo(todo)}" for i, todo in enumerate(todos, 1)]
+        separator = "\n\n"
+    else:
+        items = [format_todo_line(todo, fields) for todo in todos]
+        separator = "\n"
+    if next_after_id:
+        items.append(f"More todo items available. Use after_id={next_after_id} to get the next page.")
+    return f"{heading}:\n\n" + separator.join(items)
+
+
+def format_search_results(text: str, matches, summary: bool) -> str:
+    """Format search matches, best first, with their relevance scores."""
+    if not matches:
+        return f"No todo items match '{text}'."
+    
+    if summary:
+        items = [f"{format_todo_line(todo, SUMMARY_FIELDS)} score={score:.2f}" for todo, score in matches]
+        separator = "\n"
+    else:
+        items = [f"{i}. Score: {score:.2f}\n{format_todo(todo)}" for i, (todo, score) in enumerate(matches, 1)]
+        separator = "\n\n"
+    return f"{len(matches)} todo items matching '{text}':\n\n" + separator.join(items)
+
+
+def format_todo_line(todo, fields) -> str:
+    """Format a todo item as one compact line showing only ``fields``."""
+    parts = [str(todo.id)]
+    if "completed" in fields:
+        parts.append("[x]" if todo.completed else "[ ]")
+    if "title" in fields:
+        parts.append(todo.title)
+    for field in TODO_FIELDS:
+        if field in ("completed", "title") or field not in fields:
+            continue
+        value = getattr(todo, field)
+        if value is None or value == "":
+            continue
+        if isinstance(value, datetime):
+            value = value.strftime('%Y-%m-%d %H:%M')
+        elif field == "description":
+            value = " ".join(value.split())
+        parts.append(f"{field}={value}")
+    return " ".join(parts)
+
+
+async def serve_http():
+    """Serve every MCP session from this process over HTTP (streamable HTTP and SSE)."""
+    import uvicorn
+    
+    from .http_server import create_app
+    
+    host = os.getenv("MCP_HOST", "127.0.0.1")
+    port = int(os.getenv("MCP_PORT", "8000"))
+    print(f"🌐 Listening on http://{host}:{port} (streamable HTTP at /mcp, SSE at /sse)", file=sys.stderr)
+    config = uvicorn.Config(create_app(server, db), host=host, port=port, log_level="warning")
+    await uvicorn.Server(config).serve()
 
 
 async def main():
     """Main entry point for the server."""
-    print("🚀 Starting Todo MCP Server...")
-    print("📝 Database connection will be established on first use (lazy loading)")
+    print("🚀 Starting Todo MCP Server...", file=sys.stderr)
+    print("📝 Database connection will be established on first use (lazy loading)", file=sys.stderr)
     
+    transport = os.getenv("MCP_TRANSPORT", "stdio").lower()
+    # Connect while the client is still initializing, instead of on the first call
+    warmup = db.warm_up() if db.eager_connect else None
     try:
         # Run the server (database connection is lazy)
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, server.create_initialization_options())
+        if transport == "http":
+            await serve_http()
+        elif transport == "stdio":
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+        else:
+            raise ValueError(f"Unknown MCP_TRANSPORT '{transport}', expected 'stdio' or 'http'")
     finally:
-        # Disconnect from database if connected
-        if hasattr(db, 'connected') and db.connected and not db.use_memory:
-            db.disconnect()
+        await subscriptions.close()
+        # Disconnect from database (and flush durable memory storage) if connected
+        if hasattr(db, 'connected') and db.connected:
+            await db.disconnect()
+        metrics.dump()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,627 @@
+"""Embedded SQLite storage backend for the Todo MCP Server."""
+
+import asyncio
+import heapq
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from .database import TodoDatabase, page_changes
+from .indexes import standard_queries
+from .memory_store import SORT_FIELDS, utc_key
+from .metrics import metrics
+from .models import (
+    TODO_FIELDS, BatchItemResult, ChangeCursor, TodoChanges, TodoCreate, TodoItem, TodoQuery, TodoRecord, TodoUpdate,
+)
+from .mongo import timed
+from .subscriptions import ChangeEvent
+from .text_search import TEXT_WEIGHTS, tokenize
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS todos (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT,
+        completed INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        due_date TEXT,
+        priority TEXT NOT NULL DEFAULT 'medium'
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS todos_created_at_id ON todos (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS todos_updated_at_id ON todos (updated_at, id)",
+    "CREATE INDEX IF NOT EXISTS todos_due_date_id ON todos (due_date, id)",
+    "CREATE INDEX IF NOT EXISTS todos_completed_due_date_id ON todos (completed, due_date, id)",
+    "CREATE INDEX IF NOT EXISTS todos_priority_created_at_id ON todos (priority, created_at, id)",
+    # Deleted todos, for get_changes_since
+    "CREATE TABLE IF NOT EXISTS todo_tombstones (id TEXT PRIMARY KEY, deleted_at TEXT NOT NULL) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS todo_tombstones_deleted_at_id ON todo_tombstones (deleted_at, id)",
+    # Full-text search: todos has no rowid, so todos_text_ids gives each todo one for FTS5
+    "CREATE TABLE IF NOT EXISTS todos_text_ids (rowid INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todos_text USING fts5(title, description, tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS todos_text_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_text_ids (id) VALUES (new.id);
+        INSERT INTO todos_text (rowid, title, description)
+            VALUES ((SELECT rowid FROM todos_text_ids WHERE id = new.id), new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_text_update AFTER UPDATE OF title, description ON todos BEGIN
+        UPDATE todos_text SET title = new.title, description = new.description
+            WHERE rowid = (SELECT rowid FROM todos_text_ids WHERE id = old.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_text_delete AFTER DELETE ON todos BEGIN
+        DELETE FROM todos_text WHERE rowid = (SELECT rowid FROM todos_text_ids WHERE id = old.id);
+        DELETE FROM todos_text_ids WHERE id = old.id;
+    END""",
+]
+
+# Fills the search index for todos stored before it existed
+REBUILD_TEXT_INDEX = [
+    "DELETE FROM todos_text",
+    "DELETE FROM todos_text_ids",
+    "INSERT INTO todos_text_ids (id) SELECT id FROM todos",
+    """INSERT INTO todos_text (rowid, title, description)
+        SELECT m.rowid, t.title, t.description FROM todos_text_ids m JOIN todos t ON t.id = m.id""",
+]
+
+COLUMNS = ("id", "title", "description", "completed", "created_at", "updated_at", "due_date", "priority")
+DATETIME_COLUMNS = ("created_at", "updated_at", "due_date")
+
+INSERT_SQL = f"INSERT INTO todos ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+SELECT_BY_ID_SQL = f"SELECT {', '.join(COLUMNS)} FROM todos WHERE id = ?"
+DELETE_SQL = "DELETE FROM todos WHERE id = ?"
+TOMBSTONE_SQL = "INSERT OR REPLACE INTO todo_tombstones (id, deleted_at) VALUES (?, ?)"
+EXPIRE_TOMBSTONES_SQL = "DELETE FROM todo_tombstones WHERE deleted_at < ?"
+# Served by todos_updated_at_id and todo_tombstones_deleted_at_id
+CHANGED_SQL = f"SELECT {', '.join(COLUMNS)} FROM todos WHERE updated_at < ?"
+DELETED_SQL = "SELECT deleted_at, id FROM todo_tombstones WHERE deleted_at < ?"
+AFTER_CURSOR_SQL = " AND ({field} > ? OR ({field} = ? AND id > ?))"
+CHANGE_ORDER_SQL = " ORDER BY {field}, id LIMIT ?"
+TOGGLE_SQL = "UPDATE todos SET completed = NOT completed, updated_at = ? WHERE id = ?"
+EXPORT_SQL = f"SELECT {', '.join(COLUMNS)} FROM todos WHERE id > ? ORDER BY id LIMIT ?"
+STATS_SQL = "SELECT completed, priority, count(*) FROM todos GROUP BY completed, priority"
+# Served by todos_completed_due_date_id
+OVERDUE_COUNT_SQL = "SELECT count(*) FROM todos WHERE completed = 0 AND due_date < ?"
+# bm25() is lower for better matches; column weights follow TEXT_WEIGHTS
+BM25 = f"bm25(todos_text, {TEXT_WEIGHTS['title']}, {TEXT_WEIGHTS['description']})"
+SEARCH_SQL = (
+    f"SELECT {', '.join('t.' + column for column in COLUMNS)}, -{BM25} FROM todos_text"
+    " JOIN todos_text_ids m ON m.rowid = todos_text.rowid JOIN todos t ON t.id = m.id"
+    " WHERE todos_text MATCH ?"
+)
+
+
+def to_sql_datetime(value: Optional[datetime]) -> Optional[str]:
+    """Store datetimes as fixed-width naive UTC ISO strings, which sort correctly."""
+    if value is None:
+        return None
+    return utc_key(value).isoformat(sep=" ", timespec="microseconds")
+
+
+def to_sql_value(field: str, value: Any) -> Any:
+    if field in DATETIME_COLUMNS:
+        return to_sql_datetime(value)
+    if field == "completed":
+        return int(value)
+    return value
+
+
+def row_to_doc(row: tuple, columns: Tuple[str, ...] = COLUMNS) -> Dict[str, Any]:
+    """Convert a ``SELECT`` row (in ``columns`` order) to a todo document."""
+    doc = dict(zip(columns, row))
+    doc["_id"] = ObjectId(doc.pop("id"))
+    if "completed" in doc:
+        doc["completed"] = bool(doc["completed"])
+    for field in DATETIME_COLUMNS:
+        if doc.get(field) is not None:
+            doc[field] = datetime.fromisoformat(doc[field])
+    return doc
+
+
+def select_columns(query: TodoQuery) -> Tuple[str, ...]:
+    """Columns a listing query selects: all of them, or ``id`` plus its projection."""
+    if query.fields is None:
+        return COLUMNS
+    return ("id",) + tuple(field for field in COLUMNS[1:] if field in query.fields)
+
+
+def doc_to_row(doc: Dict[str, Any]) -> tuple:
+    return (str(doc["_id"]),) + tuple(to_sql_value(field, doc.get(field)) for field in COLUMNS[1:])
+
+
+class SQLiteTodoDatabase(TodoDatabase):
+    """Todo storage in a local SQLite database in WAL mode.
+
+    All statements run on a single worker thread that owns the connection, so
+    the event loop never blocks on disk I/O and writes are serialised.
+    Statements use fixed SQL text with parameters, so ``sqlite3`` reuses its
+    prepared statements.
+    """
+
+    def __init__(self):
+        """Initialize database settings."""
+        super().__init__()
+        self.use_memory = False
+        self.sqlite_path = os.getenv("SQLITE_DB_PATH", "todos.db")
+        self.conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def storage_backend(self) -> str:
+        """Name of the storage in use."""
+        return "sqlite"
+
+    async def _run(self, func, *args):
+        """Run a function on the connection's worker thread, timing the round trip."""
+        loop = asyncio.get_running_loop()
+        return await timed(self._record_round_trip, func.__name__.lstrip("_"),
+                           loop.run_in_executor(self._executor, func, *args))
+
+    def _record_round_trip(self, op: str, seconds: float, error: bool):
+        metrics.record_db("sqlite", op, seconds, error)
+
+    async def _ensure_connection(self):
+        """Ensure the SQLite database is open (lazy connection)."""
+        if self.connected:
+            return
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self.connected:
+                await self.connect()
+
+    async def connect(self):
+        """Open the SQLite database and create the schema."""
+        print(f"Opening SQLite database: {self.sqlite_path}", file=sys.stderr)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="todo-sqlite")
+        await self._run(self._open)
+        self.index_status = "ready"
+        self.health_status = "ok"
+        self.connected = True
+        print("✅ SQLite database ready (WAL mode)", file=sys.stderr)
+
+    def _open(self):
+        directory = os.path.dirname(self.sqlite_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.sqlite_path, check_same_thread=False, cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+            indexed = self.conn.execute("SELECT count(*) FROM todos_text_ids").fetchone()[0]
+            if indexed != self.conn.execute("SELECT count(*) FROM todos").fetchone()[0]:
+                for statement in REBUILD_TEXT_INDEX:
+                    self.conn.execute(statement)
+
+    async def disconnect(self):
+        """Close the SQLite database."""
+        if self.conn is not None:
+            await self._run(self.conn.close)
+            self.conn = None
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self.connected = False
+            print("Closed SQLite database", file=sys.stderr)
+
+    async def ensure_indexes(self) -> List[str]:
+        """Indexes are part of the schema, which is created on connect."""
+        await self._ensure_connection()
+        return [statement.split()[5] for statement in SCHEMA if statement.startswith("CREATE INDEX")]
+
+    async def explain_queries(self) -> List[Dict[str, Any]]:
+        """Run ``EXPLAIN QUERY PLAN`` on the server's standard queries."""
+        await self._ensure_connection()
+
+        def explain():
+            reports = []
+            for name, query in standard_queries().items():
+                sql, params = self._select_sql(query, None, None)
+                details = [row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+                indexes = [d.split(" USING ")[1].split(" (")[0].replace("COVERING INDEX ", "").replace("INDEX ", "")
+                           for d in details if " USING " in d]
+                reports.append({
+                    "query": name,
+                    "stages": details,
+                    "indexes": indexes,
+                    "collection_scan": any(d.startswith("SCAN") and " USING " not in d for d in details),
+                    "in_memory_sort": any("TEMP B-TREE" in d for d in details),
+                })
+            return reports
+
+        return await self._run(explain)
+
+    async def create_todo(self, todo_data: TodoCreate) -> TodoItem:
+        """Create a new todo item."""
+        await self._ensure_connection()
+
+        todo_dict = todo_data.dict()
+        todo_dict["_id"] = ObjectId()
+        todo_dict["created_at"] = datetime.utcnow()
+        todo_dict["updated_at"] = todo_dict["created_at"]
+        todo_dict["completed"] = False
+
+        def insert():
+            with self.conn:
+                self.conn.execute(INSERT_SQL, doc_to_row(todo_dict))
+
+        await self._run(insert)
+        return TodoItem(**todo_dict)
+
+    @staticmethod
+    def _select_sql(query: TodoQuery, anchor: Optional[Tuple[Any, str]],
+                    after_id: Optional[str]) -> Tuple[str, list]:
+        """Build the SELECT for a listing query, with keyset and limit."""
+        where: List[str] = []
+        params: list = []
+        if query.completed is not None:
+            where.append("completed = ?")
+            params.append(int(query.completed))
+        if query.priority is not None:
+            where.append("priority = ?")
+            params.append(query.priority)
+        if query.due_after is not None:
+            where.append("due_date >= ?")
+            params.append(to_sql_datetime(query.due_after))
+        if query.due_before is not None:
+            where.append("due_date < ?")
+            params.append(to_sql_datetime(query.due_before))
+
+        field = query.sort_by
+        descending = query.sort_order == "desc"
+        if after_id is not None:
+            # SQLite, like MongoDB, orders NULLs first ascending and last descending
+            op = "<" if descending else ">"
+            value = anchor[0]
+            if value is None:
+                if descending:
+                    where.append(f"({field} IS NULL AND id {op} ?)")
+                    params.append(after_id)
+                else:
+                    where.append(f"({field} IS NOT NULL OR id {op} ?)")
+                    params.append(after_id)
+            else:
+                clause = f"({field} {op} ? OR ({field} = ? AND id {op} ?)"
+                clause += f" OR {field} IS NULL)" if descending else ")"
+                where.append(clause)
+                params.extend([value, value, after_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {', '.join(select_columns(query))} FROM todos"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {field} {direction}, id {direction}"
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            params.append(query.limit + 1)
+        return sql, params
+
+    async def list_todos(self, query: TodoQuery) -> Tuple[List[TodoRecord], Optional[str]]:
+        """Get one page of todo items matching a query."""
+        await self._ensure_connection()
+
+        if query.sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{query.sort_by}', expected one of {SORT_FIELDS}")
+        if query.sort_order not in ("asc", "desc"):
+            raise ValueError("sort_order must be 'asc' or 'desc'")
+        unknown_fields = set(query.fields or ()) - set(TODO_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"Unknown fields {sorted(unknown_fields)}, expected some of {TODO_FIELDS}")
+        after_id = str(ObjectId(query.after_id)) if query.after_id else None
+
+        def select():
+            anchor = None
+            if after_id is not None:
+                anchor = self.conn.execute(
+                    f"SELECT {query.sort_by}, id FROM todos WHERE id = ?", (after_id,)
+                ).fetchone()
+                if anchor is None:
+                    raise ValueError(f"after_id {after_id} not found")
+            sql, params = self._select_sql(query, anchor, after_id)
+            return self.conn.execute(sql, params).fetchall()
+
+        rows = await self._run(select)
+        has_more = query.limit is not None and len(rows) > query.limit
+        if has_more:
+            rows = rows[:query.limit]
+        columns = select_columns(query)
+        todos = [TodoRecord(row_to_doc(row, columns)) for row in rows]
+        next_after_id = str(todos[-1].id) if has_more else None
+        return todos, next_after_id
+
+    async def search_todos(self, text: str, limit: int,
+                           completed: Optional[bool] = None) -> List[Tuple[TodoRecord, float]]:
+        """Full-text search over titles and descriptions, ranked by BM25."""
+        await self._ensure_connection()
+
+        words = tokenize(text)
+        if not words:
+            return []
+        sql = SEARCH_SQL
+        params: list = [" OR ".join(f'"{word}"' for word in words)]
+        if completed is not None:
+            sql += " AND t.completed = ?"
+            params.append(int(completed))
+        sql += f" ORDER BY {BM25} LIMIT ?"
+        params.append(limit)
+
+        def search():
+            return self.conn.execute(sql, params).fetchall()
+
+        rows = await self._run(search)
+        return [(TodoRecord(row_to_doc(row[:-1])), row[-1]) for row in rows]
+
+    async def todo_stats(self) -> Dict[str, Any]:
+        """Count todos by status and priority, and pending todos past their due date."""
+        await self._ensure_connection()
+        now = to_sql_datetime(datetime.utcnow())
+
+        def count():
+            groups = self.conn.execute(STATS_SQL).fetchall()
+            overdue = self.conn.execute(OVERDUE_COUNT_SQL, (now,)).fetchone()[0]
+            return groups, overdue
+
+        groups, overdue = await self._run(count)
+        return self._stats_from_counts([(bool(completed), priority, n) for completed, priority, n in groups], overdue)
+
+    async def list_changes(self, since: Optional[ChangeCursor], limit: int) -> TodoChanges:
+        """Todos created, updated or deleted after ``since``, read from the ``updated_at`` and tombstone indexes."""
+        await self._ensure_connection()
+
+        now = datetime.utcnow()
+        if since is not None and utc_key(since[0]) < self.changes_floor(now):
+            return TodoChanges([], [], None, reset=True)
+
+        def select(sql: str, field: str) -> List[tuple]:
+            params: list = [to_sql_datetime(now)]
+            if since is not None:
+                sql += AFTER_CURSOR_SQL.format(field=field)
+                since_at = to_sql_datetime(since[0])
+                params += [since_at, since_at, str(since[1])]
+            return self.conn.execute(sql + CHANGE_ORDER_SQL.format(field=field), params + [limit + 1]).fetchall()
+
+        def changes():
+            return select(CHANGED_SQL, "updated_at"), select(DELETED_SQL, "deleted_at")
+
+        changed, deleted = await self._run(changes)
+        todos = [TodoRecord(row_to_doc(row)) for row in changed]
+        return page_changes(
+            heapq.merge(
+                ((todo.updated_at, todo.id, todo) for todo in todos),
+                ((datetime.fromisoformat(deleted_at), ObjectId(todo_id), None) for deleted_at, todo_id in deleted),
+                key=lambda change: change[:2]
+            ),
+            limit, now
+        )
+
+    async def watch_changes(self, publish: Callable[[ChangeEvent], None]):
+        """Poll ``list_changes`` for writes, which also sees other processes sharing the file."""
+        await self._ensure_connection()
+        await self._poll_changes(publish)
+
+    async def get_todo_by_id(self, todo_id: str) -> Optional[TodoItem]:
+        """Get a todo item by ID."""
+        await self._ensure_connection()
+
+        if not ObjectId.is_valid(todo_id):
+            return None
+
+        def select_one():
+            return self.conn.execute(SELECT_BY_ID_SQL, (str(ObjectId(todo_id)),)).fetchone()
+
+        row = await self._run(select_one)
+        if row:
+            return TodoItem(**row_to_doc(row))
+        return None
+
+    def _update_row(self, todo_id: str, update_data: Dict[str, Any]) -> Optional[tuple]:
+        """Apply an update and read back the row, inside the caller's transaction."""
+        fields = sorted(update_data)
+        sql = f"UPDATE todos SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?"
+        params = [to_sql_value(field, update_data[field]) for field in fields] + [todo_id]
+        if self.conn.execute(sql, params).rowcount == 0:
+            return None
+        return self.conn.execute(SELECT_BY_ID_SQL, (todo_id,)).fetchone()
+
+    async def update_todo(self, todo_id: str, todo_update: TodoUpdate) -> Optional[TodoItem]:
+        """Update a todo item."""
+        await self._ensure_connection()
+
+        if not ObjectId.is_valid(todo_id):
+            return None
+        update_data = {k: v for k, v in todo_update.dict().items() if v is not None}
+        if not update_data:
+            return None
+        update_data["updated_at"] = datetime.utcnow()
+
+        def update():
+            with self.conn:
+                return self._update_row(str(ObjectId(todo_id)), update_data)
+
+        row = await self._run(update)
+        if row:
+            return TodoItem(**row_to_doc(row))
+        return None
+
+    def _delete_row(self, todo_id: str, now: datetime) -> bool:
+        """Delete a row and leave a tombstone, inside the caller's transaction."""
+        if self.conn.execute(DELETE_SQL, (todo_id,)).rowcount == 0:
+            return False
+        self.conn.execute(TOMBSTONE_SQL, (todo_id, to_sql_datetime(now)))
+        self.conn.execute(EXPIRE_TOMBSTONES_SQL, (to_sql_datetime(now - self.tombstone_retention),))
+        return True
+
+    async def delete_todo(self, todo_id: str) -> bool:
+        """Delete a todo item."""
+        await self._ensure_connection()
+
+        if not ObjectId.is_valid(todo_id):
+            return False
+
+        def delete():
+            with self.conn:
+                return self._delete_row(str(ObjectId(todo_id)), datetime.utcnow())
+
+        return await self._run(delete)
+
+    async def toggle_todo_status(self, todo_id: str) -> Optional[TodoItem]:
+        """Toggle the completion status of a todo item."""
+        await self._ensure_connection()
+
+        if not ObjectId.is_valid(todo_id):
+            return None
+        object_id = str(ObjectId(todo_id))
+
+        def toggle():
+            with self.conn:
+                if self.conn.execute(TOGGLE_SQL, (to_sql_datetime(datetime.utcnow()), object_id)).rowcount == 0:
+                    return None
+                return self.conn.execute(SELECT_BY_ID_SQL, (object_id,)).fetchone()
+
+        row = await self._run(toggle)
+        if row:
+            return TodoItem(**row_to_doc(row))
+        return None
+
+    async def create_todos(self, todos: List[TodoCreate]) -> List[BatchItemResult]:
+        """Create several todo items in one transaction."""
+        await self._ensure_connection()
+
+        now = datetime.utcnow()
+        todo_dicts = []
+        for todo_data in todos:
+            todo_dict = todo_data.dict()
+            todo_dict["_id"] = ObjectId()
+            todo_dict["created_at"] = now
+            todo_dict["updated_at"] = now
+            todo_dict["completed"] = False
+            todo_dicts.append(todo_dict)
+
+        def insert_many():
+            errors: Dict[int, str] = {}
+            with self.conn:
+                for i, todo_dict in enumerate(todo_dicts):
+                    try:
+                        self.conn.execute(INSERT_SQL, doc_to_row(todo_dict))
+                    except sqlite3.Error as e:
+                        errors[i] = str(e)
+            return errors
+
+        errors = await self._run(insert_many)
+        results = []
+        for i, todo_dict in enumerate(todo_dicts):
+            if i in errors:
+                results.append(BatchItemResult(index=i, error=errors[i]))
+            else:
+                todo = TodoItem(**todo_dict)
+                results.append(BatchItemResult(index=i, todo_id=str(todo.id), todo=todo))
+        return results
+
+    async def update_todos(self, updates: List[Tuple[str, TodoUpdate]]) -> List[BatchItemResult]:
+        """Update several todo items in one transaction."""
+        await self._ensure_connection()
+
+        now = datetime.utcnow()
+        results: Dict[int, BatchItemResult] = {}
+        pending: List[Tuple[int, str, Dict[str, Any]]] = []
+        for i, (todo_id, todo_update) in enumerate(updates):
+            if not ObjectId.is_valid(todo_id):
+                results[i] = BatchItemResult(index=i, todo_id=todo_id, error="Invalid todo ID")
+                continue
+            update_data = {k: v for k, v in todo_update.dict().items() if v is not None}
+            if not update_data:
+                results[i] = BatchItemResult(index=i, todo_id=todo_id, error="No changes provided")
+                continue
+            update_data["updated_at"] = now
+            pending.append((i, str(ObjectId(todo_id)), update_data))
+
+        def update_many():
+            rows = {}
+            with self.conn:
+                for i, object_id, update_data in pending:
+                    # A failed statement is undone on its own; the others still commit
+                    try:
+                        rows[i] = self._update_row(object_id, update_data)
+                    except sqlite3.Error as e:
+                        rows[i] = e
+            return rows
+
+        rows = await self._run(update_many)
+        for i, object_id, _ in pending:
+            row = rows[i]
+            if isinstance(row, sqlite3.Error):
+                results[i] = BatchItemResult(index=i, todo_id=object_id, error=str(row))
+            elif row:
+                results[i] = BatchItemResult(index=i, todo_id=object_id, todo=TodoItem(**row_to_doc(row)))
+            else:
+                results[i] = BatchItemResult(index=i, todo_id=object_id, error="Todo item not found")
+        return [results[i] for i in range(len(updates))]
+
+    async def delete_todos(self, todo_ids: List[str]) -> List[BatchItemResult]:
+        """Delete several todo items in one transaction."""
+        await self._ensure_connection()
+
+        def delete_many():
+            deleted = []
+            now = datetime.utcnow()
+            with self.conn:
+                for todo_id in todo_ids:
+                    if ObjectId.is_valid(todo_id):
+                        deleted.append(self._delete_row(str(ObjectId(todo_id)), now))
+                    else:
+                        deleted.append(None)
+            return deleted
+
+        results = []
+        for i, (todo_id, deleted) in enumerate(zip(todo_ids, await self._run(delete_many))):
+            if deleted is None:
+                results.append(BatchItemResult(index=i, todo_id=todo_id, error="Invalid todo ID"))
+            elif deleted:
+                results.append(BatchItemResult(index=i, todo_id=todo_id))
+            else:
+                results.append(BatchItemResult(index=i, todo_id=todo_id, error="Todo item not found"))
+        return results
+
+    async def export_todos(self, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield every stored todo document in ID order, paging on the primary key."""
+        await self._ensure_connection()
+
+        def export_batch(after_id):
+            return self.conn.execute(EXPORT_SQL, (after_id, batch_size)).fetchall()
+
+        last_id = ""
+        while True:
+            rows = await self._run(export_batch, last_id)
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row_to_doc(row) for row in rows]
+
+    async def import_todos(self, todo_docs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert exported todo documents in one transaction, keeping their IDs and creation times.
+
+        ``updated_at`` becomes the import time, as in ``TodoDatabase.import_todos``.
+        """
+        await self._ensure_connection()
+
+        now = datetime.utcnow()
+        todo_docs = [{**todo_doc, "updated_at": now} for todo_doc in todo_docs]
+
+        def insert_many():
+            errors: List[Optional[str]] = [None] * len(todo_docs)
+            with self.conn:
+                for i, todo_doc in enumerate(todo_docs):
+                    try:
+                        self.conn.execute(INSERT_SQL, doc_to_row(todo_doc))
+                    except sqlite3.Error as e:
+                        errors[i] = str(e)
+            return errors
+
+        return await self._run(insert_many)
@@ -0,0 +1,236 @@
+"""MCP resource subscriptions for the Todo MCP Server.
+
+Todos are exposed as resources: ``todo://{id}`` for one todo and
+``todo://list`` (optionally ``?completed=...&priority=...&sort_by=...
+&sort_order=...&limit=...``) for a listing. Clients subscribe to these URIs
+and receive ``notifications/resources/updated`` when a write may have changed
+them, then read the resource again.
+
+Writes reach ``SubscriptionManager.publish`` as ``ChangeEvent``s from the
+storage backend (see ``TodoDatabase.watch_changes``): the memory store's write
+listeners, a MongoDB change stream, or polling ``list_changes`` where neither
+is available. The watcher only runs while someone is subscribed.
+"""
+
+import asyncio
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlsplit
+
+from bson import ObjectId
+
+from .memory_store import SORT_FIELDS
+from .models import TodoQuery
+
+SCHEME = "todo"
+LIST_URI = "todo://list"
+
+# Query parameters accepted by todo://list, and the ones that filter it
+LIST_PARAMS = ("completed", "priority", "sort_by", "sort_order", "limit")
+FILTER_FIELDS = ("completed", "priority")
+
+
+class ChangeEvent:
+    """One write to a todo, as seen by subscriptions.
+
+    ``doc`` is the todo after the write (None for deletes, or when unknown)
+    and ``fields`` the names of the fields an update set (None when unknown).
+    """
+
+    __slots__ = ("op", "todo_id", "doc", "fields")
+
+    def __init__(self, op: str, todo_id: ObjectId, doc: Optional[Dict[str, Any]] = None,
+                 fields: Optional[Iterable[str]] = None):
+        self.op = op
+        self.todo_id = todo_id
+        self.doc = doc
+        self.fields = set(fields) if fields is not None else None
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.op!r}, {self.todo_id!r})"
+
+
+def event_from_record(record: Dict[str, Any], get_doc: Callable[[ObjectId], Optional[Dict[str, Any]]]) -> ChangeEvent:
+    """Convert a ``MemoryStore`` write record (``i``/``u``/``d``) to an event."""
+    op = record["op"]
+    if op == "i":
+        return ChangeEvent("insert", record["doc"]["_id"], record["doc"])
+    if op == "u":
+        return ChangeEvent("update", record["_id"], get_doc(record["_id"]), record["set"])
+    return ChangeEvent("delete", record["_id"])
+
+
+def event_from_change(change: Dict[str, Any]) -> Optional[ChangeEvent]:
+    """Convert a MongoDB change stream document to an event (None for non-document events)."""
+    op = change["operationType"]
+    if op not in ("insert", "update", "replace", "delete"):
+        return None
+    fields = None
+    if op == "update":
+        description = change["updateDescription"]
+        fields = [*description.get("updatedFields", {}), *description.get("removedFields", [])]
+    return ChangeEvent(
+        "delete" if op == "delete" else "insert" if op == "insert" else "update",
+        change["documentKey"]["_id"],
+        change.get("fullDocument"),
+        fields
+    )
+
+
+class ResourceURI:
+    """A parsed ``todo://`` resource URI: one todo, or a filtered listing."""
+
+    def __init__(self, uri: str):
+        parts = urlsplit(uri)
+        if parts.scheme != SCHEME or not parts.netloc or parts.path not in ("", "/") or parts.fragment:
+            raise ValueError(f"Unknown resource '{uri}', expected todo://{{id}} or {LIST_URI}")
+        self.uri = uri
+        self.todo_id: Optional[ObjectId] = None
+        self.params: Dict[str, str] = {}
+        if parts.netloc != "list":
+            if parts.query or not ObjectId.is_valid(parts.netloc):
+                raise ValueError(f"Invalid todo resource '{uri}'")
+            self.todo_id = ObjectId(parts.netloc)
+            return
+        for name, value in parse_qsl(parts.query, strict_parsing=bool(parts.query)):
+            if name not in LIST_PARAMS:
+                raise ValueError(f"Unknown parameter '{name}' in {uri}, expected some of {LIST_PARAMS}")
+            self.params[name] = value
+        if self.params.get("completed", "true") not in ("true", "false"):
+            raise ValueError("completed must be 'true' or 'false'")
+        if self.params.get("sort_by", "created_at") not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {SORT_FIELDS}")
+        if self.params.get("sort_order", "asc") not in ("asc", "desc"):
+            raise ValueError("sort_order must be 'asc' or 'desc'")
+        if not self.params.get("limit", "1").isdigit():
+            raise ValueError("limit must be a positive integer")
+        self.completed = {"true": True, "false": False}.get(self.params.get("completed", ""))
+        self.priority = self.params.get("priority")
+
+    def query(self, default_limit: int, max_limit: int) -> TodoQuery:
+        """The listing query of a ``todo://list`` URI."""
+        limit = int(self.params.get("limit") or default_limit)
+        return TodoQuery(
+            completed=self.completed,
+            priority=self.priority,
+            sort_by=self.params.get("sort_by", "created_at"),
+            sort_order=self.params.get("sort_order", "asc"),
+            limit=max(1, min(limit, max_limit))
+        )
+
+    def matches(self, doc: Dict[str, Any]) -> bool:
+        """Whether a todo passes this listing's filters."""
+        return ((self.completed is None or doc.get("completed") == self.completed)
+                and (self.priority is None or doc.get("priority") == self.priority))
+
+    def affected_by(self, event: ChangeEvent) -> bool:
+        """Whether ``event`` may have changed what reading this resource returns.
+
+        Listings do not know what they held before, so an update that moved
+        a todo out of the filter, or a delete, notifies every listing it
+        could have been in.
+        """
+        if self.todo_id is not None:
+            return event.todo_id == self.todo_id
+        if event.doc is not None and self.matches(event.doc):
+            return True
+        if event.op == "insert":
+            return False
+        if event.op == "update" and event.fields is not None:
+            return not event.fields.isdisjoint(
+                field for field in FILTER_FIELDS if getattr(self, field) is not None
+            )
+        return True
+
+
+class SubscriptionManager:
+    """Subscribed URIs per session, and the watcher that feeds them.
+
+    ``publish`` is called for every write. Notifications for the events of
+    one event-loop iteration (e.g. a bulk write) are collected first, so
+    each session gets at most one per URI.
+    """
+
+    def __init__(self, watch: Callable[[Callable[[ChangeEvent], None]], Any]):
+        self.watch = watch
+        self.notifications = 0
+        self._subscriptions: Dict[Any, Dict[str, ResourceURI]] = {}
+        self._pending: Dict[Any, Set[str]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._sending: Set[asyncio.Task] = set()
+        self._watcher: Optional[asyncio.Task] = None
+
+    def subscribe(self, session: Any, resource: ResourceURI):
+        """Subscribe ``session`` to ``resource``, starting the watcher if needed."""
+        self._subscriptions.setdefault(session, {})[resource.uri] = resource
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+
+    def unsubscribe(self, session: Any, uri: str):
+        """Unsubscribe ``session`` from ``uri``, stopping the watcher if nothing is left."""
+        uris = self._subscriptions.get(session)
+        if uris is not None:
+            uris.pop(uri, None)
+            if not uris:
+                self.drop_session(session)
+
+    def drop_session(self, session: Any):
+        """Forget every subscription of ``session``, e.g. when it disconnects."""
+        self._subscriptions.pop(session, None)
+        self._pending.pop(session, None)
+        if not self._subscriptions and self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    async def _watch(self):
+        try:
+            await self.watch(self.publish)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Resource subscriptions stopped: {str(e)}", file=sys.stderr)
+
+    def publish(self, event: ChangeEvent):
+        """Queue notifications for the subscriptions ``event`` affects."""
+        for session, uris in self._subscriptions.items():
+            for uri, resource in uris.items():
+                if resource.affected_by(event):
+                    self._pending.setdefault(session, set()).add(uri)
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for session, uris in pending.items():
+            task = asyncio.create_task(self._send(session, sorted(uris)))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, session: Any, uris: List[str]):
+        from pydantic import AnyUrl
+
+        for uri in uris:
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+                self.notifications += 1
+            except Exception:
+                # The client went away; forget its subscriptions
+                self.drop_session(session)
+                return
+
+    async def close(self):
+        """Stop the watcher and wait for notifications in flight."""
+        if self._watcher is not None and not self._watcher.done():
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._subscriptions),
+            "subscriptions": sum(len(uris) for uris in self._subscriptions.values()),
+            "watching": self._watcher is not None and not self._watcher.done(),
+            "notifications_sent": self.notifications,
+        }
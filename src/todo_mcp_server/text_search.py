@@ -0,0 +1,36 @@
+"""Tokenizing and weighting for full-text search over todos.
+
+MongoDB uses a text index on ``title`` and ``description`` with these
+weights, SQLite an FTS5 table, and the in-memory store an inverted index
+built with ``tokenize``. A search matches todos containing any of the
+query's words, ranked by how often they occur, with title matches counting
+double. Like FTS5's ``unicode61`` tokenizer and MongoDB's text index,
+``tokenize`` splits on underscores and ignores case and diacritics.
+MongoDB and SQLite also stem words ("reports" finds "report"); the
+in-memory index matches whole words.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+TEXT_WEIGHTS = {"title": 2.0, "description": 1.0}
+
+# Common English words that are not indexed (a subset of MongoDB's list)
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or our so than that the their then
+there these they this to too was we were what when where which who will with you your
+""".split())
+
+# Letters and digits; underscores separate words
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of ``text`` without diacritics or stop words."""
+    if not text:
+        return []
+    text = text.lower()
+    if not text.isascii():
+        text = "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+    return [word for word in _WORD.findall(text) if word not in STOP_WORDS]
@@ -0,0 +1,180 @@
+"""NDJSON export and import of todos, for backups and migrations.
+
+Each line holds one todo as the same JSON object structured tool output uses
+(``todo_to_json``), so exports keep IDs and timestamps and can be read by any
+JSON tool. Both directions work a batch at a time: export streams from the
+storage backend and import inserts in chunks, so memory use does not grow
+with the number of todos.
+
+The ``todo-mcp-transfer`` command runs either direction against the storage
+configured in the environment, reading or writing stdin/stdout by default.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from bson import ObjectId
+
+from .memory_store import utc_key
+from .models import TodoItem, TodoRecord
+from .output import dumps, todo_to_json
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Failed lines reported individually by an import; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+# Directory the export_todos and import_todos tools may read and write
+TRANSFER_DIR = os.getenv("TODO_TRANSFER_DIR", "exports")
+
+
+def encode_todo(todo_doc: Dict[str, Any]) -> str:
+    """One NDJSON line for a stored todo document."""
+    return dumps(todo_to_json(TodoRecord(todo_doc))) + "\n"
+
+
+def decode_todo(line: str) -> Dict[str, Any]:
+    """Validate one NDJSON line and convert it to a todo document.
+
+    Missing fields get the same defaults as new todos (including a fresh ID),
+    and datetimes are stored as naive UTC like everywhere else.
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    item = TodoItem(**data)
+    todo_doc = item.dict(by_alias=True)
+    todo_doc["_id"] = ObjectId(item.id)
+    for field in ("created_at", "updated_at", "due_date"):
+        if todo_doc[field] is not None:
+            todo_doc[field] = utc_key(todo_doc[field])
+    return todo_doc
+
+
+def transfer_path(path: str) -> str:
+    """Resolve a tool-supplied path inside ``TODO_TRANSFER_DIR``."""
+    root = os.path.realpath(TRANSFER_DIR)
+    full = os.path.realpath(os.path.join(root, path))
+    if not full.startswith(root + os.sep):
+        raise ValueError(f"Path must be inside the transfer directory ({TRANSFER_DIR})")
+    return full
+
+
+async def export_ndjson(db, out: TextIO, batch_size: int = DEFAULT_BATCH_SIZE, threaded: bool = False) -> int:
+    """Write every todo to ``out`` as NDJSON and return how many were written.
+
+    With ``threaded`` each batch is written on a worker thread, so a slow
+    disk does not block the event loop.
+    """
+    count = 0
+    async for batch in db.export_todos(batch_size):
+        text = "".join(encode_todo(todo_doc) for todo_doc in batch)
+        if threaded:
+            await asyncio.to_thread(out.write, text)
+        else:
+            out.write(text)
+        count += len(batch)
+    return count
+
+
+async def import_ndjson(db, lines: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Insert todos from NDJSON lines in chunks of ``batch_size``.
+
+    Blank lines are skipped. Lines that fail to parse or insert (e.g. an ID
+    that already exists) are counted, and the first few are reported with
+    their line number.
+    """
+    result: Dict[str, Any] = {"imported": 0, "failed": 0, "errors": []}
+
+    def fail(line_number: int, error: str):
+        result["failed"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append({"line": line_number, "error": error})
+
+    async def flush(chunk: List[Dict[str, Any]], line_numbers: List[int]):
+        for line_number, error in zip(line_numbers, await db.import_todos(chunk)):
+            if error:
+                fail(line_number, error)
+            else:
+                result["imported"] += 1
+
+    chunk: List[Dict[str, Any]] = []
+    line_numbers: List[int] = []
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            chunk.append(decode_todo(line))
+            line_numbers.append(line_number)
+        except ValueError as e:
+            fail(line_number, str(e))
+            continue
+        if len(chunk) >= batch_size:
+            await flush(chunk, line_numbers)
+            chunk, line_numbers = [], []
+    if chunk:
+        await flush(chunk, line_numbers)
+    result["errors"].sort(key=lambda error: error["line"])
+    return result
+
+
+def format_import_result(result: Dict[str, Any]) -> str:
+    """Summarize an import for people."""
+    lines = [f"Imported {result['imported']} todo items, {result['failed']} failed"]
+    for error in result["errors"]:
+        lines.append(f"  line {error['line']}: {error['error']}")
+    if result["failed"] > len(result["errors"]):
+        lines.append(f"  ... and {result['failed'] - len(result['errors'])} more")
+    return "\n".join(lines)
+
+
+async def run(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="todo-mcp-transfer",
+        description="Export todos to NDJSON or import them, using the storage configured in the environment."
+    )
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", nargs="?", help="NDJSON file to write or read (default: stdout/stdin)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Todos per round trip (default {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    from .database import db
+
+    try:
+        if args.command == "export":
+            if args.file:
+                with open(args.file, "w", encoding="utf-8") as out:
+                    count = await export_ndjson(db, out, args.batch_size)
+            else:
+                count = await export_ndjson(db, sys.stdout, args.batch_size)
+                sys.stdout.flush()
+            print(f"✅ Exported {count} todo items", file=sys.stderr)
+            return 0
+
+        if args.file:
+            with open(args.file, encoding="utf-8") as lines:
+                result = await import_ndjson(db, lines, args.batch_size)
+        else:
+            result = await import_ndjson(db, sys.stdin, args.batch_size)
+        print(("✅ " if not result["failed"] else "⚠️  ") + format_import_result(result), file=sys.stderr)
+        return 1 if result["failed"] else 0
+    finally:
+        # Flushes durable memory storage
+        if db.connected:
+            await db.disconnect()
+
+
+def main():
+    """Entry point for ``todo-mcp-transfer``."""
+    sys.exit(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Shared fixtures: database backends on memory, SQLite and a MongoDB stand-in.
+
+The MongoDB stand-in is the ``mongomock``-backed collection the benchmarks
+use (``benchmarks/standin.py``), wrapped in ``FailingCollection`` so tests
+can take it down.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+
+# Settings read from the environment that change how a TodoDatabase behaves
+STORAGE_ENV = (
+    "MONGODB_URI", "USE_MEMORY_DB", "USE_SQLITE_DB", "SQLITE_DB_PATH", "MEMORY_DB_PATH",
+    "MONGODB_AUTO_RECOVER", "WRITE_BEHIND_MAX_OPS", "WRITE_COALESCE_WINDOW_MS", "CHANGES_SETTLE_MS",
+    "TOMBSTONE_RETENTION_HOURS", "TODO_CACHE_SIZE", "MONGODB_HEARTBEAT_SECONDS", "EAGER_CONNECT",
+)
+
+
+class FailingCollection:
+    """Synchronous collection double that fails like an unreachable server.
+
+    While ``down`` is set every call raises ``AutoReconnect``; the calls named
+    in ``failing`` raise it regardless. ``calls`` records every call made.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.down = False
+        self.failing = set()
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            from pymongo.errors import AutoReconnect
+
+            self.calls.append(name)
+            if self.down or name in self.failing:
+                raise AutoReconnect(f"{name}: connection refused")
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class MongoStandin:
+    """``todos`` and ``todo_tombstones`` stand-ins, used by ``db`` (and any ``attach``-ed database)."""
+
+    def __init__(self, db, replica_set: bool = False):
+        from standin import standin_collection
+
+        self.todos = FailingCollection(standin_collection(rtt_ms=0, replica_set=replica_set))
+        self.tombstones = FailingCollection(standin_collection(rtt_ms=0, name="todo_tombstones"))
+        # mongomock clients share one in-process server, so start from empty collections
+        for collection in (self.todos, self.tombstones):
+            collection.collection.drop()
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="test-mongo")
+        self.attach(db)
+        self.db = db
+
+    def attach(self, db):
+        """Point a ``TodoDatabase`` at these collections, e.g. as a second server process."""
+        db.mongodb_uri = "mongodb://standin"
+        db.auto_index = False
+        db._open_client = functools.partial(self.open_client, db)
+
+    @property
+    def down(self) -> bool:
+        return self.todos.down
+
+    @down.setter
+    def down(self, value: bool):
+        self.todos.down = self.tombstones.down = value
+
+    async def open_client(self, db) -> str:
+        """Stands in for ``TodoDatabase._open_client``: connect, or fail while down."""
+        from pymongo.errors import AutoReconnect
+
+        from todo_mcp_server.mongo import ThreadedCollection, TimedCollection
+
+        if self.down:
+            raise AutoReconnect("connection refused")
+        db.collection = TimedCollection(ThreadedCollection(self.todos, self.executor), db._record_round_trip)
+        db.tombstones = TimedCollection(ThreadedCollection(self.tombstones, self.executor), db._record_round_trip)
+        return "standin"
+
+    def docs(self):
+        """Documents stored in the ``todos`` stand-in, bypassing failures."""
+        return list(self.todos.collection.find())
+
+
+@pytest.fixture(autouse=True)
+def storage_env(monkeypatch):
+    """Start every test from default settings, whatever the shell exports."""
+    for name in STORAGE_ENV:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("MONGODB_HEARTBEAT_SECONDS", "0")
+    monkeypatch.setenv("MONGODB_RECONNECT_INITIAL_SECONDS", "0.01")
+    monkeypatch.setenv("MONGODB_RECONNECT_MAX_SECONDS", "0.05")
+
+
+@pytest.fixture
+async def memory_db(monkeypatch):
+    from todo_mcp_server.database import TodoDatabase
+
+    monkeypatch.setenv("USE_MEMORY_DB", "true")
+    db = TodoDatabase()
+    yield db
+    await db.disconnect()
+
+
+@pytest.fixture
+async def sqlite_db(monkeypatch, tmp_path):
+    from todo_mcp_server.sqlite_database import SQLiteTodoDatabase
+
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "todos.db"))
+    db = SQLiteTodoDatabase()
+    yield db
+    await db.disconnect()
+
+
+@pytest.fixture
+async def mongo():
+    """A ``TodoDatabase`` connected to a MongoDB stand-in (``mongo.db``)."""
+    pytest.importorskip("mongomock")
+    from todo_mcp_server.database import TodoDatabase
+
+    db = TodoDatabase()
+    standin = MongoStandin(db)
+    await db._ensure_connection()
+    yield standin
+    await db.disconnect()
+    standin.executor.shutdown()
+
+
+@pytest.fixture(params=["memory", "sqlite", "mongo"])
+def backend(request):
+    """Each storage backend in turn, as a ``TodoDatabase``."""
+    if request.param == "mongo":
+        db = request.getfixturevalue("mongo").db
+        # Nothing else writes to the stand-in, so there are no commits in flight to wait for
+        db.changes_settle = timedelta(0)
+        return db
+    return request.getfixturevalue(f"{request.param}_db")
+
+
+@pytest.fixture
+def call_tool(backend, monkeypatch):
+    """Call a server tool on ``backend``, asking for the JSON form of the result."""
+    from todo_mcp_server import server
+
+    monkeypatch.setattr(server, "db", backend)
+
+    async def call(name, **arguments):
+        return await server.dispatch_tool(name, {**arguments, "output": "json"})
+
+    return call
+
+
+async def wait_for(predicate, timeout: float = 5.0):
+    """Wait until ``predicate()`` is true, failing the test after ``timeout`` seconds."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("timed out waiting for condition")
+        await asyncio.sleep(0.01)
@@ -0,0 +1,78 @@
+"""Due-date tools on every backend: overdue, due soon and the agenda."""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+
+
+async def create(db, title, due_date=None, completed=False):
+    todo = await db.create_todo(TodoCreate(title=title, due_date=due_date))
+    if completed:
+        await db.update_todo(str(todo.id), TodoUpdate(completed=True))
+    return str(todo.id)
+
+
+def titles(result):
+    return [todo["title"] for todo in result.structuredContent["todos"]]
+
+
+def utc(local: datetime) -> datetime:
+    """Naive UTC, as todos are stored."""
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def test_overdue_lists_pending_past_todos_oldest_first(call_tool, backend):
+    now = datetime.utcnow()
+    await create(backend, "last week", now - timedelta(days=7))
+    await create(backend, "an hour ago", now - timedelta(hours=1))
+    await create(backend, "done", now - timedelta(days=2), completed=True)
+    await create(backend, "tomorrow", now + timedelta(days=1))
+    await create(backend, "whenever")
+
+    result = await call_tool("get_overdue_todos")
+    assert titles(result) == ["last week", "an hour ago"]
+
+    first = await call_tool("get_overdue_todos", limit=1)
+    assert titles(first) == ["last week"]
+    rest = await call_tool("get_overdue_todos", limit=1, after_id=first.structuredContent["next_after_id"])
+    assert titles(rest) == ["an hour ago"] and rest.structuredContent["next_after_id"] is None
+
+
+async def test_due_soon_covers_the_next_hours(call_tool, backend):
+    now = datetime.utcnow()
+    await create(backend, "overdue", now - timedelta(hours=1))
+    await create(backend, "in three hours", now + timedelta(hours=3))
+    await create(backend, "in one hour", now + timedelta(hours=1))
+    await create(backend, "done soon", now + timedelta(hours=2), completed=True)
+    await create(backend, "in two days", now + timedelta(days=2))
+
+    assert titles(await call_tool("get_todos_due_soon", hours=4)) == ["in one hour", "in three hours"]
+    assert titles(await call_tool("get_todos_due_soon", hours=2)) == ["in one hour"]
+
+
+async def test_agenda_groups_by_local_day(call_tool, backend):
+    zone = ZoneInfo("Asia/Tokyo")
+    today = datetime.now(zone).date()
+    midnight = datetime(today.year, today.month, today.day, tzinfo=zone)
+    await create(backend, "yesterday", utc(midnight - timedelta(minutes=30)))
+    await create(backend, "late today", utc(midnight + timedelta(hours=23, minutes=30)))
+    await create(backend, "early today", utc(midnight + timedelta(hours=1)))
+    await create(backend, "just after midnight", utc(midnight + timedelta(days=1, minutes=30)))
+    await create(backend, "done", utc(midnight + timedelta(hours=2)), completed=True)
+    await create(backend, "after the agenda", utc(midnight + timedelta(days=2)))
+
+    result = await call_tool("get_agenda", days=2, timezone="Asia/Tokyo")
+    assert not result.isError
+    agenda = result.structuredContent
+    assert agenda["start"] == today.isoformat()
+    assert [(day["date"], [todo["title"] for todo in day["todos"]]) for day in agenda["days"]] == [
+        (today.isoformat(), ["early today", "late today"]),
+        ((today + timedelta(days=1)).isoformat(), ["just after midnight"]),
+    ]
+
+
+async def test_agenda_rejects_unknown_time_zones(call_tool, backend):
+    result = await call_tool("get_agenda", timezone="Mars/Olympus_Mons")
+    assert result.isError
+    assert result.content[0].text == "Unknown time zone: Mars/Olympus_Mons"
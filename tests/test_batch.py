@@ -0,0 +1,91 @@
+"""Batch tools on every backend: per-item results and partial failure."""
+
+from bson import ObjectId
+
+from todo_mcp_server.models import TodoQuery
+
+
+def outcomes(result):
+    return [(item["index"], item.get("error")) for item in result.structuredContent["results"]]
+
+
+async def test_add_todos_creates_the_valid_items(call_tool, backend):
+    result = await call_tool("add_todos", todos=[
+        {"title": "first", "priority": "high"},
+        {"description": "no title"},
+        {"title": "bad date", "due_date": "tomorrow"},
+        {"title": "second", "due_date": "2030-01-01T09:00:00Z"},
+    ])
+    assert not result.isError
+    assert result.structuredContent["succeeded"] == 2
+    assert outcomes(result) == [
+        (0, None), (1, "Title is required"), (2, "Invalid due_date format. Use ISO format."), (3, None),
+    ]
+    items = result.structuredContent["results"]
+    assert [items[i]["todo"]["title"] for i in (0, 3)] == ["first", "second"]
+    assert items[3]["todo"]["due_date"] == "2030-01-01T09:00:00Z"
+
+    todos, _ = await backend.list_todos(TodoQuery())
+    assert [todo.title for todo in todos] == ["first", "second"]
+    assert str(todos[0].id) == items[0]["todo_id"]
+
+
+async def test_update_todos_reports_each_failure(call_tool, backend):
+    created = await call_tool("add_todos", todos=[{"title": "a"}, {"title": "b"}])
+    first, second = (item["todo_id"] for item in created.structuredContent["results"])
+
+    result = await call_tool("update_todos", updates=[
+        {"todo_id": first, "completed": True},
+        {"priority": "high"},
+        {"todo_id": "not-an-id", "priority": "high"},
+        {"todo_id": str(ObjectId()), "priority": "high"},
+        {"todo_id": second},
+        {"todo_id": second, "title": "b, renamed"},
+    ])
+    assert not result.isError
+    assert outcomes(result) == [
+        (0, None), (1, "todo_id is required"), (2, "Invalid todo ID"), (3, "Todo item not found"),
+        (4, "No changes provided"), (5, None),
+    ]
+    assert (await backend.get_todo_by_id(first)).completed
+    assert (await backend.get_todo_by_id(second)).title == "b, renamed"
+
+
+async def test_delete_todos_counts_each_todo_once(call_tool, backend):
+    created = await call_tool("add_todos", todos=[{"title": "a"}, {"title": "b"}, {"title": "kept"}])
+    first, second, kept = (item["todo_id"] for item in created.structuredContent["results"])
+
+    result = await call_tool("delete_todos", todo_ids=[first, "not-an-id", second, first, str(ObjectId())])
+    assert not result.isError
+    assert outcomes(result) == [
+        (0, None), (1, "Invalid todo ID"), (2, None), (3, "Todo item not found"), (4, "Todo item not found"),
+    ]
+    todos, _ = await backend.list_todos(TodoQuery())
+    assert [str(todo.id) for todo in todos] == [kept]
+
+
+async def test_batch_is_an_error_only_when_every_item_fails(call_tool, backend):
+    result = await call_tool("delete_todos", todo_ids=[str(ObjectId()), "not-an-id"])
+    assert result.isError
+    assert result.structuredContent["succeeded"] == 0
+
+    result = await call_tool("update_todos", updates=[])
+    assert result.isError and result.content[0].text == "updates is required"
+
+
+async def test_mongo_bulk_write_errors_fail_only_their_items(mongo, monkeypatch):
+    from todo_mcp_server import server
+
+    monkeypatch.setattr(server, "db", mongo.db)
+    mongo.todos.collection.create_index("title", unique=True)
+    result = await server.dispatch_tool("add_todos", {
+        "todos": [{"title": "a"}, {"title": "a"}, {"title": "b"}], "output": "json",
+    })
+    assert [error is None for _, error in outcomes(result)] == [True, False, True]
+    first, _, second = (item["todo_id"] for item in result.structuredContent["results"])
+
+    result = await server.dispatch_tool("update_todos", {
+        "updates": [{"todo_id": first, "title": "b"}, {"todo_id": second, "completed": True}], "output": "json",
+    })
+    assert [error is None for _, error in outcomes(result)] == [False, True]
+    assert sorted(doc["title"] for doc in mongo.docs()) == ["a", "b"]
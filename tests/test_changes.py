@@ -0,0 +1,156 @@
+"""get_changes_since: change tokens, paging order, tombstone expiry and the settle window."""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+from todo_mcp_server.server import decode_change_token, encode_change_token
+
+
+async def sync(db, since=None, limit=3):
+    """Read every page after ``since``; returns the pages and the final cursor."""
+    pages = []
+    while True:
+        changes = await db.list_changes(since, limit)
+        assert not changes.reset
+        pages.append(changes)
+        since = changes.cursor
+        if not changes.has_more:
+            return pages, since
+
+
+async def caught_up():
+    """Let the clock pass the latest write.
+
+    Changes are listed up to the current time, and MongoDB timestamps are
+    milliseconds, so a write in the current millisecond is only listed later.
+    """
+    await asyncio.sleep(0.002)
+
+
+@pytest.mark.parametrize("changed_at", [
+    datetime(2024, 2, 29, 23, 59, 59, 999999), datetime(1970, 1, 1), datetime.utcnow(),
+])
+def test_change_token_round_trip(changed_at):
+    cursor = (changed_at, ObjectId())
+    token = encode_change_token(cursor)
+    assert decode_change_token(token) == cursor
+    assert encode_change_token(decode_change_token(token)) == token
+
+
+@pytest.mark.parametrize("token", ["", "123", "abc-def", f"12-{ObjectId()}-3", f"x-{ObjectId()}"])
+def test_invalid_change_token(token):
+    with pytest.raises(ValueError):
+        decode_change_token(token)
+
+
+async def test_pages_split_changes_with_equal_timestamps(backend):
+    # One batch: every todo gets the same updated_at
+    results = await backend.create_todos([TodoCreate(title=f"todo {i}") for i in range(10)])
+    ids = [result.todo.id for result in results]
+    assert len({result.todo.updated_at for result in results}) == 1
+
+    await caught_up()
+    pages, _ = await sync(backend, limit=3)
+    listed = [todo.id for page in pages for todo in page.todos]
+    assert listed == sorted(ids)
+    assert [len(page.todos) for page in pages] == [3, 3, 3, 1]
+
+
+async def test_paging_while_the_collection_changes(backend):
+    """A client that syncs page by page while others write ends up with the same todos."""
+    rng = random.Random(24)
+    live = [result.todo.id for result in await backend.create_todos(
+        [TodoCreate(title=f"todo {i}") for i in range(20)]
+    )]
+    synced = {}
+    versions = set()
+    since = None
+    for _ in range(40):
+        changes = await backend.list_changes(since, 4)
+        assert not changes.reset
+        for todo in changes.todos:
+            # Each version of a todo is listed once
+            assert (todo.id, todo.updated_at) not in versions
+            versions.add((todo.id, todo.updated_at))
+            synced[todo.id] = todo.title
+        for todo_id in changes.deleted_ids:
+            synced.pop(todo_id, None)
+        since = changes.cursor
+
+        action = rng.choice(["create", "update", "delete"])
+        if action == "create":
+            live.append((await backend.create_todo(TodoCreate(title="new"))).id)
+        elif action == "update" and live:
+            todo_id = rng.choice(live)
+            await backend.update_todo(str(todo_id), TodoUpdate(title=f"edit {rng.random()}"))
+        elif live:
+            todo_id = live.pop(rng.randrange(len(live)))
+            assert await backend.delete_todo(str(todo_id))
+
+    await caught_up()
+    pages, _ = await sync(backend, since)
+    for page in pages:
+        for todo in page.todos:
+            synced[todo.id] = todo.title
+        for todo_id in page.deleted_ids:
+            synced.pop(todo_id, None)
+    assert synced == {todo.id: todo.title for todo in await backend.get_all_todos()}
+
+
+async def test_expired_tombstones_force_a_resync(backend):
+    todo = await backend.create_todo(TodoCreate(title="deleted"))
+    _, since = await sync(backend)
+    await backend.delete_todo(str(todo.id))
+    await caught_up()
+    changes = await backend.list_changes(since, 10)
+    assert changes.deleted_ids == [todo.id]
+
+    # The delete may be forgotten once it is older than the retention
+    backend.tombstone_retention = backend.memory_store.tombstone_retention = timedelta(microseconds=1)
+    await backend.delete_todo(str((await backend.create_todo(TodoCreate(title="expires the first"))).id))
+    await caught_up()
+    changes = await backend.list_changes(since, 10)
+    assert changes.reset and changes.cursor is None
+    # Syncing again from the beginning works
+    pages, _ = await sync(backend)
+    assert all(not page.reset for page in pages)
+
+
+async def test_settle_window_holds_back_recent_mongodb_changes(mongo):
+    db = mongo.db
+    db.changes_settle = timedelta(seconds=60)
+    _, since = await sync(db)
+    assert since[0] <= datetime.utcnow() - db.changes_settle
+
+    # Written inside the window: not listed yet, and not skipped later
+    todo = await db.create_todo(TodoCreate(title="in flight"))
+    changes = await db.list_changes(since, 10)
+    assert changes.todos == [] and not changes.has_more
+
+    db.changes_settle = timedelta(0)
+    changes = await db.list_changes(changes.cursor, 10)
+    assert [t.id for t in changes.todos] == [todo.id]
+
+
+async def test_settle_window_catches_late_commits(mongo):
+    """A write stamped before the cursor's time but committed after is still listed."""
+    db = mongo.db
+    db.changes_settle = timedelta(seconds=1)
+    first = await db.create_todo(TodoCreate(title="first"))
+    stamped = datetime.utcnow()
+    changes = await db.list_changes(None, 10)
+    assert first.id not in [t.id for t in changes.todos]
+
+    # Another process stamped this todo before our read but committed after it
+    late = {"_id": ObjectId(), "title": "late", "description": None, "completed": False, "priority": "medium",
+            "due_date": None, "created_at": stamped, "updated_at": stamped}
+    mongo.todos.collection.insert_one(late)
+
+    db.changes_settle = timedelta(0)
+    changes = await db.list_changes(changes.cursor, 10)
+    assert [t.id for t in changes.todos] == [first.id, late["_id"]]
@@ -0,0 +1,138 @@
+"""Write coalescing: batching rules, per-item results and outages during a flush."""
+
+import asyncio
+
+import pytest
+from pymongo.errors import ConnectionFailure, WriteError
+
+from todo_mcp_server.coalesce import WriteCoalescer
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+from todo_mcp_server.resilience import CircuitBreaker, TodoUnavailable
+
+from conftest import wait_for
+
+
+class RecordingFlush:
+    """Bulk call double: records each batch and returns one result per item."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batches = []
+
+    async def __call__(self, items):
+        self.batches.append(list(items))
+        await asyncio.sleep(0)
+        if self.fail_on in items:
+            raise RuntimeError(f"batch with {self.fail_on} failed")
+        return [f"result {item}" for item in items]
+
+
+def coalesce(mongo, window: float = 0.02, max_batch: int = 100):
+    for coalescer in (mongo.db.insert_coalescer, mongo.db.update_coalescer):
+        coalescer.window = window
+        coalescer.max_batch = max_batch
+
+
+async def test_items_in_one_window_share_a_flush():
+    flush = RecordingFlush()
+    coalescer = WriteCoalescer(flush, window=0.01, max_batch=10)
+    results = await asyncio.gather(*(coalescer.submit(i) for i in range(5)))
+    assert results == [f"result {i}" for i in range(5)]
+    assert flush.batches == [[0, 1, 2, 3, 4]]
+
+
+async def test_full_batch_flushes_without_waiting():
+    flush = RecordingFlush()
+    coalescer = WriteCoalescer(flush, window=60, max_batch=2)
+    assert await asyncio.wait_for(asyncio.gather(coalescer.submit("a"), coalescer.submit("b")), 1)
+    assert flush.batches == [["a", "b"]]
+
+
+async def test_repeated_key_starts_a_new_batch():
+    flush = RecordingFlush()
+    coalescer = WriteCoalescer(flush, window=0.01, max_batch=10)
+    await asyncio.gather(coalescer.submit("a1", key="a"), coalescer.submit("b", key="b"),
+                         coalescer.submit("a2", key="a"))
+    assert flush.batches == [["a1", "b"], ["a2"]]
+
+
+async def test_failed_flush_fails_only_its_batch():
+    flush = RecordingFlush(fail_on="bad")
+    coalescer = WriteCoalescer(flush, window=0.01, max_batch=2)
+    results = await asyncio.gather(*(coalescer.submit(item) for item in ("ok", "bad", "later")),
+                                   return_exceptions=True)
+    assert [type(result) for result in results[:2]] == [RuntimeError, RuntimeError]
+    assert results[2] == "result later"
+    assert coalescer.stats()["batches"] == 2
+
+
+async def test_coalesced_creates_with_one_failing_item(mongo):
+    coalesce(mongo)
+    mongo.todos.collection.create_index("title", unique=True)
+    await mongo.db.create_todo(TodoCreate(title="taken"))
+
+    results = await asyncio.gather(*(
+        mongo.db.create_todo(TodoCreate(title=title)) for title in ("one", "taken", "two")
+    ), return_exceptions=True)
+    assert [todo.title for todo in (results[0], results[2])] == ["one", "two"]
+    assert isinstance(results[1], WriteError) and "E11000" in str(results[1])
+    assert mongo.db.insert_coalescer.stats()["largest_batch"] == 3
+    assert sorted(doc["title"] for doc in mongo.docs()) == ["one", "taken", "two"]
+
+
+async def test_coalesced_updates_with_one_failing_item(mongo):
+    coalesce(mongo)
+    mongo.todos.collection.create_index("title", unique=True)
+    todos = [await mongo.db.create_todo(TodoCreate(title=title)) for title in ("a", "b", "c")]
+
+    updates = [(todos[0], "a2"), (todos[1], "c"), (todos[2], "c2")]
+    results = await asyncio.gather(*(
+        mongo.db.update_todo(str(todo.id), TodoUpdate(title=title)) for todo, title in updates
+    ))
+    assert results[0].title == "a2" and results[2].title == "c2"
+    assert results[1] is None
+    assert mongo.db.update_coalescer.stats()["largest_batch"] == 3
+
+    # The batch call itself reports the error of the failing item
+    [ok, failed] = await mongo.db.update_todos([
+        (str(todos[0].id), TodoUpdate(title="a3")), (str(todos[1].id), TodoUpdate(title="a3")),
+    ])
+    assert ok.todo.title == "a3"
+    assert failed.todo is None and "E11000" in failed.error
+
+
+async def test_breaker_opening_mid_flush(mongo):
+    """Calls in the failing bulk write get the error; calls still queued go to memory."""
+    db = mongo.db
+    coalesce(mongo, window=0.05, max_batch=2)
+    mongo.down = True
+
+    first = [asyncio.create_task(db.create_todo(TodoCreate(title=f"first {i}"))) for i in range(2)]
+    queued = asyncio.create_task(db.create_todo(TodoCreate(title="queued")))
+    for task in first:
+        with pytest.raises(ConnectionFailure):
+            await task
+    assert db.breaker.state != CircuitBreaker.CLOSED
+    assert (await queued).title == "queued"
+    assert db.breaker.trips == 1
+    assert len(db.write_behind) == 1
+
+    mongo.down = False
+    await wait_for(lambda: db.breaker.state == CircuitBreaker.CLOSED)
+    assert [doc["title"] for doc in mongo.docs()] == ["queued"]
+
+
+async def test_queued_update_after_breaker_opens_is_unavailable(mongo):
+    db = mongo.db
+    todo = await db.create_todo(TodoCreate(title="stored in MongoDB"))
+    coalesce(mongo, window=0.05)
+    update = asyncio.create_task(db.update_todo(str(todo.id), TodoUpdate(title="edited")))
+    await asyncio.sleep(0)
+    # The outage starts while the update waits in the coalescer
+    mongo.down = True
+    with pytest.raises(ConnectionFailure):
+        await db.get_all_todos()
+
+    with pytest.raises(TodoUnavailable):
+        await update
+    assert len(db.write_behind) == 0
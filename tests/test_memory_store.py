@@ -0,0 +1,208 @@
+"""MemoryStore indexes against brute force over random inserts, updates and deletes."""
+
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from todo_mcp_server.memory_store import SORT_FIELDS, MemoryStore, utc_key
+from todo_mcp_server.text_search import TEXT_WEIGHTS, tokenize
+
+START = datetime(2030, 1, 1)
+PRIORITIES = ("low", "medium", "high")
+WORDS = ("milk", "bread", "report", "call", "the", "garden", "tax", "review", "and", "car")
+
+
+class RandomTodos:
+    """Random todo fields from small domains, so filters, ties and shared words are common."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def time(self) -> datetime:
+        value = START + timedelta(hours=self.rng.randrange(48))
+        # Aware datetimes must sort with naive UTC ones
+        return value.replace(tzinfo=timezone.utc) if self.rng.random() < 0.2 else value
+
+    def text(self):
+        if self.rng.random() < 0.2:
+            return None
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randrange(1, 5)))
+
+    def fields(self):
+        return {
+            "title": self.text() or "untitled",
+            "description": self.text(),
+            "completed": self.rng.random() < 0.4,
+            "priority": self.rng.choice(PRIORITIES),
+            "due_date": self.time() if self.rng.random() < 0.7 else None,
+            "created_at": self.time(),
+            "updated_at": self.time(),
+        }
+
+    def update(self):
+        fields = self.fields()
+        fields.pop("created_at")
+        names = self.rng.sample(sorted(fields), self.rng.randrange(1, len(fields) + 1))
+        return {name: fields[name] for name in names}
+
+
+def mutate(store: MemoryStore, todos: RandomTodos, count: int):
+    rng = todos.rng
+    for _ in range(count):
+        ids = [doc["_id"] for doc in store]
+        action = rng.random()
+        if action < 0.4 or not ids:
+            store.insert({"_id": ObjectId(), **todos.fields()})
+        elif action < 0.5:
+            store.insert_many([{"_id": ObjectId(), **todos.fields()} for _ in range(rng.randrange(1, 4))])
+        elif action < 0.8:
+            store.update(rng.choice(ids), todos.update())
+        elif action < 0.95:
+            store.delete(rng.choice(ids))
+        else:
+            store.delete(ObjectId())
+
+
+def due_between(doc, start, end) -> bool:
+    due = doc.get("due_date")
+    return (due is not None and (start is None or utc_key(due) >= start)
+            and (end is None or utc_key(due) < end))
+
+
+def brute_query(docs, completed=None, priority=None, due_after=None, due_before=None,
+                sort_by="created_at", descending=False):
+    matches = [
+        doc for doc in docs
+        if (completed is None or doc["completed"] == completed)
+        and (priority is None or doc["priority"] == priority)
+        and (due_after is None and due_before is None or due_between(doc, due_after, due_before))
+    ]
+    return sorted(matches, key=lambda doc: MemoryStore.sort_key(doc, sort_by), reverse=descending)
+
+
+def brute_scores(docs, text, completed=None):
+    scores = defaultdict(float)
+    for doc in docs:
+        if completed is not None and doc["completed"] != completed:
+            continue
+        for word in set(tokenize(text)):
+            for field, weight in TEXT_WEIGHTS.items():
+                count = tokenize(doc.get(field)).count(word)
+                if count:
+                    scores[doc["_id"]] += weight * count
+    return dict(scores)
+
+
+def pages(store, limit, **query):
+    """Every matching id, read page by page with ``after_id``."""
+    ids, after_id = [], None
+    while True:
+        page, has_more = store.query(after_id=after_id, limit=limit, **query)
+        ids += [doc["_id"] for doc in page]
+        if not has_more:
+            return ids
+        after_id = page[-1]["_id"]
+
+
+def check(store: MemoryStore, rng: random.Random):
+    docs = list(store)
+    assert len(store) == len({doc["_id"] for doc in docs})
+
+    # Hash and sorted indexes, through filtered and sorted listings
+    for _ in range(10):
+        query = {
+            "completed": rng.choice([None, True, False]),
+            "priority": rng.choice([None, *PRIORITIES]),
+            "sort_by": rng.choice(SORT_FIELDS),
+            "descending": rng.random() < 0.5,
+        }
+        if rng.random() < 0.4:
+            query["due_after"] = START + timedelta(hours=rng.randrange(24))
+            query["due_before"] = query["due_after"] + timedelta(hours=rng.randrange(1, 24))
+        expected = [doc["_id"] for doc in brute_query(docs, **query)]
+        assert [doc["_id"] for doc in store.query(**query)[0]] == expected
+        assert pages(store, rng.randrange(1, 8), **query) == expected
+
+    # Due-date index
+    end = START + timedelta(hours=rng.randrange(48))
+    assert store.ids_due_between(None, end) == [
+        doc["_id"] for doc in sorted((doc for doc in docs if due_between(doc, None, end)),
+                                     key=lambda doc: (utc_key(doc["due_date"]), doc["_id"]))
+    ]
+    for completed in (None, True, False):
+        assert store.count_due_before(end, completed) == sum(
+            1 for doc in docs if due_between(doc, None, end) and completed in (None, doc["completed"])
+        )
+
+    # Text index
+    for _ in range(5):
+        text = " ".join(rng.sample(WORDS, 2))
+        completed = rng.choice([None, True, False])
+        found = store.search(text, limit=len(docs) + 1, completed=completed)
+        assert {doc["_id"]: score for doc, score in found} == brute_scores(docs, text, completed)
+        assert [score for _, score in found] == sorted((score for _, score in found), reverse=True)
+
+    # Counters
+    assert store.counts() == Counter((doc["completed"], doc["priority"]) for doc in docs)
+
+
+def assert_same_indexes(store: MemoryStore):
+    """Indexes kept up to date write by write equal the ones built in one pass."""
+    rebuilt = MemoryStore()
+    rebuilt.load(list(store))
+    assert {field: dict(index) for field, index in store._hash.items()} == \
+        {field: dict(index) for field, index in rebuilt._hash.items()}
+    assert store._due == rebuilt._due
+    assert store._undated == rebuilt._undated
+    assert store._created == rebuilt._created
+    assert store._updated == rebuilt._updated
+    assert store._text == rebuilt._text
+    assert store._counts == rebuilt._counts
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_indexes_match_brute_force(seed):
+    todos = RandomTodos(seed)
+    store = MemoryStore()
+    for _ in range(12):
+        mutate(store, todos, 25)
+        check(store, todos.rng)
+        assert_same_indexes(store)
+
+
+@pytest.mark.parametrize("sort_by", SORT_FIELDS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_listings_walk_their_index(sort_by, descending, monkeypatch):
+    todos = RandomTodos(7)
+    store = MemoryStore()
+    mutate(store, todos, 300)
+    expected = [doc["_id"] for doc in brute_query(list(store), sort_by=sort_by, descending=descending)]
+    assert any(store.get(todo_id)["due_date"] is None for todo_id in expected)
+
+    # Pages come from the sorted index: only the after_id anchor gets a sort key
+    sort_keys = []
+    original = MemoryStore.sort_key
+    monkeypatch.setattr(MemoryStore, "sort_key", staticmethod(
+        lambda doc, field: sort_keys.append(doc["_id"]) or original(doc, field)
+    ))
+    for limit in (1, 3, 50):
+        sort_keys.clear()
+        assert pages(store, limit, sort_by=sort_by, descending=descending) == expected
+        assert len(sort_keys) == -(-len(expected) // limit) - 1
+    completed = [todo_id for todo_id in expected if store.get(todo_id)["completed"]]
+    assert pages(store, 4, completed=True, sort_by=sort_by, descending=descending) == completed
+
+
+def test_emptied_store_has_empty_indexes():
+    todos = RandomTodos(99)
+    store = MemoryStore()
+    mutate(store, todos, 200)
+    for doc in list(store):
+        store.delete(doc["_id"])
+    assert store.counts() == {}
+    assert store.query()[0] == []
+    assert store.search("milk bread", 10) == []
+    assert_same_indexes(store)
@@ -0,0 +1,89 @@
+"""Keyset pagination (``after_id``) on every backend.
+
+The server only pages with keyset cursors: there is no offset parameter.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from todo_mcp_server.models import TodoCreate, TodoQuery, TodoUpdate
+
+START = datetime(2030, 1, 1)
+
+
+async def pages(db, limit, **query):
+    """Every matching id, read page by page with ``after_id``."""
+    ids, after_id = [], None
+    while True:
+        todos, after_id = await db.list_todos(TodoQuery(limit=limit, after_id=after_id, **query))
+        ids += [str(todo.id) for todo in todos]
+        if after_id is None:
+            return ids
+
+
+def sort_key(todo, sort_by):
+    """MongoDB order: missing values first, ``_id`` breaks ties."""
+    value = getattr(todo, sort_by)
+    return (value is not None, value or START, todo.id)
+
+
+async def create_tied(db, count=12):
+    """Todos sharing due dates (some with none) and, per batch, creation times."""
+    creates = [
+        TodoCreate(title=f"todo {i}", due_date=None if i % 4 == 0 else START + timedelta(days=i % 3))
+        for i in range(count)
+    ]
+    results = await db.create_todos(creates[:count // 2])
+    results += await db.create_todos(creates[count // 2:])
+    return [result.todo for result in results]
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "updated_at", "due_date"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_pages_follow_the_sort_order_through_ties(backend, sort_by, sort_order):
+    todos = await create_tied(backend)
+    expected = [str(todo.id) for todo in sorted(todos, key=lambda todo: sort_key(todo, sort_by),
+                                                 reverse=sort_order == "desc")]
+    for limit in (1, 5, 12, 20):
+        assert await pages(backend, limit, sort_by=sort_by, sort_order=sort_order) == expected
+
+    # Filtered pages skip non-matching todos without losing their place
+    for todo_id in expected[::3]:
+        await backend.update_todo(todo_id, TodoUpdate(completed=True))
+    todos = [await backend.get_todo_by_id(str(todo.id)) for todo in todos]
+    completed = [str(todo.id) for todo in sorted((todo for todo in todos if todo.completed),
+                                                  key=lambda todo: sort_key(todo, sort_by),
+                                                  reverse=sort_order == "desc")]
+    assert await pages(backend, 2, completed=True, sort_by=sort_by, sort_order=sort_order) == completed
+
+
+async def test_cursor_is_stable_while_writes_happen(backend):
+    await create_tied(backend)
+    query = {"sort_by": "due_date"}
+    expected = await pages(backend, 100, **query)
+    first, after_id = await backend.list_todos(TodoQuery(limit=5, **query))
+    assert [str(todo.id) for todo in first] == expected[:5]
+
+    # Writes before the cursor do not shift the next page
+    await backend.delete_todo(expected[0])
+    await backend.create_todo(TodoCreate(title="overdue", due_date=START - timedelta(days=1)))
+    # ... writes after it show up in it
+    await backend.delete_todo(expected[6])
+    later = await backend.create_todo(TodoCreate(title="later", due_date=START + timedelta(days=10)))
+    moved = expected[7]
+    await backend.update_todo(moved, TodoUpdate(due_date=START - timedelta(days=2)))
+
+    rest = []
+    while after_id is not None:
+        page, after_id = await backend.list_todos(TodoQuery(limit=5, after_id=after_id, **query))
+        rest += [str(todo.id) for todo in page]
+    assert rest == [todo_id for todo_id in expected[5:] if todo_id not in (expected[6], moved)] + [str(later.id)]
+
+
+async def test_deleted_cursor_is_rejected(backend):
+    await create_tied(backend)
+    _, after_id = await backend.list_todos(TodoQuery(limit=3))
+    await backend.delete_todo(after_id)
+    with pytest.raises(ValueError, match="not found"):
+        await backend.list_todos(TodoQuery(limit=3, after_id=after_id))
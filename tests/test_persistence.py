@@ -0,0 +1,189 @@
+"""Durable memory storage: recovery from snapshots, logs and torn writes."""
+
+import os
+from datetime import datetime, timedelta
+
+import bson
+import pytest
+from bson import ObjectId
+
+from todo_mcp_server.persistence import OLD_OPLOG_FILE, OPLOG_FILE, SNAPSHOT_FILE, DurableMemoryStore
+
+# BSON keeps milliseconds; whole seconds compare equal after a round trip
+START = datetime(2030, 1, 1)
+
+
+def make_doc(title: str, minute: int = 0, **fields):
+    at = START + timedelta(minutes=minute)
+    return {"_id": ObjectId(), "title": title, "description": None, "completed": False, "priority": "medium",
+            "due_date": None, "created_at": at, "updated_at": at, **fields}
+
+
+def open_store(path, **kwargs) -> DurableMemoryStore:
+    store = DurableMemoryStore(str(path), **kwargs)
+    store.open()
+    return store
+
+
+def crash(store: DurableMemoryStore):
+    """Stop using the store without the snapshot ``close`` would write."""
+    store._log.close()
+    store._log = None
+    store._executor.shutdown(wait=True)
+
+
+def contents(store):
+    return {doc["_id"]: doc for doc in store}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "memory"
+
+
+def test_close_writes_a_snapshot(path):
+    store = open_store(path)
+    docs = [store.insert(make_doc(f"todo {i}", i)) for i in range(3)]
+    store.update(docs[0]["_id"], {"completed": True})
+    store.delete(docs[1]["_id"])
+    expected = contents(store)
+    store.close()
+
+    assert os.path.getsize(path / OPLOG_FILE) == 0
+    reopened = open_store(path)
+    assert contents(reopened) == expected
+    reopened.close()
+
+
+def test_log_is_replayed_after_a_crash(path):
+    store = open_store(path)
+    kept = store.insert(make_doc("kept"))
+    gone = store.insert(make_doc("gone"))
+    store.update(kept["_id"], {"title": "kept, edited", "priority": "high"})
+    store.delete(gone["_id"])
+    expected = contents(store)
+    crash(store)
+
+    reopened = open_store(path)
+    assert contents(reopened) == expected
+    assert [doc["title"] for doc in reopened.query(priority="high")[0]] == ["kept, edited"]
+    reopened.close()
+
+
+def test_replay_does_not_notify_listeners(path):
+    store = open_store(path)
+    todo = store.insert(make_doc("replayed"))
+    store.update(todo["_id"], {"completed": True})
+    store.delete(store.insert(make_doc("deleted"))["_id"])
+    crash(store)
+
+    records = []
+    reopened = DurableMemoryStore(str(path))
+    reopened.listeners.append(records.append)
+    reopened.open()
+    assert records == [] and len(reopened) == 1
+    reopened.update(todo["_id"], {"priority": "high"})
+    assert [record["op"] for record in records] == ["u"]
+    reopened.close()
+
+
+@pytest.mark.parametrize("cut", [1, 4, 10])
+def test_torn_tail_is_dropped(path, cut):
+    store = open_store(path)
+    first = store.insert(make_doc("first"))
+    store.update(first["_id"], {"title": "last complete write"})
+    crash(store)
+    complete = os.path.getsize(path / OPLOG_FILE)
+    # A crash part way through appending the next record
+    record = bson.encode({"op": "u", "_id": first["_id"], "set": {"title": "torn"}})
+    with open(path / OPLOG_FILE, "ab") as log:
+        log.write(record[:-cut])
+
+    reopened = open_store(path)
+    assert reopened.get(first["_id"])["title"] == "last complete write"
+    # The torn bytes are cut off, so later appends follow a valid record
+    assert os.path.getsize(path / OPLOG_FILE) == complete
+    second = reopened.insert(make_doc("after the crash"))
+    crash(reopened)
+    again = open_store(path)
+    assert sorted(doc["title"] for doc in again) == ["after the crash", "last complete write"]
+    assert again.get(second["_id"]) is not None
+    again.close()
+
+
+def test_garbage_length_prefix_is_dropped(path):
+    store = open_store(path)
+    doc = store.insert(make_doc("survivor"))
+    crash(store)
+    with open(path / OPLOG_FILE, "ab") as log:
+        log.write((1 << 30).to_bytes(4, "little") + b"\x00" * 8)
+
+    reopened = open_store(path)
+    assert list(contents(reopened)) == [doc["_id"]]
+    reopened.close()
+
+
+def test_snapshot_plus_log_recovery(path):
+    store = open_store(path)
+    before = [store.insert(make_doc(f"before {i}", i)) for i in range(4)]
+    store.compact(wait=True)
+    assert os.path.exists(path / SNAPSHOT_FILE)
+    # Changes after the snapshot, including to todos it holds
+    store.update(before[0]["_id"], {"completed": True})
+    store.delete(before[1]["_id"])
+    store.insert(make_doc("after", 10))
+    expected = contents(store)
+    crash(store)
+
+    reopened = open_store(path)
+    assert contents(reopened) == expected
+    assert reopened.log_ops == 3
+    assert {doc["title"] for doc in reopened.query(completed=False)[0]} == {"before 2", "before 3", "after"}
+    reopened.close()
+
+
+def test_interrupted_compaction_keeps_every_write(path, monkeypatch):
+    store = open_store(path)
+    first = store.insert(make_doc("first"))
+    store.compact(wait=True)
+    store.update(first["_id"], {"title": "first, edited"})
+    # The snapshot writer dies: the rotated log stays next to the old snapshot
+    monkeypatch.setattr(store, "_write_snapshot", lambda docs: None)
+    store.compact(wait=True)
+    assert os.path.exists(path / OLD_OPLOG_FILE)
+    store.insert(make_doc("second"))
+    expected = contents(store)
+    crash(store)
+
+    monkeypatch.undo()
+    reopened = open_store(path)
+    assert contents(reopened) == expected
+    reopened.close()
+    assert not os.path.exists(path / OLD_OPLOG_FILE)
+
+
+def test_compaction_after_compact_ops(path):
+    store = open_store(path, compact_ops=5)
+    for i in range(12):
+        store.insert(make_doc(f"todo {i}", i))
+    store._compaction.result()
+    # Compaction starts every 5 log entries unless the previous one is still running
+    assert os.path.exists(path / SNAPSHOT_FILE)
+    assert store.log_ops <= 7
+    expected = contents(store)
+    crash(store)
+    assert contents(open_store(path)) == expected
+
+
+def test_evicted_todos_stay_evicted(path):
+    store = open_store(path)
+    evicted = store.insert(make_doc("moved elsewhere"))
+    kept = store.insert(make_doc("kept"))
+    store.evict(evicted["_id"])
+    crash(store)
+
+    reopened = open_store(path)
+    assert list(contents(reopened)) == [kept["_id"]]
+    # Eviction is not a delete: no tombstone to report
+    assert [todo_id for _, todo_id, doc in reopened.changes(None, START + timedelta(days=1)) if doc is None] == []
+    reopened.close()
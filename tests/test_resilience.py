@@ -0,0 +1,198 @@
+"""Circuit breaker and write-behind replay against a MongoDB stand-in that fails."""
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import ConnectionFailure
+
+from todo_mcp_server.database import TodoDatabase
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+from todo_mcp_server.resilience import CircuitBreaker, TodoUnavailable, WriteBehindFull, WriteBehindQueue
+
+from conftest import MongoStandin, wait_for
+
+
+async def trip(mongo, db=None):
+    """Take MongoDB down and make the call (on ``db``, default ``mongo.db``) that notices."""
+    mongo.down = True
+    with pytest.raises(ConnectionFailure):
+        await (db or mongo.db).create_todo(TodoCreate(title="lost"))
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    breaker = CircuitBreaker(initial_delay=1, max_delay=8)
+    breaker.trip(ConnectionFailure("down"))
+    delays = [breaker.next_delay() for _ in range(6)]
+    for attempt, delay in enumerate(delays):
+        expected = min(8, 2 ** attempt)
+        assert expected / 2 <= delay <= expected
+
+
+def test_write_behind_inserts_are_idempotent_upserts():
+    queue = WriteBehindQueue(max_ops=2)
+    todo_id = ObjectId()
+    queue.record({"op": "i", "doc": {"_id": todo_id, "title": "a"}})
+    queue.record({"op": "d", "_id": todo_id})
+    assert queue.full
+    insert, delete = queue.peek(5)
+    assert insert._upsert and insert._filter == {"_id": todo_id}
+    assert delete._filter == {"_id": todo_id}
+    queue.pop(2)
+    assert len(queue) == 0 and queue.replayed == 2
+
+
+async def test_connection_failure_opens_the_breaker(mongo):
+    db = mongo.db
+    await db.create_todo(TodoCreate(title="before"))
+    await trip(mongo)
+
+    assert db.breaker.state != CircuitBreaker.CLOSED
+    assert db.use_memory
+    assert db.breaker.trips == 1
+    assert "connection refused" in db.breaker.last_error
+    assert db.health_status.startswith("unreachable")
+
+
+async def test_outage_writes_are_buffered_in_memory(mongo):
+    db = mongo.db
+    await trip(mongo)
+
+    todo = await db.create_todo(TodoCreate(title="during"))
+    await db.update_todo(str(todo.id), TodoUpdate(title="during, edited"))
+    other = await db.create_todo(TodoCreate(title="short-lived"))
+    assert await db.delete_todo(str(other.id))
+
+    assert len(db.write_behind) == 4
+    assert (await db.get_todo_by_id(str(todo.id))).title == "during, edited"
+    assert mongo.docs() == []
+
+
+async def test_recovery_replays_writes_in_order(mongo):
+    db = mongo.db
+    kept = await db.create_todo(TodoCreate(title="kept"))
+    removed = await db.create_todo(TodoCreate(title="removed"))
+    await trip(mongo)
+    # Operations on the same todo only give the right result in order
+    todo = await db.create_todo(TodoCreate(title="first"))
+    for title in ("second", "third"):
+        await db.update_todo(str(todo.id), TodoUpdate(title=title))
+    await db.toggle_todo_status(str(todo.id))
+    gone = await db.create_todo(TodoCreate(title="gone"))
+    await db.delete_todo(str(gone.id))
+
+    mongo.down = False
+    await wait_for(lambda: db.breaker.state == CircuitBreaker.CLOSED)
+
+    assert not db.use_memory
+    assert len(db.write_behind) == 0 and db.write_behind.replayed == 6
+    assert len(db.memory_store) == 0
+    docs = {doc["_id"]: doc for doc in mongo.docs()}
+    assert set(docs) == {kept.id, removed.id, todo.id}
+    assert docs[todo.id]["title"] == "third" and docs[todo.id]["completed"]
+    # Served from MongoDB again
+    assert await db.delete_todo(str(removed.id))
+    assert {doc["title"] for doc in mongo.docs()} == {"kept", "third"}
+
+
+async def test_breaker_stays_open_while_replay_fails(mongo):
+    db = mongo.db
+    await trip(mongo)
+    await db.create_todo(TodoCreate(title="queued"))
+
+    # The server answers again, but the replay fails
+    mongo.down = False
+    mongo.todos.failing.add("bulk_write")
+    await wait_for(lambda: mongo.todos.calls.count("bulk_write") >= 3)
+
+    assert db.breaker.state != CircuitBreaker.CLOSED
+    assert db.use_memory
+    assert len(db.write_behind) == 1
+    assert "bulk_write" in db.breaker.last_error
+    assert mongo.docs() == []
+
+    mongo.todos.failing.clear()
+    await wait_for(lambda: db.breaker.state == CircuitBreaker.CLOSED)
+    assert [doc["title"] for doc in mongo.docs()] == ["queued"]
+
+
+async def test_full_write_behind_queue_rejects_writes(mongo):
+    db = mongo.db
+    db.write_behind.max_ops = 2
+    await trip(mongo)
+    await db.create_todo(TodoCreate(title="one"))
+    await db.create_todo(TodoCreate(title="two"))
+
+    with pytest.raises(WriteBehindFull):
+        await db.create_todo(TodoCreate(title="three"))
+    assert len(db.write_behind) == 2
+
+
+async def test_todos_stored_only_in_mongodb_are_unavailable_during_outage(mongo):
+    db = mongo.db
+    todo = await db.create_todo(TodoCreate(title="before"))
+    await trip(mongo)
+
+    for call in (db.get_todo_by_id(str(todo.id)),
+                 db.update_todo(str(todo.id), TodoUpdate(title="edited")),
+                 db.toggle_todo_status(str(todo.id)),
+                 db.delete_todo(str(todo.id))):
+        with pytest.raises(TodoUnavailable):
+            await call
+    [result] = await db.delete_todos([str(todo.id)])
+    assert "unreachable" in result.error
+    assert len(db.write_behind) == 0
+
+    mongo.down = False
+    await wait_for(lambda: db.breaker.state == CircuitBreaker.CLOSED)
+    assert (await db.get_todo_by_id(str(todo.id))).title == "before"
+    assert await db.get_todo_by_id(str(ObjectId())) is None
+
+
+@pytest.mark.parametrize("mongodb_at_restart", ["up", "down"])
+async def test_outage_writes_survive_a_restart_during_the_outage(tmp_path, monkeypatch, mongodb_at_restart):
+    monkeypatch.setenv("MEMORY_DB_PATH", str(tmp_path / "outage"))
+    first = TodoDatabase()
+    mongo = MongoStandin(first)
+    await first._ensure_connection()
+    await trip(mongo)
+    await first.create_todo(TodoCreate(title="written during the outage"))
+    # The process stops before MongoDB is back
+    await first.disconnect()
+    assert mongo.docs() == []
+
+    mongo.down = mongodb_at_restart == "down"
+    second = TodoDatabase()
+    mongo.attach(second)
+    await second._ensure_connection()
+    mongo.down = False
+    await wait_for(lambda: second.breaker.state == CircuitBreaker.CLOSED and not second.use_memory)
+    assert [doc["title"] for doc in mongo.docs()] == ["written during the outage"]
+    assert len(second.memory_store) == 0
+
+    # A later outage does not replay them again
+    await trip(mongo, second)
+    mongo.down = False
+    await wait_for(lambda: second.breaker.state == CircuitBreaker.CLOSED)
+    assert second.write_behind.replayed == 1
+    await second.disconnect()
+    mongo.executor.shutdown()
+
+
+async def test_disconnect_replays_buffered_writes(mongo, capsys):
+    db = mongo.db
+    db.breaker.initial_delay = 60
+    await trip(mongo)
+    await db.create_todo(TodoCreate(title="buffered"))
+    mongo.down = False
+
+    await db.disconnect()
+    assert [doc["title"] for doc in mongo.docs()] == ["buffered"]
+    assert len(db.write_behind) == 0 and not db.use_memory
+
+
+async def test_disconnect_reports_lost_writes(mongo, capsys):
+    db = mongo.db
+    await trip(mongo)
+    await db.create_todo(TodoCreate(title="buffered"))
+
+    await db.disconnect()
+    assert "1 buffered writes were not replayed; they are lost" in capsys.readouterr().err
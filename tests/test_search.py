@@ -0,0 +1,77 @@
+"""Full-text search on every backend: ranking and tokenization parity.
+
+The MongoDB stand-in (mongomock) does not implement ``$text``, so the
+MongoDB cases are skipped; ``search_todos`` relies on the server's text
+index there.
+"""
+
+import pytest
+
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+
+
+@pytest.fixture
+def searchable(backend):
+    if backend.storage_backend == "mongodb":
+        pytest.skip("mongomock does not implement $text")
+    return backend
+
+
+async def create(db, title, description=None):
+    return str((await db.create_todo(TodoCreate(title=title, description=description))).id)
+
+
+async def search(db, text, limit=10, completed=None):
+    return [str(todo.id) for todo, _ in await db.search_todos(text, limit, completed)]
+
+
+async def test_title_matches_and_repeats_rank_higher(searchable):
+    in_description = await create(searchable, "Weekend", "garden")
+    in_title = await create(searchable, "Garden")
+    in_both = await create(searchable, "Garden", "garden garden")
+    # BM25 only rewards words that are rare across the collection
+    for i in range(10):
+        await create(searchable, f"Chore {i}", "clean the house")
+
+    assert await search(searchable, "garden") == [in_both, in_title, in_description]
+    assert await search(searchable, "garden", limit=2) == [in_both, in_title]
+    matches = await searchable.search_todos("garden", 10)
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    assert all(score > 0 for _, score in matches)
+
+
+async def test_any_query_word_matches(searchable):
+    garden = await create(searchable, "Weed the garden")
+    taxes = await create(searchable, "Taxes", "file the return")
+    await create(searchable, "Call mum")
+
+    assert sorted(await search(searchable, "garden taxes")) == sorted([garden, taxes])
+    await searchable.update_todo(taxes, TodoUpdate(completed=True))
+    assert await search(searchable, "garden taxes", completed=True) == [taxes]
+    assert await search(searchable, "garden taxes", completed=False) == [garden]
+
+
+@pytest.mark.parametrize("query, title, matches", [
+    ("GARDEN", "garden party", True),
+    ("garden", "Garden-party!", True),
+    ("date", "check due_date field", True),
+    ("due_date", "due date", True),
+    ("cafe", "Lunch at the Café", True),
+    ("résumé", "Update resume", True),
+    ("42", "Answer 42 emails", True),
+    ("the", "the garden", False),
+    ("gard", "garden", False),
+])
+async def test_tokenization_is_the_same_on_every_backend(searchable, query, title, matches):
+    todo_id = await create(searchable, title)
+    assert await search(searchable, query) == ([todo_id] if matches else [])
+
+
+async def test_index_follows_updates_and_deletes(searchable):
+    todo_id = await create(searchable, "Buy milk", "semi-skimmed")
+    await searchable.update_todo(todo_id, TodoUpdate(title="Buy bread", description="sourdough"))
+    assert await search(searchable, "milk skimmed") == []
+    assert await search(searchable, "bread sourdough") == [todo_id]
+
+    await searchable.delete_todo(todo_id)
+    assert await search(searchable, "bread") == []
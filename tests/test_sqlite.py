@@ -0,0 +1,137 @@
+"""SQLite backend: transactions, schema and the full-text index."""
+
+import shutil
+import sqlite3
+from datetime import datetime
+
+from bson import ObjectId
+
+from todo_mcp_server.models import TodoCreate, TodoQuery, TodoUpdate
+from todo_mcp_server.sqlite_database import COLUMNS, INSERT_SQL, SCHEMA, SQLiteTodoDatabase, to_sql_value
+
+
+def trace(db):
+    """Start recording the statements the connection runs."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    return statements
+
+
+async def test_batch_update_commits_once(sqlite_db):
+    results = await sqlite_db.create_todos([TodoCreate(title=f"todo {i}") for i in range(5)])
+    statements = trace(sqlite_db)
+
+    updates = [(result.todo_id, TodoUpdate(completed=True)) for result in results]
+    updates.insert(2, (str(ObjectId()), TodoUpdate(completed=True)))
+    updated = await sqlite_db.update_todos(updates)
+    assert [result.error for result in updated] == [None, None, "Todo item not found", None, None, None]
+    assert [statement for statement in statements if statement == "COMMIT"] == ["COMMIT"]
+    todos, _ = await sqlite_db.list_todos(TodoQuery(completed=True))
+    assert len(todos) == 5
+
+
+def names(conn, kind):
+    return {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def check_text_index(conn):
+    """The search index holds exactly the stored todos, and FTS5 agrees with its content."""
+    assert conn.execute("SELECT count(*) FROM todos_text").fetchone() == \
+        conn.execute("SELECT count(*) FROM todos").fetchone()
+    assert conn.execute(
+        "SELECT count(*) FROM todos t LEFT JOIN todos_text_ids m ON m.id = t.id WHERE m.rowid IS NULL"
+    ).fetchone() == (0,)
+    conn.execute("INSERT INTO todos_text (todos_text) VALUES ('integrity-check')")
+
+
+async def test_schema_is_created(sqlite_db):
+    indexes = await sqlite_db.ensure_indexes()
+    conn = sqlite_db.conn
+    assert {"todos", "todo_tombstones", "todos_text", "todos_text_ids"} <= names(conn, "table")
+    assert set(indexes) <= names(conn, "index")
+    assert names(conn, "trigger") == {"todos_text_insert", "todos_text_update", "todos_text_delete"}
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+async def test_older_file_is_migrated(tmp_path, monkeypatch):
+    # A file written before tombstones, search and the secondary indexes existed
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA[0])
+    now = datetime(2030, 1, 1)
+    old_ids = [str(ObjectId()) for _ in range(3)]
+    with conn:
+        for i, todo_id in enumerate(old_ids):
+            doc = {"id": todo_id, "title": f"old todo {i}", "description": "migrated", "completed": i == 0,
+                   "created_at": now, "updated_at": now, "due_date": None, "priority": "low"}
+            conn.execute(INSERT_SQL, [to_sql_value(column, doc[column]) for column in COLUMNS])
+    conn.close()
+
+    monkeypatch.setenv("SQLITE_DB_PATH", str(path))
+    db = SQLiteTodoDatabase()
+    todos, _ = await db.list_todos(TodoQuery())
+    assert [str(todo.id) for todo in todos] == sorted(old_ids)
+    assert todos[0].created_at == now and todos[0].completed
+    assert len(await db.search_todos("migrated", 10)) == 3
+    check_text_index(db.conn)
+
+    # Old and new todos are written, searched and deleted alike
+    new = await db.create_todo(TodoCreate(title="new todo", description="migrated"))
+    assert await db.delete_todo(old_ids[1])
+    assert {str(todo.id) for todo, _ in await db.search_todos("migrated", 10)} == {old_ids[0], old_ids[2], str(new.id)}
+    changes = await db.list_changes(None, 10)
+    assert [str(todo_id) for todo_id in changes.deleted_ids] == [old_ids[1]]
+    check_text_index(db.conn)
+    text_ids = db.conn.execute("SELECT rowid, id FROM todos_text_ids ORDER BY rowid").fetchall()
+    await db.disconnect()
+
+    # Reopening a migrated file keeps the index as it is
+    db = SQLiteTodoDatabase()
+    assert len(await db.search_todos("migrated", 10)) == 3
+    assert db.conn.execute("SELECT rowid, id FROM todos_text_ids ORDER BY rowid").fetchall() == text_ids
+    await db.disconnect()
+
+
+async def test_text_index_follows_updates_and_deletes(sqlite_db):
+    results = await sqlite_db.create_todos([TodoCreate(title=f"todo {i}", description="garden") for i in range(4)])
+    ids = [result.todo_id for result in results]
+    await sqlite_db.update_todo(ids[0], TodoUpdate(title="renamed", description="taxes"))
+    await sqlite_db.update_todos([(ids[1], TodoUpdate(description="taxes")), (ids[2], TodoUpdate(completed=True))])
+    await sqlite_db.delete_todos([ids[3]])
+    check_text_index(sqlite_db.conn)
+
+    assert {str(todo.id) for todo, _ in await sqlite_db.search_todos("garden", 10)} == {ids[2]}
+    assert {str(todo.id) for todo, _ in await sqlite_db.search_todos("taxes", 10)} == {ids[0], ids[1]}
+    assert {str(todo.id) for todo, _ in await sqlite_db.search_todos("todo", 10)} == {ids[1], ids[2]}
+    await sqlite_db.delete_todo(ids[0])
+    assert await sqlite_db.search_todos("renamed", 10) == []
+    check_text_index(sqlite_db.conn)
+
+
+async def test_wal_is_replayed_on_reopen(sqlite_db, tmp_path, monkeypatch):
+    await sqlite_db.create_todos([TodoCreate(title=f"todo {i}") for i in range(3)])
+    todo = await sqlite_db.create_todo(TodoCreate(title="updated"))
+    await sqlite_db.update_todo(str(todo.id), TodoUpdate(completed=True))
+    await sqlite_db.delete_todo(str(todo.id))
+
+    # Copying the files while the database is open is what a crash leaves behind
+    wal = tmp_path / "todos.db-wal"
+    assert wal.stat().st_size > 0
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    shutil.copy(tmp_path / "todos.db", copy / "todos.db")
+    shutil.copy(wal, copy / "todos.db-wal")
+
+    monkeypatch.setenv("SQLITE_DB_PATH", str(copy / "todos.db"))
+    reopened = SQLiteTodoDatabase()
+    todos, _ = await reopened.list_todos(TodoQuery())
+    assert [todo.title for todo in todos] == ["todo 0", "todo 1", "todo 2"]
+    assert [str(todo_id) for todo_id in (await reopened.list_changes(None, 10)).deleted_ids] == [str(todo.id)]
+    check_text_index(reopened.conn)
+    await reopened.disconnect()
+
+    # A clean close checkpoints the log into the database file
+    assert not (copy / "todos.db-wal").exists()
+    reopened = SQLiteTodoDatabase()
+    assert len((await reopened.list_todos(TodoQuery()))[0]) == 3
+    await reopened.disconnect()
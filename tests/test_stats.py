@@ -0,0 +1,54 @@
+"""Todo statistics on every backend, checked against the listing after each write."""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from todo_mcp_server.models import TodoCreate, TodoQuery, TodoUpdate
+
+
+async def expected_stats(db):
+    """The statistics, counted from every todo."""
+    todos, _ = await db.list_todos(TodoQuery())
+    now = datetime.utcnow()
+    groups = Counter((todo.completed, todo.priority) for todo in todos)
+    overdue = sum(1 for todo in todos if not todo.completed and todo.due_date is not None and todo.due_date < now)
+    return db._stats_from_counts([(*key, count) for key, count in groups.items()], overdue)
+
+
+async def test_counters_follow_updates_and_deletes(call_tool, backend):
+    past = datetime.utcnow() - timedelta(days=1)
+    todos = [
+        await backend.create_todo(TodoCreate(title=f"todo {i}", priority=priority, due_date=due_date))
+        for i, (priority, due_date) in enumerate([
+            ("high", past), ("high", None), ("medium", past), ("low", None), ("low", past),
+        ])
+    ]
+    ids = [str(todo.id) for todo in todos]
+    initial = await call_tool("todo_stats")
+    assert initial.structuredContent == await expected_stats(backend)
+    assert initial.structuredContent["overdue"] == 3
+
+    writes = [
+        lambda: backend.update_todo(ids[0], TodoUpdate(completed=True)),
+        lambda: backend.update_todo(ids[1], TodoUpdate(priority="low")),
+        lambda: backend.toggle_todo_status(ids[2]),
+        lambda: backend.update_todo(ids[3], TodoUpdate(due_date=past)),
+        lambda: backend.update_todos([(ids[4], TodoUpdate(priority="medium", completed=True)),
+                                      (ids[1], TodoUpdate(completed=True))]),
+        lambda: backend.delete_todo(ids[0]),
+        lambda: backend.delete_todos([ids[1], ids[2]]),
+    ]
+    for write in writes:
+        await write()
+        stats = (await call_tool("todo_stats")).structuredContent
+        assert stats == await expected_stats(backend)
+
+    assert stats == {
+        "total": 2, "completed": 1, "pending": 1, "overdue": 1,
+        "by_priority": {"low": {"total": 1, "completed": 0, "pending": 1},
+                        "medium": {"total": 1, "completed": 1, "pending": 0}},
+    }
+    await backend.delete_todos(ids[3:])
+    assert (await call_tool("todo_stats")).structuredContent == {
+        "total": 0, "completed": 0, "pending": 0, "overdue": 0, "by_priority": {},
+    }
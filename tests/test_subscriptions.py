@@ -0,0 +1,213 @@
+"""Resource URIs, subscription routing and notification coalescing."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+from todo_mcp_server.resilience import CircuitBreaker
+from todo_mcp_server.subscriptions import ChangeEvent, ResourceURI, SubscriptionManager
+
+from conftest import wait_for
+
+
+class RecordingSession:
+    """Client session double that records the URIs it is notified about."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.notified = []
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionResetError("client went away")
+        self.notified.append(str(uri))
+
+
+async def idle_watch(publish):
+    await asyncio.Event().wait()
+
+
+async def settle():
+    """Let the pending flush and the notification tasks it starts run."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def doc(**fields):
+    return {"_id": ObjectId(), "completed": False, "priority": "medium", **fields}
+
+
+@pytest.mark.parametrize("uri", [
+    "todo://list?colour=red", "todo://list?completed=yes", "todo://list?sort_by=title",
+    "todo://list?limit=-1", "todo://not-an-id", "http://list", "todo://list#top",
+])
+def test_invalid_uris_are_rejected(uri):
+    with pytest.raises(ValueError):
+        ResourceURI(uri)
+
+
+def test_list_uri_query():
+    query = ResourceURI("todo://list?completed=false&priority=high&sort_order=desc&limit=500").query(50, 100)
+    assert (query.completed, query.priority, query.sort_order, query.limit) == (False, "high", "desc", 100)
+
+
+def test_todo_uri_is_affected_only_by_its_todo():
+    todo = doc()
+    resource = ResourceURI(f"todo://{todo['_id']}")
+    assert resource.affected_by(ChangeEvent("update", todo["_id"], todo, ["title"]))
+    assert resource.affected_by(ChangeEvent("delete", todo["_id"]))
+    assert not resource.affected_by(ChangeEvent("insert", ObjectId(), doc()))
+
+
+def test_listing_is_affected_by_matching_writes():
+    high = ResourceURI("todo://list?priority=high")
+    matching, other = doc(priority="high"), doc(priority="low")
+    assert high.affected_by(ChangeEvent("insert", matching["_id"], matching))
+    assert high.affected_by(ChangeEvent("update", matching["_id"], matching, ["title"]))
+    assert not high.affected_by(ChangeEvent("insert", other["_id"], other))
+    # Not in the listing before or after: only the title changed
+    assert not high.affected_by(ChangeEvent("update", other["_id"], other, ["title"]))
+
+
+def test_listing_is_affected_by_writes_that_may_remove_a_todo():
+    high = ResourceURI("todo://list?priority=high")
+    moved = doc(priority="low")
+    # The todo may have been high before this update
+    assert high.affected_by(ChangeEvent("update", moved["_id"], moved, ["priority"]))
+    # Without the changed fields or the post-image nothing can be ruled out
+    assert high.affected_by(ChangeEvent("update", moved["_id"], moved))
+    assert high.affected_by(ChangeEvent("update", moved["_id"]))
+    assert high.affected_by(ChangeEvent("delete", moved["_id"]))
+    # An unfiltered listing holds every todo
+    assert ResourceURI("todo://list").affected_by(ChangeEvent("update", moved["_id"], moved, ["title"]))
+
+
+async def test_notifications_are_coalesced_per_loop_iteration():
+    manager = SubscriptionManager(idle_watch)
+    session = RecordingSession()
+    todo = doc(priority="high")
+    manager.subscribe(session, ResourceURI("todo://list"))
+    manager.subscribe(session, ResourceURI(f"todo://{todo['_id']}"))
+
+    # e.g. the writes of one bulk operation
+    manager.publish(ChangeEvent("insert", todo["_id"], todo))
+    for title in ("a", "b", "c"):
+        manager.publish(ChangeEvent("update", todo["_id"], {**todo, "title": title}, ["title"]))
+    await settle()
+    assert sorted(session.notified) == sorted(["todo://list", f"todo://{todo['_id']}"])
+
+    # A later iteration notifies again
+    manager.publish(ChangeEvent("delete", todo["_id"]))
+    await settle()
+    assert len(session.notified) == 4
+    assert manager.stats()["notifications_sent"] == 4
+    await manager.close()
+
+
+async def test_each_session_gets_only_its_subscriptions():
+    manager = SubscriptionManager(idle_watch)
+    high, low = RecordingSession(), RecordingSession()
+    manager.subscribe(high, ResourceURI("todo://list?priority=high"))
+    manager.subscribe(low, ResourceURI("todo://list?priority=low"))
+
+    todo = doc(priority="high")
+    manager.publish(ChangeEvent("insert", todo["_id"], todo))
+    await settle()
+    assert high.notified == ["todo://list?priority=high"]
+    assert low.notified == []
+
+    manager.unsubscribe(high, "todo://list?priority=high")
+    manager.publish(ChangeEvent("insert", todo["_id"], todo))
+    await settle()
+    assert high.notified == ["todo://list?priority=high"]
+    assert manager.stats()["sessions"] == 1
+    await manager.close()
+
+
+async def test_failed_session_is_dropped():
+    manager = SubscriptionManager(idle_watch)
+    manager.subscribe(RecordingSession(fail=True), ResourceURI("todo://list"))
+    manager.publish(ChangeEvent("delete", ObjectId()))
+    await settle()
+    assert manager.stats()["sessions"] == 0
+    await manager.close()
+
+
+async def test_watcher_stops_when_nothing_is_subscribed():
+    manager = SubscriptionManager(idle_watch)
+    first, second = RecordingSession(), RecordingSession()
+    manager.subscribe(first, ResourceURI("todo://list"))
+    manager.subscribe(second, ResourceURI("todo://list"))
+    watcher = manager._watcher
+    manager.unsubscribe(first, "todo://list")
+    assert manager.stats()["watching"]
+
+    manager.drop_session(second)
+    assert manager.stats() == {"sessions": 0, "subscriptions": 0, "watching": False, "notifications_sent": 0}
+    await asyncio.gather(watcher, return_exceptions=True)
+    assert watcher.cancelled()
+
+    # A new subscription starts a new watcher
+    manager.subscribe(first, ResourceURI("todo://list"))
+    assert manager.stats()["watching"] and manager._watcher is not watcher
+    manager.unsubscribe(first, "todo://list")
+    assert manager._watcher is None
+    await manager.close()
+
+
+async def test_disconnected_session_subscriptions_are_dropped(memory_db, monkeypatch):
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from todo_mcp_server import server
+
+    manager = SubscriptionManager(memory_db.watch_changes)
+    monkeypatch.setattr(server, "subscriptions", manager)
+    async with create_connected_server_and_client_session(server.server) as client:
+        await client.subscribe_resource("todo://list")
+        assert manager.stats()["sessions"] == 1 and manager.stats()["watching"]
+    assert manager.stats()["sessions"] == 0 and not manager.stats()["watching"]
+    await manager.close()
+
+
+async def test_memory_writes_are_published(memory_db):
+    events = []
+    watcher = asyncio.create_task(memory_db.watch_changes(events.append))
+    await wait_for(lambda: memory_db.memory_store.listeners)
+
+    todo = await memory_db.create_todo(TodoCreate(title="watched"))
+    await memory_db.update_todo(str(todo.id), TodoUpdate(priority="high"))
+    await memory_db.delete_todo(str(todo.id))
+    assert [(event.op, event.todo_id) for event in events] == [
+        ("insert", todo.id), ("update", todo.id), ("delete", todo.id),
+    ]
+    assert events[1].fields == {"priority", "updated_at"} and events[1].doc["priority"] == "high"
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
+    assert memory_db.memory_store.listeners == []
+
+
+async def test_recovery_does_not_publish_deletes(mongo):
+    db = mongo.db
+    db.subscription_poll = 0.01
+    events = []
+    watcher = asyncio.create_task(db.watch_changes(events.append))
+    await wait_for(lambda: db.memory_store.listeners)
+    mongo.down = True
+    with pytest.raises(Exception):
+        await db.create_todo(TodoCreate(title="lost"))
+    todo = await db.create_todo(TodoCreate(title="during"))
+    assert [(event.op, event.todo_id) for event in events] == [("insert", todo.id)]
+
+    # The outage todos move from memory to MongoDB; nothing was deleted
+    mongo.down = False
+    await wait_for(lambda: db.breaker.state == CircuitBreaker.CLOSED)
+    await asyncio.sleep(0.05)
+    assert len(db.memory_store) == 0
+    assert [event.op for event in events] == ["insert"]
+    # ... and the memory store keeps no tombstones for them
+    assert list(db.memory_store.changes(None, datetime.utcnow())) == []
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
@@ -0,0 +1,143 @@
+"""NDJSON export and import through ``todo-mcp-transfer``."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from todo_mcp_server import database, transfer
+from todo_mcp_server.memory_store import utc_key
+from todo_mcp_server.models import TodoCreate, TodoUpdate
+from todo_mcp_server.sqlite_database import SQLiteTodoDatabase
+
+KEPT_FIELDS = ("id", "title", "description", "completed", "priority", "due_date", "created_at")
+
+
+async def seed(db):
+    due = datetime(2030, 1, 2, 3, 4, 5)
+    first = await db.create_todo(TodoCreate(title="first", description="with a description", due_date=due))
+    await db.create_todo(TodoCreate(title="second", priority="high"))
+    await db.update_todo(str(first.id), TodoUpdate(completed=True))
+
+
+def same(value, exported) -> bool:
+    """Whether a todo field equals its exported JSON value (MongoDB keeps milliseconds)."""
+    if isinstance(value, datetime):
+        return abs(utc_key(value) - utc_key(datetime.fromisoformat(exported))) < timedelta(milliseconds=1)
+    return (str(value) if isinstance(value, ObjectId) else value) == exported
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+async def test_export_then_import_round_trip(backend, tmp_path, monkeypatch):
+    source = database.TodoDatabase()
+    source.use_memory = True
+    await seed(source)
+    path = str(tmp_path / "todos.ndjson")
+    monkeypatch.setattr(database, "db", source)
+    assert await transfer.run(["export", path]) == 0
+    exported = read_ndjson(path)
+    assert len(exported) == 2
+
+    # A client that synced the (empty) target before the import
+    since = (await backend.list_changes(None, 10)).cursor
+    imported_at = datetime.utcnow()
+    monkeypatch.setattr(database, "db", backend)
+    assert await transfer.run(["import", path, "--batch-size", "1"]) == 0
+
+    todos = {str(todo.id): todo for todo in await backend.get_all_todos()}
+    for data in exported:
+        todo = todos[data["id"]]
+        for field in KEPT_FIELDS:
+            assert same(getattr(todo, field), data[field]), field
+        assert todo.updated_at >= imported_at - timedelta(milliseconds=1)
+
+    # The import is a change: clients syncing incrementally see the todos
+    await asyncio.sleep(0.002)
+    changes = await backend.list_changes(since, 10)
+    assert not changes.reset
+    assert sorted(str(todo.id) for todo in changes.todos) == sorted(todos)
+
+
+async def test_import_skips_existing_ids_and_bad_lines(memory_db, tmp_path, monkeypatch):
+    await seed(memory_db)
+    path = tmp_path / "todos.ndjson"
+    monkeypatch.setattr(database, "db", memory_db)
+    assert await transfer.run(["export", str(path)]) == 0
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\nnot json\n{\"title\": \"new\"}\n")
+
+    result = await transfer.import_ndjson(memory_db, path.read_text().splitlines())
+    assert result["imported"] == 1
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [1, 2, 4]
+
+
+def test_command_line_round_trip(tmp_path, monkeypatch):
+    """``python -m todo_mcp_server.transfer`` between two SQLite files."""
+    source, target = tmp_path / "source.db", tmp_path / "target.db"
+    path = tmp_path / "todos.ndjson"
+    env = {**os.environ, "USE_SQLITE_DB": "true",
+           "PYTHONPATH": os.pathsep.join([os.path.join(os.path.dirname(__file__), "..", "src"),
+                                          os.environ.get("PYTHONPATH", "")])}
+
+    async def seed_source():
+        monkeypatch.setenv("SQLITE_DB_PATH", str(source))
+        db = SQLiteTodoDatabase()
+        await seed(db)
+        await db.disconnect()
+
+    asyncio.run(seed_source())
+    command = [sys.executable, "-m", "todo_mcp_server.transfer"]
+    subprocess.run([*command, "export", str(path)], env={**env, "SQLITE_DB_PATH": str(source)}, check=True)
+    with open(path, encoding="utf-8") as lines:
+        subprocess.run([*command, "import"], stdin=lines, env={**env, "SQLITE_DB_PATH": str(target)}, check=True)
+
+    async def read_target():
+        monkeypatch.setenv("SQLITE_DB_PATH", str(target))
+        db = SQLiteTodoDatabase()
+        try:
+            return await db.get_all_todos()
+        finally:
+            await db.disconnect()
+
+    exported = read_ndjson(path)
+    todos = asyncio.run(read_target())
+    assert sorted(str(todo.id) for todo in todos) == sorted(data["id"] for data in exported)
+    assert sorted(todo.title for todo in todos) == ["first", "second"]
+
+
+async def test_export_tool_writes_off_the_event_loop(call_tool, backend, tmp_path, monkeypatch):
+    from todo_mcp_server import server
+
+    await seed(backend)
+    monkeypatch.setattr(transfer, "TRANSFER_DIR", str(tmp_path))
+    threads = []
+
+    class RecordingFile:
+        def __init__(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            self.file = open(*args, **kwargs)
+
+        def write(self, text):
+            threads.append(threading.get_ident())
+            return self.file.write(text)
+
+        def close(self):
+            threads.append(threading.get_ident())
+            self.file.close()
+
+    monkeypatch.setattr(server, "open", RecordingFile, raising=False)
+    result = await call_tool("export_todos", path="backups/todos.ndjson")
+    assert result.structuredContent == {"count": 2, "path": "backups/todos.ndjson"}
+    assert [data["title"] for data in read_ndjson(tmp_path / "backups" / "todos.ndjson")] == ["first", "second"]
+    assert not (tmp_path / "backups" / "todos.ndjson.tmp").exists()
+    assert len(threads) == 3 and threading.get_ident() not in threads
@@ -18,7 +18,7 @@ async def test_all_functionality():
     
     # Test 1: Database initialization
     print("1️⃣ Testing database initialization...")
-    db._ensure_connection()
+    await db._ensure_connection()
     print(f"   ✅ Database initialized (in-memory: {db.use_memory})")
     
     # Test 2: Create todo
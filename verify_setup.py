@@ -3,6 +3,7 @@
 Setup verification script for Todo MCP Server
 """
 
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -52,9 +53,11 @@ def verify_setup():
     try:
         from todo_mcp_server.database import db
         print("\n🔗 Testing MongoDB connection...")
-        db.connect()
+        async def check_connection():
+            await db.connect()
+            await db.disconnect()
+        asyncio.run(check_connection())
         print("✅ MongoDB connection successful!")
-        db.disconnect()
     except Exception as e:
         print(f"⚠️  MongoDB connection failed: {e}")
         print("   This is expected if you haven't set up your real MongoDB credentials yet.")